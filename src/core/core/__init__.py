@@ -1,9 +1,11 @@
 from flask import Flask
 
 from core.managers import (
+    cache_manager,
     db_manager,
     auth_manager,
     api_manager,
+    compression_manager,
     queue_manager,
     data_manager,
 )
@@ -20,8 +22,10 @@ def create_app(initial_setup: bool = True):
 
 
 def initialize_managers(app: Flask, initial_setup: bool = False):
+    cache_manager.initialize(app)
     db_manager.initialize(app, initial_setup)
     auth_manager.initialize(app)
     api_manager.initialize(app)
+    compression_manager.initialize(app)
     queue_manager.initialize(app, initial_setup)
     data_manager.initialize(initial_setup)
@@ -4,6 +4,8 @@ from flask.views import MethodView
 from core.managers.auth_manager import auth_required
 from core.model.news_item_tag import NewsItemTag
 from core.managers import queue_manager
+from core.managers.sse_manager import sse_manager
+from core.service.blob import BlobService
 
 
 class AdminSettings(MethodView):
@@ -41,6 +43,18 @@ class ClearQueues(MethodView):
         return {"message": "All queues cleared"}, 200
 
 
+class SSEMetrics(MethodView):
+    @auth_required("ADMIN_OPERATIONS")
+    def get(self):
+        return sse_manager.metrics(), 200
+
+
+class BlobMaintenance(MethodView):
+    @auth_required("ADMIN_OPERATIONS")
+    def post(self):
+        return BlobService.run_maintenance()
+
+
 def initialize(app: Flask):
     base_route = "/api/admin"
     app.add_url_rule(f"{base_route}/", view_func=AdminSettings.as_view("admin_settings"))
@@ -48,3 +62,5 @@ def initialize(app: Flask):
     app.add_url_rule(f"{base_route}/ungroup-stories", view_func=UngroupStories.as_view("ungroup_all_stories"))
     app.add_url_rule(f"{base_route}/reset-database", view_func=ResetDatabase.as_view("reset_database"))
     app.add_url_rule(f"{base_route}/clear-queues", view_func=ClearQueues.as_view("clear_queue"))
+    app.add_url_rule(f"{base_route}/sse-metrics", view_func=SSEMetrics.as_view("sse_metrics"))
+    app.add_url_rule(f"{base_route}/blob-maintenance", view_func=BlobMaintenance.as_view("blob_maintenance"))
@@ -5,6 +5,7 @@ from flask_jwt_extended import current_user
 from core.managers import asset_manager
 from core.managers.sse_manager import sse_manager
 from core.log import logger
+from core.config import Config
 from core.managers.auth_manager import auth_required
 from core.model import report_item, report_item_type
 
@@ -97,7 +98,7 @@ class CloneReportItem(MethodView):
 class ReportItemLocks(MethodView):
     @auth_required("ANALYZE_UPDATE")
     def get(self, report_item_id):
-        return sse_manager.to_report_item_json(report_item_id)
+        return report_item.ReportItemLock.get_json(report_item_id)
 
 
 class ReportItemLock(MethodView):
@@ -107,7 +108,10 @@ class ReportItemLock(MethodView):
         if not user:
             abort(401, "User not found")
         try:
-            return sse_manager.report_item_lock(report_item_id, user.id)
+            result, status, acquired = report_item.ReportItemLock.acquire(report_item_id, user.id, Config.REPORT_ITEM_LOCK_TIMEOUT)
+            if acquired:
+                sse_manager.report_item_locked(report_item_id)
+            return result, status
         except Exception as ex:
             logger.exception()
             return str(ex), 500
@@ -120,7 +124,10 @@ class ReportItemUnlock(MethodView):
         if not user:
             abort(401, "User not found")
         try:
-            return sse_manager.report_item_unlock(report_item_id, user.id)
+            result, status, released = report_item.ReportItemLock.release(report_item_id, user.id)
+            if released:
+                sse_manager.report_item_unlocked(report_item_id)
+            return result, status
         except Exception as ex:
             logger.exception()
             return str(ex), 500
@@ -1,39 +1,74 @@
-from flask import request, Flask
+import io
+from flask import request, Flask, Response, redirect, send_file, url_for
 from flask.views import MethodView
 from urllib.parse import unquote
 from flask_jwt_extended import current_user
 
 from core.managers.sse_manager import sse_manager
 from core.log import logger
-from core.managers.auth_manager import auth_required
+from core.managers.auth_manager import auth_required, no_auth
+from core.config import Config
 from core.model import news_item, osint_source, news_item_tag, story
 from core.managers.decorators import validate_json
+from core.managers.cache_manager import cache_response, STORY_CACHE_NAMESPACE, OSINT_SOURCE_CACHE_NAMESPACE
+from core.model.role_based_access import ACL_CACHE_NAMESPACE
 from core.managers import queue_manager
 from core.service.news_item import NewsItemService
 
 
 class OSINTSourceGroupsList(MethodView):
     @auth_required("ASSESS_ACCESS")
+    @cache_response(OSINT_SOURCE_CACHE_NAMESPACE, ACL_CACHE_NAMESPACE)
     def get(self):
         return osint_source.OSINTSourceGroup.get_all_for_assess_api(user=current_user)
 
 
 class OSINTSourcesList(MethodView):
     @auth_required("ASSESS_ACCESS")
+    @cache_response(OSINT_SOURCE_CACHE_NAMESPACE, ACL_CACHE_NAMESPACE)
     def get(self):
         return osint_source.OSINTSource.get_all_for_assess_api(user=current_user)
 
 
+class OSINTSourceIcon(MethodView):
+    @no_auth
+    def get(self, source_id: str, icon_hash: str):
+        """
+        Public so that <img> tags can load it, the content hash in the path makes every URL immutable
+        """
+        current_hash = osint_source.OSINTSource.get_icon_hash(source_id)
+        if current_hash is None:
+            return {"error": "Icon not found"}, 404
+        if current_hash != icon_hash:
+            return redirect(url_for("osint_source_icon", source_id=source_id, icon_hash=current_hash))
+
+        if request.if_none_match.contains(icon_hash):
+            response = Response(status=304)
+        else:
+            icon = osint_source.OSINTSource.get_icon(source_id) or b""
+            response = send_file(io.BytesIO(icon), mimetype=osint_source.OSINTSource.get_icon_mimetype(icon), conditional=False, etag=False)
+            response.headers["X-Content-Type-Options"] = "nosniff"
+            response.headers["Content-Security-Policy"] = "default-src 'none'; style-src 'unsafe-inline'; sandbox"
+        response.set_etag(icon_hash)
+        response.cache_control.public = True
+        response.cache_control.max_age = Config.ICON_CACHE_MAX_AGE
+        response.cache_control.immutable = True
+        return response
+
+
 class NewsItems(MethodView):
     @auth_required("ASSESS_ACCESS")
     def get(self):
-        filter_keys = ["search" "read", "important", "relevant", "in_analyze", "range", "sort"]
+        filter_keys = ["search" "read", "important", "relevant", "in_analyze", "range", "sort", "cursor"]
         filter_args: dict[str, str | int] = {k: v for k, v in request.args.items() if k in filter_keys}
 
         filter_args["limit"] = min(int(request.args.get("limit", 20)), 1000)
         page = int(request.args.get("page", 0))
         filter_args["offset"] = min(int(request.args.get("offset", page * filter_args["limit"])), (2**31) - 1)
-        return news_item.NewsItem.get_all_for_api(filter_args, current_user)
+        try:
+            return news_item.NewsItem.get_all_for_api(filter_args, current_user)
+        except ValueError as e:
+            return {"error": str(e)}, 400
 
     @auth_required("ASSESS_CREATE")
     @validate_json
@@ -75,6 +110,7 @@ class NewsItem(MethodView):
 
 class Stories(MethodView):
     @auth_required("ASSESS_ACCESS")
+    @cache_response(STORY_CACHE_NAMESPACE, OSINT_SOURCE_CACHE_NAMESPACE, ACL_CACHE_NAMESPACE, per_user=True)
     def get(self):
         try:
             filter_keys = [
@@ -90,6 +126,8 @@ class Stories(MethodView):
                 "timeto",
                 "no_count",
                 "exclude_attr",
+                "cursor",
+                "estimate_count",
             ]
             filter_args: dict[str, str | int | list] = {k: v for k, v in request.args.items() if k in filter_keys}
             filter_list_keys = ["source", "group"]
@@ -112,6 +150,7 @@ class Stories(MethodView):
 
 class StoryTags(MethodView):
     @auth_required("ASSESS_ACCESS")
+    @cache_response(STORY_CACHE_NAMESPACE)
     def get(self):
         try:
             search = request.args.get("search", None)
@@ -128,6 +167,7 @@ class StoryTags(MethodView):
 
 class StoryTagList(MethodView):
     @auth_required("ASSESS_ACCESS")
+    @cache_response(STORY_CACHE_NAMESPACE)
     def get(self):
         try:
             search = request.args.get("search", "")
@@ -222,6 +262,9 @@ def initialize(app: Flask):
     app.add_url_rule(f"{base_route}/story/<string:story_id>", view_func=Story.as_view("story"))
     app.add_url_rule(f"{base_route}/osint-source-group-list", view_func=OSINTSourceGroupsList.as_view("osint_source_groups-list"))
     app.add_url_rule(f"{base_route}/osint-sources-list", view_func=OSINTSourcesList.as_view("osint_sources_list"))
+    app.add_url_rule(
+        f"{base_route}/osint-sources/<string:source_id>/icon/<string:icon_hash>", view_func=OSINTSourceIcon.as_view("osint_source_icon")
+    )
     app.add_url_rule(f"{base_route}/tags", view_func=StoryTags.as_view("tags"))
     app.add_url_rule(f"{base_route}/taglist", view_func=StoryTagList.as_view("taglist"))
     app.add_url_rule(f"{base_route}/news-items", view_func=NewsItems.as_view("news_items"))
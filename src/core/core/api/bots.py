@@ -70,7 +70,7 @@ class NewsItem(MethodView):
 class UpdateNewsItemAttributes(MethodView):
     @api_key_required
     def put(self, news_item_id):
-        news_item.NewsItem.update_attributes(news_item_id, request.json)
+        return news_item.NewsItem.update_attributes(news_item_id, request.json)
 
 
 class UpdateStorySummary(MethodView):
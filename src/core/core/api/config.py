@@ -28,6 +28,8 @@ from core.model import (
 )
 from core.model.permission import Permission
 from core.managers.decorators import extract_args
+from core.managers.cache_manager import cache_response, OSINT_SOURCE_CACHE_NAMESPACE, WORKER_CACHE_NAMESPACE
+from core.model.role_based_access import ACL_CACHE_NAMESPACE
 
 
 class DictionariesReload(MethodView):
@@ -327,6 +329,7 @@ class Users(MethodView):
 
 class Bots(MethodView):
     @auth_required("CONFIG_BOT_ACCESS")
+    @cache_response(WORKER_CACHE_NAMESPACE)
     @extract_args("search")
     def get(self, bot_id=None, filter_args=None):
         if bot_id:
@@ -381,6 +384,7 @@ class QueueSchedule(MethodView):
 
 class OSINTSources(MethodView):
     @auth_required("CONFIG_OSINT_SOURCE_ACCESS")
+    @cache_response(OSINT_SOURCE_CACHE_NAMESPACE, ACL_CACHE_NAMESPACE)
     @extract_args("search")
     def get(self, source_id=None, filter_args=None):
         if source_id:
@@ -458,6 +462,7 @@ class OSINTSourcesImport(MethodView):
 
 class OSINTSourceGroups(MethodView):
     @auth_required("CONFIG_OSINT_SOURCE_GROUP_ACCESS")
+    @cache_response(OSINT_SOURCE_CACHE_NAMESPACE, ACL_CACHE_NAMESPACE)
     @extract_args("search")
     def get(self, group_id=None, filter_args=None):
         if group_id:
@@ -581,6 +586,7 @@ class WorkerInstances(MethodView):
 
 class Workers(MethodView):
     @auth_required("CONFIG_WORKER_ACCESS")
+    @cache_response(WORKER_CACHE_NAMESPACE)
     @extract_args("search", "category", "type")
     def get(self, filter_args=None):
         return worker.Worker.get_all_for_api(filter_args, True)
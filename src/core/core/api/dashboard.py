@@ -2,35 +2,17 @@ from flask import request, Flask
 from flask.views import MethodView
 from flask_jwt_extended import jwt_required
 
-from core.model.news_item import NewsItem
 from core.model.story import Story
 from core.model.news_item_tag import NewsItemTag
+from core.model.dashboard import DashboardStatistics
 from core.service.news_item_tag import NewsItemTagService
-from core.model.product import Product
-from core.model.report_item import ReportItem
-from core.model.queue import ScheduleEntry
 from core.config import Config
 
 
 class Dashboard(MethodView):
     @jwt_required()
     def get(self):
-        total_news_items = NewsItem.get_count()
-        total_products = Product.get_count()
-        report_items_completed = ReportItem.count_all(True)
-        report_items_in_progress = ReportItem.count_all(False)
-        total_database_items = total_news_items + total_products + report_items_completed + report_items_in_progress
-        latest_collected = NewsItem.latest_collected()
-        schedule_lenght = ScheduleEntry.get_count()
-        return {
-            "total_news_items": total_news_items,
-            "total_products": total_products,
-            "report_items_completed": report_items_completed,
-            "report_items_in_progress": report_items_in_progress,
-            "total_database_items": total_database_items,
-            "latest_collected": latest_collected,
-            "schedule_lenght": schedule_lenght,
-        }, 200
+        return DashboardStatistics.get_snapshot(), 200
 
 
 class TrendingClusters(MethodView):
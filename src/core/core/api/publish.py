@@ -1,9 +1,10 @@
-from flask import Response, request, Flask
+from flask import request, Flask
 from flask.views import MethodView
 from flask_jwt_extended import current_user
 
 from core.managers import queue_manager
 from core.managers.auth_manager import auth_required
+from core.managers.blob_manager import send_blob
 from core.model import product, product_type
 
 
@@ -50,12 +51,12 @@ class PublishProduct(MethodView):
 class ProductsRender(MethodView):
     @auth_required("PUBLISH_ACCESS")
     def post(self, product_id):
-        return queue_manager.queue_manager.generate_product(product_id)
+        return queue_manager.queue_manager.generate_product(product_id, force=request.args.get("force", "").lower() == "true")
 
     @auth_required("PUBLISH_ACCESS")
     def get(self, product_id):
         if product_data := product.Product.get_render(product_id):
-            return Response(product_data["blob"], headers={"Content-Type": product_data["mime_type"]}, status=200)
+            return send_blob(product_data["blob_key"], product_data["mime_type"], product_data["blob"])
         return {"error": f"Product {product_id} not found"}, 404
 
 
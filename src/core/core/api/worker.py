@@ -1,8 +1,11 @@
-from flask import request, send_file, Response, Flask
+from itertools import chain
+from typing import Any, Iterator
+from flask import request, send_file, stream_with_context, Response, Flask
 from flask.views import MethodView
 from werkzeug.datastructures import FileStorage
 
 from core.managers.auth_manager import api_key_required
+from core.managers.blob_manager import send_blob
 from core.log import logger
 from core.managers import queue_manager
 from core.model.osint_source import OSINTSource
@@ -11,11 +14,32 @@ from core.model.queue import ScheduleEntry
 from core.model.product_type import ProductType
 from core.model.publisher_preset import PublisherPreset
 from core.model.word_list import WordList
-from core.model.story import Story
-from core.model.news_item_tag import NewsItemTag
+from core.model.story import Story, StoryFields
+from core.model.news_item import NewsItem
+from core.model.news_item_tag import NewsItemTag, Tag
 from core.managers.sse_manager import sse_manager
 from core.model.bot import Bot
+from core.model.dashboard import DashboardStatistics
 from core.managers.decorators import extract_args
+from core.service.export import ExportService
+
+
+def export_response(items: Iterator[dict[str, Any]]):
+    """
+    Stream items as NDJSON, gzip compressed when the client accepts it
+    Filter errors surface as 400 because the first item is read before the response starts.
+    """
+    try:
+        first = next(items, None)
+    except ValueError as e:
+        return {"error": str(e)}, 400
+    rows = items if first is None else chain([first], items)
+    compress = "gzip" in request.accept_encodings
+    response = Response(stream_with_context(ExportService.stream(rows, compress)), mimetype="application/x-ndjson")
+    response.headers["Vary"] = "Accept-Encoding"
+    if compress:
+        response.headers["Content-Encoding"] = "gzip"
+    return response
 
 
 class AddNewsItems(MethodView):
@@ -29,6 +53,25 @@ class AddNewsItems(MethodView):
         return result, status
 
 
+class UnknownNewsItems(MethodView):
+    @api_key_required
+    def post(self):
+        json_data = request.json
+        if not isinstance(json_data, dict):
+            return {"error": "Expected an object with hashes and/or links"}, 400
+        hashes = json_data.get("hashes", [])
+        links = json_data.get("links", [])
+        if not isinstance(hashes, list) or not isinstance(links, list):
+            return {"error": "hashes and links must be lists"}, 400
+        return NewsItem.filter_unknown(hashes, links), 200
+
+
+class RefreshDashboardStatistics(MethodView):
+    @api_key_required
+    def post(self):
+        return DashboardStatistics.refresh(), 200
+
+
 class QueueScheduleEntry(MethodView):
     @api_key_required
     def get(self, schedule_id: str):
@@ -79,7 +122,7 @@ class Products(MethodView):
     def put(self, product_id: str):
         if render_result := request.data:
             sse_manager.product_rendered(product_id)
-            return Product.update_render_for_id(product_id, render_result)
+            return Product.update_render_for_id(product_id, render_result, request.headers.get("X-Render-Fingerprint"))
 
         return {"error": "Error reading file"}, 400
 
@@ -88,7 +131,7 @@ class ProductsRender(MethodView):
     @api_key_required
     def get(self, product_id: str):
         if product_data := Product.get_render(product_id):
-            return Response(product_data["blob"], headers={"Content-Type": product_data["mime_type"]}, status=200)
+            return send_blob(product_data["blob_key"], product_data["mime_type"], product_data["blob"])
         return {"error": f"Product {product_id} not found"}, 404
 
 
@@ -98,7 +141,7 @@ class Presenters(MethodView):
         try:
             if pres := ProductType.get(presenter):
                 if tmpl := pres.get_template():
-                    return send_file(tmpl)
+                    return send_file(tmpl, etag=pres.get_template_hash(), max_age=0)
             return {"error": f"Presenter with id {presenter} not found"}, 404
         except Exception:
             logger.exception()
@@ -154,21 +197,48 @@ class SourceIcon(MethodView):
 class Stories(MethodView):
     @api_key_required
     def get(self):
-        filter_keys = ["search", "in_report", "timefrom", "sort", "range", "limit", "no_count", "exclude_attr", "story_id"]
+        filter_keys = ["search", "in_report", "timefrom", "sort", "range", "limit", "no_count", "exclude_attr", "story_id", "cursor"]
         filter_args: dict[str, str | int | list] = {k: v for k, v in request.args.items() if k in filter_keys}
         filter_list_keys = ["source", "group"]
         for key in filter_list_keys:
             filter_args[key] = request.args.getlist(key)
 
-        if story := Story.get_for_worker(filter_args):
-            return story, 200
+        try:
+            fields = StoryFields.parse(request.args["fields"]) if "fields" in request.args else None
+            stories, next_cursor = Story.get_for_worker(filter_args, fields)
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        if stories:
+            return stories, 200, {"X-Next-Cursor": next_cursor} if next_cursor else {}
         return {"error": "No stories found"}, 404
 
 
+class StoriesExport(MethodView):
+    @api_key_required
+    def get(self):
+        filter_keys = ["search", "in_report", "timefrom", "sort", "range", "limit", "exclude_attr", "story_id", "cursor"]
+        filter_args: dict[str, str | int | list] = {k: v for k, v in request.args.items() if k in filter_keys}
+        for key in ["source", "group"]:
+            filter_args[key] = request.args.getlist(key)
+        try:
+            fields = StoryFields.parse(request.args["fields"]) if "fields" in request.args else None
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        return export_response(Story.iter_for_export(filter_args, fields))
+
+
+class NewsItemsExport(MethodView):
+    @api_key_required
+    def get(self):
+        filter_keys = ["search", "range", "sort", "timefrom", "timeto", "limit", "cursor"]
+        filter_args: dict[str, str | int | list] = {k: v for k, v in request.args.items() if k in filter_keys}
+        return export_response(NewsItem.iter_for_export(filter_args))
+
+
 class Tags(MethodView):
     @api_key_required
     def get(self):
-        if tags := NewsItemTag.get_all():
+        if tags := Tag.get_all():
             return {tag.name: tag.to_dict() for tag in tags}, 200
         return {"error": "No tags found"}, 404
 
@@ -176,15 +246,9 @@ class Tags(MethodView):
     def put(self):
         if not (data := request.json):
             return {"error": "No data provided"}, 400
-        errors = {}
-        bot_type = request.args.get("bot_type", default="")
-        for story_id, tags in data.items():
-            _, status = Story.update_tags(story_id, tags, bot_type)
-            if status != 200:
-                errors[story_id] = status
-        if errors:
-            return {"message": "Some tags failed to update", "errors": errors}, 207
-        return {"message": "Tags updated"}, 200
+        if not isinstance(data, dict):
+            return {"error": "Expected an object of story ids to tags"}, 400
+        return Story.update_tags_bulk(data, request.args.get("bot_type", default=""))
 
 
 class DropTags(MethodView):
@@ -260,10 +324,14 @@ def initialize(app: Flask):
     app.add_url_rule(f"{worker_url}/presenters/<string:presenter>", view_func=Presenters.as_view("presenters_worker"))
     app.add_url_rule(f"{worker_url}/publishers/<string:publisher>", view_func=Publishers.as_view("publishers_worker"))
     app.add_url_rule(f"{worker_url}/news-items", view_func=AddNewsItems.as_view("news_items_worker"))
+    app.add_url_rule(f"{worker_url}/news-items/unknown", view_func=UnknownNewsItems.as_view("unknown_news_items_worker"))
+    app.add_url_rule(f"{worker_url}/news-items/export", view_func=NewsItemsExport.as_view("news_items_export_worker"))
+    app.add_url_rule(f"{worker_url}/dashboard-statistics", view_func=RefreshDashboardStatistics.as_view("dashboard_statistics_worker"))
     app.add_url_rule(f"{worker_url}/bots", view_func=BotInfo.as_view("bots_worker"))
     app.add_url_rule(f"{worker_url}/tags", view_func=Tags.as_view("tags_worker"))
     app.add_url_rule(f"{worker_url}/bots/<string:bot_id>", view_func=BotInfo.as_view("bot_info_worker"))
     app.add_url_rule(f"{worker_url}/post-collection-bots", view_func=PostCollectionBots.as_view("post_collection_bots_worker"))
     app.add_url_rule(f"{worker_url}/stories", view_func=Stories.as_view("stories_worker"))
+    app.add_url_rule(f"{worker_url}/stories/export", view_func=StoriesExport.as_view("stories_export_worker"))
     app.add_url_rule(f"{worker_url}/word-lists", view_func=WordLists.as_view("word_lists_worker"))
     app.add_url_rule(f"{worker_url}/word-list/<int:word_list_id>", view_func=WordLists.as_view("word_list_by_id_worker"))
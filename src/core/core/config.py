@@ -18,6 +18,12 @@ class Settings(BaseSettings):
     JWT_IDENTITY_CLAIM: str = "sub"
     JWT_ACCESS_TOKEN_EXPIRES: int = 14400
     JWT_TOKEN_LOCATION: list = ["headers", "query_string"]
+    PRINCIPAL_CACHE_TTL: int = 60
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    ACL_CACHE_TTL: int = 30
+    REVOKED_TOKEN_REFRESH_INTERVAL: int = 2
+    REVOKED_TOKEN_REFRESH_MARGIN: int = 60
+    REVOKED_TOKEN_RELOAD_INTERVAL: int = 300
 
     DB_URL: str = "localhost"
     DB_DATABASE: str = "taranis"
@@ -32,10 +38,35 @@ class Settings(BaseSettings):
     BUILD_DATE: datetime = datetime.now()
     GIT_INFO: dict[str, str] | None = None
     DATA_FOLDER: str = "./taranis_data"
+    BLOB_STORE: Literal["filesystem", "s3"] = "filesystem"
+    BLOB_FOLDER: str | None = None
+    BLOB_S3_BUCKET: str = "taranis"
+    BLOB_S3_PREFIX: str = "blobs/"
+    BLOB_S3_ENDPOINT_URL: str | None = None
+    BLOB_GC_MIN_AGE: int = 3600
     CACHE_TYPE: str = "SimpleCache"
     CACHE_DEFAULT_TIMEOUT: int = 300
+    CACHE_REDIS_URL: str | None = None
+    RESPONSE_CACHE_TIMEOUT: int = 60
+    ICON_CACHE_MAX_AGE: int = 365 * 24 * 3600
+    COUNT_CACHE_TIMEOUT: int = 300
+    COUNT_ESTIMATE_THRESHOLD: int = 100000
+    DASHBOARD_CACHE_TIMEOUT: int = 30
+    DASHBOARD_STATISTICS_MAX_AGE: int = 900
+    EXPORT_BATCH_SIZE: int = 500
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    MAX_DECOMPRESSED_REQUEST_SIZE: int = 256 * 1024 * 1024
     SSE_URL: str = "http://sse:8088/publish"
     DISABLE_SSE: bool = False
+    SSE_TIMEOUT: int = 5
+    SSE_QUEUE_SIZE: int = 1000
+    SSE_QUEUE_POLICY: Literal["drop_oldest", "drop_newest"] = "drop_oldest"
+    SSE_COALESCE_INTERVAL: float = 1.0
+    SSE_BATCH_SIZE: int = 100
+    REPORT_ITEM_LOCK_TIMEOUT: int = 300
+    SEARCH_BACKEND: Literal["auto", "postgresql", "sqlite", "like"] = "auto"
 
     @model_validator(mode="after")  # type: ignore
     def set_sqlalchemy_uri(self) -> "Settings":
@@ -83,5 +114,12 @@ class Settings(BaseSettings):
         }
         return self
 
+    @model_validator(mode="after")
+    def set_cache_type(self):
+        # a shared backend keeps cached responses and invalidation versions consistent across Granian workers
+        if self.CACHE_REDIS_URL and self.CACHE_TYPE == "SimpleCache":
+            self.CACHE_TYPE = "RedisCache"
+        return self
+
 
 Config = Settings()
@@ -2,6 +2,7 @@ __all__ = [
     "api_manager",
     "asset_manager",
     "auth_manager",
+    "cache_manager",
     "db_manager",
     "sse_manager",
     "queue_manager",
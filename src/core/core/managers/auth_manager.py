@@ -12,6 +12,7 @@ from core.auth.test_authenticator import TestAuthenticator
 from core.auth.database_authenticator import DatabaseAuthenticator
 from core.model.token_blacklist import TokenBlacklist
 from core.model.user import User
+from core.service.principal import PrincipalService
 
 from core.config import Config
 
@@ -136,7 +137,7 @@ def get_access_key():
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data):
     identity = jwt_data[Config.JWT_IDENTITY_CLAIM]
-    return User.find_by_name(identity) if identity else None
+    return PrincipalService.load_user(identity, jwt_data.get("iat")) if identity else None
 
 
 @jwt.user_identity_loader
@@ -0,0 +1,179 @@
+import os
+import time
+import hashlib
+import tempfile
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator
+from flask import Response, request, send_file
+
+from core.config import Config
+from core.log import logger
+
+try:
+    import boto3
+except ImportError:
+    boto3 = None
+
+
+def blob_key(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """
+    Content addressed storage for binary data, every blob is stored once under the sha256 of its content
+    """
+
+    @abstractmethod
+    def put(self, data: bytes) -> str:
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> bytes | None:
+        pass
+
+    @abstractmethod
+    def delete(self, key: str):
+        pass
+
+    @abstractmethod
+    def list_keys(self, older_than: float) -> Iterator[str]:
+        """
+        Keys of blobs last written more than older_than seconds ago
+        """
+
+    @abstractmethod
+    def send(self, key: str, mimetype: str, download_name: str | None = None) -> Response:
+        """
+        Stream a blob with ETag, conditional and Range request support
+        """
+
+
+class FileSystemBlobStore(BlobStore):
+    def __init__(self, root: str | Path):
+        self.root = Path(root).absolute()
+
+    def path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / key
+
+    def put(self, data: bytes) -> str:
+        key = blob_key(data)
+        path = self.path(key)
+        if path.exists():
+            path.touch()
+            return key
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write and rename so concurrent readers never see a partial blob
+        with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as tmp:
+            tmp.write(data)
+        os.replace(tmp.name, path)
+        return key
+
+    def get(self, key: str) -> bytes | None:
+        path = self.path(key)
+        return path.read_bytes() if path.is_file() else None
+
+    def delete(self, key: str):
+        self.path(key).unlink(missing_ok=True)
+
+    def list_keys(self, older_than: float) -> Iterator[str]:
+        deadline = time.time() - older_than
+        for path in self.root.glob("*/*/*"):
+            if path.is_file() and len(path.name) == 64 and path.stat().st_mtime < deadline:
+                yield path.name
+
+    def send(self, key: str, mimetype: str, download_name: str | None = None) -> Response:
+        path = self.path(key)
+        if not path.is_file():
+            return Response(status=404)
+        response = send_file(path, mimetype=mimetype, download_name=download_name, etag=key, conditional=True, max_age=0)
+        response.headers["Content-Type"] = mimetype
+        return response
+
+
+class S3BlobStore(BlobStore):
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: str | None = None):
+        if boto3 is None:
+            raise RuntimeError("BLOB_STORE s3 requires the optional boto3 package")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def object_key(self, key: str) -> str:
+        return f"{self.prefix}{key}"
+
+    def put(self, data: bytes) -> str:
+        key = blob_key(data)
+        self.client.put_object(Bucket=self.bucket, Key=self.object_key(key), Body=data)
+        return key
+
+    def get(self, key: str) -> bytes | None:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self.object_key(key))["Body"].read()
+        except self.client.exceptions.NoSuchKey:
+            return None
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self.object_key(key))
+
+    def list_keys(self, older_than: float) -> Iterator[str]:
+        deadline = time.time() - older_than
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                if item["LastModified"].timestamp() < deadline:
+                    yield item["Key"].removeprefix(self.prefix)
+
+    def send(self, key: str, mimetype: str, download_name: str | None = None) -> Response:
+        if request.if_none_match.contains(key):
+            response = Response(status=304)
+            response.set_etag(key)
+            return response
+        params = {"Bucket": self.bucket, "Key": self.object_key(key)}
+        if range_header := request.headers.get("Range"):
+            params["Range"] = range_header
+        try:
+            obj = self.client.get_object(**params)
+        except self.client.exceptions.NoSuchKey:
+            return Response(status=404)
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "InvalidRange":
+                return Response(status=416)
+            raise
+        headers = {"Content-Length": str(obj["ContentLength"]), "Accept-Ranges": "bytes"}
+        if content_range := obj.get("ContentRange"):
+            headers["Content-Range"] = content_range
+        if download_name:
+            headers["Content-Disposition"] = f'attachment; filename="{download_name}"'
+        response = Response(obj["Body"].iter_chunks(64 * 1024), status=206 if content_range else 200, mimetype=mimetype, headers=headers)
+        response.headers["Content-Type"] = mimetype
+        response.set_etag(key)
+        return response
+
+
+blob_stores: dict[int, BlobStore] = {}
+
+
+def get_blob_store() -> BlobStore:
+    """
+    Store configured by BLOB_STORE, created once per process
+    """
+    pid = os.getpid()
+    if (store := blob_stores.get(pid)) is None:
+        blob_stores.clear()
+        if Config.BLOB_STORE == "s3":
+            store = S3BlobStore(Config.BLOB_S3_BUCKET, Config.BLOB_S3_PREFIX, Config.BLOB_S3_ENDPOINT_URL)
+        else:
+            store = FileSystemBlobStore(Config.BLOB_FOLDER or Path(Config.DATA_FOLDER) / "blobs")
+        logger.debug(f"Using {type(store).__name__} for binary data")
+        blob_stores[pid] = store
+    return store
+
+
+def send_blob(key: str | None, mimetype: str, data: bytes | None = None) -> Response:
+    """
+    Stream a blob from the store, or inline data that has not been moved to the store yet
+    """
+    if key:
+        return get_blob_store().send(key, mimetype)
+    return Response(data or b"", headers={"Content-Type": mimetype})
@@ -0,0 +1,138 @@
+import json
+import uuid
+import hashlib
+from functools import wraps
+from flask import Flask, request
+from flask_caching import Cache
+from flask_jwt_extended import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from core.config import Config
+from core.log import logger
+
+
+cache = Cache()
+
+STORY_CACHE_NAMESPACE = "stories"
+OSINT_SOURCE_CACHE_NAMESPACE = "osint_sources"
+WORKER_CACHE_NAMESPACE = "workers"
+
+
+def initialize(app: Flask):
+    cache.init_app(app)
+    if Config.RESPONSE_CACHE_TIMEOUT > 0 and not is_shared():
+        logger.info(f"Response cache disabled, CACHE_TYPE {Config.CACHE_TYPE} is not shared between processes, set CACHE_REDIS_URL")
+
+
+def is_shared() -> bool:
+    """
+    Whether all core processes use the same cache, caches invalidated on writes are only consistent across workers if they do
+    """
+    return Config.CACHE_TYPE.rsplit(".", 1)[-1].lower() not in ("simplecache", "simple", "nullcache", "null")
+
+
+def get_version(namespace: str) -> str:
+    """
+    Current version stamp of a cache namespace, part of every cache key in that namespace
+    """
+    version_key = f"{namespace}:version"
+    if version := cache.get(version_key):
+        return version
+    version = uuid.uuid4().hex
+    cache.set(version_key, version, timeout=0)
+    return version
+
+
+def invalidate(namespace: str):
+    """
+    Invalidate all entries of a namespace at once by replacing its version stamp
+    """
+    cache.set(f"{namespace}:version", uuid.uuid4().hex, timeout=0)
+
+
+def track_changes(namespace: str, models: tuple[type, ...]):
+    """
+    Invalidate a namespace after every commit that changed instances of the given models, by unit of work or bulk statement
+    """
+
+    def track_flush(session: Session, flush_context, instances):
+        if any(isinstance(obj, models) for obj in (*session.new, *session.dirty, *session.deleted)):
+            session.info.setdefault("changed_namespaces", set()).add(namespace)
+
+    def track_statement(orm_execute_state):
+        if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+            return
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, models):
+            orm_execute_state.session.info.setdefault("changed_namespaces", set()).add(namespace)
+
+    event.listen(Session, "before_flush", track_flush)
+    event.listen(Session, "do_orm_execute", track_statement)
+
+
+def invalidate_changed_namespaces(session: Session):
+    for namespace in session.info.pop("changed_namespaces", ()):
+        invalidate(namespace)
+
+
+def discard_changed_namespaces(session: Session, previous_transaction):
+    session.info.pop("changed_namespaces", None)
+
+
+event.listen(Session, "after_commit", invalidate_changed_namespaces)
+event.listen(Session, "after_soft_rollback", discard_changed_namespaces)
+
+
+def get_response_cache_key(namespaces: tuple[str, ...], per_user: bool) -> str:
+    """
+    Key of a GET response by endpoint, normalized arguments and the ACL/TLP signature of the current user
+    """
+    access: dict = {}
+    if current_user:
+        tlp_level = current_user.get_highest_tlp()
+        access = {"roles": sorted(current_user.get_roles()), "tlp": tlp_level.value if tlp_level else None}
+        if per_user:
+            access["user"] = current_user.id
+    key_data = json.dumps(
+        {
+            "view_args": request.view_args,
+            "args": sorted((key, sorted(values)) for key, values in request.args.lists()),
+            "access": access,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    versions = ":".join(get_version(namespace) for namespace in namespaces)
+    return f"response:{request.endpoint}:{versions}:{hashlib.sha256(key_data.encode()).hexdigest()}"
+
+
+def is_cacheable(result) -> bool:
+    if isinstance(result, tuple):
+        return len(result) == 2 and result[1] == 200 and isinstance(result[0], (dict, list))
+    return isinstance(result, (dict, list))
+
+
+def cache_response(*namespaces: str, per_user: bool = False):
+    """
+    Cache successful JSON results of a GET view until one of the namespaces is invalidated or RESPONSE_CACHE_TIMEOUT passes.
+    Place it below auth_required, responses are shared between users with the same roles and TLP level unless per_user is set.
+    Only active with a shared cache backend, a per-process cache would keep serving entries other workers invalidated.
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if Config.RESPONSE_CACHE_TIMEOUT <= 0 or not is_shared():
+                return f(*args, **kwargs)
+            key = get_response_cache_key(namespaces, per_user)
+            if (cached := cache.get(key)) is not None:
+                return cached
+            result = f(*args, **kwargs)
+            if is_cacheable(result):
+                cache.set(key, result, timeout=Config.RESPONSE_CACHE_TIMEOUT)
+            return result
+
+        return decorated_function
+
+    return decorator
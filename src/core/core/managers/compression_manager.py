@@ -0,0 +1,110 @@
+import io
+import json
+import zlib
+from flask import Flask, Response, request
+from werkzeug.wsgi import get_input_stream
+
+from core.config import Config
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/x-ndjson", "application/javascript", "application/xml", "image/svg+xml"}
+
+
+def supported_encodings() -> list[str]:
+    """
+    Content codings in order of preference, zstd only when the optional zstandard package is installed
+    """
+    return ["zstd", "gzip"] if zstandard else ["gzip"]
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd" and zstandard:
+        return zstandard.ZstdCompressor(level=Config.COMPRESSION_ZSTD_LEVEL).compress(data)
+    compressor = zlib.compressobj(Config.COMPRESSION_GZIP_LEVEL, wbits=31)
+    return compressor.compress(data) + compressor.flush()
+
+
+def decompress(data: bytes, encoding: str, max_size: int) -> bytes:
+    """
+    Decompress a request body, raises ValueError for corrupt bodies and OverflowError above max_size bytes
+    """
+    try:
+        if encoding == "zstd" and zstandard:
+            body = zstandard.ZstdDecompressor().stream_reader(io.BytesIO(data)).read(max_size + 1)
+        else:
+            decompressor = zlib.decompressobj(wbits=47)
+            body = decompressor.decompress(data, max_size + 1)
+            if not decompressor.eof and not decompressor.unconsumed_tail:
+                raise ValueError("Truncated request body")
+    except (zlib.error, getattr(zstandard, "ZstdError", zlib.error)) as e:
+        raise ValueError(f"Invalid {encoding} request body") from e
+    if len(body) > max_size:
+        raise OverflowError(f"Decompressed request body exceeds {max_size} bytes")
+    return body
+
+
+class RequestDecompression:
+    """
+    WSGI middleware replacing gzip or zstd encoded request bodies by their decompressed content
+    """
+
+    def __init__(self, wsgi_app, max_size: int):
+        self.wsgi_app = wsgi_app
+        self.max_size = max_size
+
+    def __call__(self, environ, start_response):
+        encoding = environ.get("HTTP_CONTENT_ENCODING", "").strip().lower()
+        if encoding in ("", "identity"):
+            return self.wsgi_app(environ, start_response)
+        if encoding not in supported_encodings():
+            return self.error(f"Unsupported Content-Encoding {encoding}", 415)(environ, start_response)
+        try:
+            body = decompress(get_input_stream(environ).read(), encoding, self.max_size)
+        except OverflowError as e:
+            return self.error(str(e), 413)(environ, start_response)
+        except ValueError as e:
+            return self.error(str(e), 400)(environ, start_response)
+
+        environ["wsgi.input"] = io.BytesIO(body)
+        environ["CONTENT_LENGTH"] = str(len(body))
+        environ.pop("HTTP_CONTENT_ENCODING", None)
+        return self.wsgi_app(environ, start_response)
+
+    @staticmethod
+    def error(message: str, status: int) -> Response:
+        return Response(
+            json.dumps({"error": message}),
+            status=status,
+            mimetype="application/json",
+            headers={"Accept-Encoding": ", ".join(supported_encodings())},
+        )
+
+
+def compress_response(response: Response) -> Response:
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or not (response.mimetype in COMPRESSIBLE_MIMETYPES or response.mimetype.startswith("text/"))
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+    ):
+        return response
+    response.vary.add("Accept-Encoding")
+    if not (encoding := request.accept_encodings.best_match(supported_encodings())):
+        return response
+    data = response.get_data()
+    if len(data) < Config.COMPRESSION_MIN_SIZE:
+        return response
+    response.set_data(compress(data, encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+
+def initialize(app: Flask):
+    app.wsgi_app = RequestDecompression(app.wsgi_app, Config.MAX_DECOMPRESSED_REQUEST_SIZE)
+    app.after_request(compress_response)
@@ -12,6 +12,7 @@ from kombu import Queue
 queue_manager: "QueueManager"
 periodic_tasks = [
     {"id": "cleanup_token_blacklist", "task": "cleanup_token_blacklist", "schedule": "daily", "args": [], "options": {"queue": "misc"}},
+    {"id": "refresh_dashboard_statistics", "task": "refresh_dashboard_statistics", "schedule": "5", "args": [], "options": {"queue": "misc"}},
 ]
 
 
@@ -149,8 +150,8 @@ class QueueManager:
             return {"message": f"Executing Bot {bot_id} scheduled", "id": bot_id}, 200
         return {"error": "Could not reach rabbitmq"}, 500
 
-    def generate_product(self, product_id: int):
-        if self.send_task("presenter_task", args=[product_id], queue="presenters"):
+    def generate_product(self, product_id: int, force: bool = False):
+        if self.send_task("presenter_task", args=[product_id], kwargs={"force": force}, queue="presenters"):
             logger.info(f"Generating Product {product_id} scheduled")
             return {"message": f"Generating Product {product_id} scheduled"}, 200
         return {"error": "Could not reach rabbitmq"}, 500
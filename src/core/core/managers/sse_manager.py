@@ -1,36 +1,136 @@
+import os
+import json
+import time
+import threading
 import requests
-from datetime import datetime
+from collections import OrderedDict
 
 from core.config import Config
 from core.log import logger
+from core.managers.cache_manager import invalidate, STORY_CACHE_NAMESPACE
+
+
+# cached responses that an event makes stale, also for changes that bypass the ORM change tracking
+EVENT_CACHE_NAMESPACES = {
+    "news-items-updated": (STORY_CACHE_NAMESPACE,),
+    "report-item-updated": (STORY_CACHE_NAMESPACE,),
+}
 
 
 class SSEManager:
+    """
+    Publishes events to the SSE broker from a background sender thread.
+
+    Identical events waiting in the queue are coalesced into the latest one, a full queue drops events according to SSE_QUEUE_POLICY.
+    """
+
     def __init__(self):
-        self.report_item_locks: dict = {}
         self.sse_url = Config.SSE_URL
         self.api_key = Config.API_KEY
         self.headers = self.get_headers()
-        self.timeout = 60
+        self.timeout = Config.SSE_TIMEOUT
         self.broker_error = 0
+        self.pid: int | None = None
+        self.reset()
+
+    def reset(self):
+        self.pid = os.getpid()
+        self.condition = threading.Condition()
+        self.pending: OrderedDict[tuple[str, str], dict] = OrderedDict()
+        self.sender: threading.Thread | None = None
+        self.session = requests.Session()
+        self.counters = dict.fromkeys(("enqueued", "coalesced", "dropped", "sent", "failed"), 0)
 
     def get_headers(self) -> dict:
         return {"X-API-KEY": self.api_key, "Content-type": "application/json"}
 
     def publish(self, json_data) -> bool:
+        """
+        Queue an event for the sender thread without blocking, returns False if the event was dropped
+        """
+        for namespace in EVENT_CACHE_NAMESPACES.get(json_data.get("event"), ()):
+            invalidate(namespace)
         if self.broker_error > 3 or Config.DISABLE_SSE:
             return False
+        if self.pid != os.getpid():
+            # locks, thread and pooled sockets of the parent process are unusable after a fork
+            self.reset()
+        key = (json_data.get("event", ""), json.dumps(json_data.get("data"), sort_keys=True, default=str))
+        with self.condition:
+            if key in self.pending:
+                # the repeated event supersedes everything queued in between, e.g. locked, unlocked, locked must end on locked
+                self.pending.move_to_end(key)
+                self.pending[key] = json_data
+                self.counters["coalesced"] += 1
+                return True
+            if len(self.pending) >= Config.SSE_QUEUE_SIZE:
+                self.counters["dropped"] += 1
+                if Config.SSE_QUEUE_POLICY == "drop_newest":
+                    return False
+                self.pending.popitem(last=False)
+            self.pending[key] = json_data
+            self.counters["enqueued"] += 1
+            self.start_sender()
+            self.condition.notify()
+        return True
+
+    def start_sender(self):
+        if self.sender is None or not self.sender.is_alive():
+            self.sender = threading.Thread(target=self.run_sender, name="sse-sender", daemon=True)
+            self.sender.start()
+
+    def run_sender(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.pending)
+            # let a burst of events accumulate so duplicates coalesce before anything is sent
+            time.sleep(Config.SSE_COALESCE_INTERVAL)
+            self.flush()
+
+    def flush(self):
+        """
+        Send all queued events in batches of SSE_BATCH_SIZE over the keep-alive session
+        """
+        while batch := self.take_batch():
+            for json_data in batch:
+                self.send(json_data)
+
+    def take_batch(self) -> list[dict]:
+        with self.condition:
+            return [self.pending.popitem(last=False)[1] for _ in range(min(len(self.pending), Config.SSE_BATCH_SIZE))]
+
+    def send(self, json_data: dict) -> bool:
+        if self.broker_error > 3:
+            self.count("dropped")
+            return False
         try:
-            response = requests.post(url=self.sse_url, headers=self.headers, json=json_data, timeout=self.timeout)
-            if not response.ok:
-                logger.debug(f"Failed to publish to SSE: {response.text}")
-                self.broker_error += 1
-
-            logger.debug(f"Publishing to SSE: {json_data}")
-            return response.ok
+            response = self.session.post(url=self.sse_url, headers=self.headers, json=json_data, timeout=self.timeout)
         except requests.exceptions.RequestException:
             self.broker_error += 1
+            self.count("failed")
+            return False
+        if not response.ok:
+            logger.debug(f"Failed to publish to SSE: {response.text}")
+            self.broker_error += 1
+            self.count("failed")
             return False
+        logger.debug(f"Publishing to SSE: {json_data}")
+        self.count("sent")
+        return True
+
+    def count(self, counter: str):
+        with self.condition:
+            self.counters[counter] += 1
+
+    def metrics(self) -> dict:
+        with self.condition:
+            return self.counters | {
+                "queue_depth": len(self.pending),
+                "queue_size": Config.SSE_QUEUE_SIZE,
+                "queue_policy": Config.SSE_QUEUE_POLICY,
+                "broker_errors": self.broker_error,
+                "sender_alive": self.sender is not None and self.sender.is_alive(),
+            }
 
     def connected(self):
         self.publish({"data": "Connected", "event": "connected"})
@@ -44,56 +144,11 @@ class SSEManager:
     def product_rendered(self, data):
         self.publish({"data": data, "event": "product-rendered"})
 
-    def to_report_item_json(self, report_item_id: int):
-        if report_item_id not in self.report_item_locks.keys():
-            return {"report_item_id": report_item_id, "locked": False}
-        return {
-            "report_item_id": report_item_id,
-            "locked": True,
-            "lock_time": self.report_item_locks[report_item_id]["lock_time"].isoformat(),
-        }
-
-    def report_item_lock(self, report_item_id: int, user_id):
-        if report_item_id in self.report_item_locks:
-            if self.report_item_locks[report_item_id]["user_id"] == user_id:
-                self.report_item_locks[report_item_id]["lock_time"] = datetime.now()
-            return self.to_report_item_json(report_item_id), 200
-        self.report_item_locks[report_item_id] = {"user_id": user_id, "lock_time": datetime.now()}
-        self.publish(
-            {
-                "data": report_item_id,
-                "event": "report-item-locked",
-            }
-        )
-        return self.to_report_item_json(report_item_id), 200
-        # schedule.every(1).minute.do(self.schedule_unlock_report_item, report_item_id, user_id)
-
-    def report_item_unlock(self, report_item_id: int, user_id):
-        if report_item_id not in self.report_item_locks.keys():
-            return self.to_report_item_json(report_item_id), 200
-
-        del self.report_item_locks[report_item_id]
-
-        self.publish(
-            {
-                "data": report_item_id,
-                "event": "report-item-unlocked",
-            }
-        )
-        return self.to_report_item_json(report_item_id), 200
-
-    # def schedule_unlock_report_item(self, report_item_id: int, user_id, time_to_unlock: datetime):
-    #     if report_item_id not in self.report_item_locks:
-    #         return schedule.CancelJob
-
-    #     if self.report_item_locks[report_item_id]["user_id"] != user_id:
-    #         return schedule.CancelJob
-
-    #     if self.report_item_locks[report_item_id]["lock_time"] > time_to_unlock:
-    #         return
+    def report_item_locked(self, report_item_id: str):
+        self.publish({"data": report_item_id, "event": "report-item-locked"})
 
-    #     self.report_item_unlock(report_item_id, user_id)
-    #     return schedule.CancelJob
+    def report_item_unlocked(self, report_item_id: str):
+        self.publish({"data": report_item_id, "event": "report-item-unlocked"})
 
 
 sse_manager = SSEManager()
@@ -1,4 +1,4 @@
-from typing import Any, TypeVar, Type, Sequence
+from typing import Any, Iterable, TypeVar, Type, Sequence
 from datetime import datetime
 from enum import Enum
 import json
@@ -38,7 +38,10 @@ class BaseModel(db.Model):
         table = getattr(self, "__table__", None)
         if table is None:
             return {}
-        data = {c.name: getattr(self, c.name) for c in table.columns}
+        return self.columns_to_dict(c.name for c in table.columns)
+
+    def columns_to_dict(self, columns: Iterable[str]) -> dict[str, Any]:
+        data = {column: getattr(self, column) for column in columns}
         for key, value in data.items():
             if isinstance(value, datetime):
                 data[key] = value.isoformat()
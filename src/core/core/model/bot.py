@@ -7,6 +7,7 @@ from sqlalchemy.sql import Select
 
 from core.log import logger
 from core.managers.db_manager import db
+from core.managers.cache_manager import track_changes, WORKER_CACHE_NAMESPACE
 from core.model.base_model import BaseModel
 from core.model.parameter_value import ParameterValue
 from core.model.worker import BOT_TYPES, Worker
@@ -126,3 +127,6 @@ class Bot(BaseModel):
 class BotParameterValue(BaseModel):
     bot_id: Mapped[str] = db.Column(db.String, db.ForeignKey("bot.id", ondelete="CASCADE"), primary_key=True)
     parameter_value_id: Mapped[int] = db.Column(db.Integer, db.ForeignKey("parameter_value.id"), primary_key=True)
+
+
+track_changes(WORKER_CACHE_NAMESPACE, (Bot, BotParameterValue))
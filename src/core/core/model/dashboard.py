@@ -0,0 +1,74 @@
+from datetime import datetime, timedelta
+from typing import Any
+from sqlalchemy.orm import Mapped
+
+from core.managers.db_manager import db
+from core.managers.cache_manager import cache
+from core.model.base_model import BaseModel
+from core.model.news_item import NewsItem
+from core.model.product import Product
+from core.model.report_item import ReportItem
+from core.model.queue import ScheduleEntry
+from core.config import Config
+
+DASHBOARD_CACHE_KEY = "dashboard_statistics"
+
+
+class DashboardStatistics(BaseModel):
+    """
+    Snapshot of the dashboard counters, refreshed by the refresh_dashboard_statistics periodic task
+    """
+
+    __tablename__ = "dashboard_statistics"
+
+    id: Mapped[int] = db.Column(db.Integer, primary_key=True)
+    data: Any = db.Column(db.JSON)
+    as_of: Mapped[datetime] = db.Column(db.DateTime)
+
+    def __init__(self, data: dict, as_of: datetime, id: int = 1):
+        self.id = id
+        self.data = data
+        self.as_of = as_of
+
+    @classmethod
+    def compute(cls) -> dict[str, Any]:
+        total_news_items = NewsItem.get_count()
+        total_products = Product.get_count()
+        report_items_completed = ReportItem.count_all(True)
+        report_items_in_progress = ReportItem.count_all(False)
+        latest_collected = db.session.execute(db.select(db.func.max(NewsItem.collected))).scalar()
+        return {
+            "total_news_items": total_news_items,
+            "total_products": total_products,
+            "report_items_completed": report_items_completed,
+            "report_items_in_progress": report_items_in_progress,
+            "total_database_items": total_news_items + total_products + report_items_completed + report_items_in_progress,
+            "latest_collected": latest_collected.isoformat() if latest_collected else "",
+            "schedule_lenght": ScheduleEntry.get_count(),
+        }
+
+    @classmethod
+    def refresh(cls) -> dict[str, Any]:
+        snapshot = cls(cls.compute(), datetime.now())
+        db.session.merge(snapshot)
+        db.session.commit()
+        result = snapshot.to_snapshot_dict()
+        cache.set(DASHBOARD_CACHE_KEY, result, timeout=Config.DASHBOARD_CACHE_TIMEOUT)
+        return result
+
+    def to_snapshot_dict(self) -> dict[str, Any]:
+        return self.data | {"as_of": self.as_of.isoformat()}
+
+    @classmethod
+    def get_snapshot(cls) -> dict[str, Any]:
+        """
+        Latest snapshot from cache or database, only recomputed inline when missing or older than DASHBOARD_STATISTICS_MAX_AGE
+        """
+        if cached := cache.get(DASHBOARD_CACHE_KEY):
+            return cached
+        snapshot = db.session.get(cls, 1)
+        if snapshot is None or snapshot.as_of < datetime.now() - timedelta(seconds=Config.DASHBOARD_STATISTICS_MAX_AGE):
+            return cls.refresh()
+        result = snapshot.to_snapshot_dict()
+        cache.set(DASHBOARD_CACHE_KEY, result, timeout=Config.DASHBOARD_CACHE_TIMEOUT)
+        return result
@@ -1,9 +1,9 @@
 import uuid
 import hashlib
 from datetime import datetime, timedelta
-from typing import Any, Sequence
+from typing import Any, Iterator, Sequence
 from sqlalchemy.sql import Select
-from sqlalchemy.orm import Mapped, relationship
+from sqlalchemy.orm import Mapped, relationship, selectinload
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
@@ -16,6 +16,8 @@ from core.model.role_based_access import ItemType, RoleBasedAccess
 from core.model.osint_source import OSINTSource
 from core.model.news_item_attribute import NewsItemAttribute
 from core.service.role_based_access import RBACQuery, RoleBasedAccessService
+from core.service.pagination import PageCursor
+from core.config import Config
 
 
 class NewsItem(BaseModel):
@@ -28,7 +30,7 @@ class NewsItem(BaseModel):
     review: Mapped[str] = db.Column(db.String())
     author: Mapped[str] = db.Column(db.String())
     source: Mapped[str] = db.Column(db.String())
-    link: Mapped[str] = db.Column(db.String())
+    link: Mapped[str] = db.Column(db.String(), index=True)
     language: Mapped[str] = db.Column(db.String())
     content: Mapped[str] = db.Column(db.String())
     collected: Mapped[datetime] = db.Column(db.DateTime)
@@ -85,6 +87,26 @@ class NewsItem(BaseModel):
     def identical(cls, hash) -> bool:
         return db.session.execute(db.select(db.exists().where(cls.hash == hash))).scalar_one()
 
+    @classmethod
+    def get_known(cls, column, values: list[str], chunk_size: int = 500) -> set[str]:
+        known = set()
+        for i in range(0, len(values), chunk_size):
+            chunk = values[i : i + chunk_size]
+            known.update(db.session.execute(db.select(column).where(column.in_(chunk))).scalars())
+        return known
+
+    @classmethod
+    def filter_unknown(cls, hashes: list[str], links: list[str]) -> dict[str, list[str]]:
+        """
+        Return the hashes and links that are not stored yet, so collectors can skip known articles before downloading them
+        """
+        known_hashes = cls.get_known(cls.hash, hashes)
+        known_links = cls.get_known(cls.link, links)
+        return {
+            "hashes": [item_hash for item_hash in hashes if item_hash not in known_hashes],
+            "links": [link for link in links if link not in known_links],
+        }
+
     @classmethod
     def find_by_hash(cls, hash):
         return cls.get_filtered(db.select(cls).where(cls.hash == hash))
@@ -103,6 +125,12 @@ class NewsItem(BaseModel):
             data["attributes"] = [attribute.to_dict() for attribute in attributes]
         return data
 
+    def to_projected_dict(self, fields: set[str]) -> dict[str, Any]:
+        data = self.columns_to_dict(fields - {"attributes"})
+        if "attributes" in fields:
+            data["attributes"] = [attribute.to_dict() for attribute in self.attributes]
+        return data
+
     def upsert(self):
         """Insert a NewsItem into the database or skip if hash exists."""
         if db.engine.dialect.name == "postgresql":
@@ -158,6 +186,12 @@ class NewsItem(BaseModel):
             if not news_item.has_attribute_value(attribute.value):
                 news_item.attributes.append(attribute)
 
+        if news_item.story_id and any(attribute.key == "TLP" for attribute in attributes):
+            from core.model.story import Story
+
+            if story := Story.get(news_item.story_id):
+                story.update_tlp()
+        db.session.commit()
         return {"message": "Attributes updated"}, 200
 
     def get_tlp(self) -> str | None:
@@ -220,12 +254,11 @@ class NewsItem(BaseModel):
 
             query = query.filter(cls.published >= date_limit)
 
-        if "sort" in filter_args:
-            if filter_args["sort"] == "DATE_DESC":
-                query = query.order_by(db.desc(cls.published))
-
-            elif filter_args["sort"] == "DATE_ASC":
-                query = query.order_by(db.asc(cls.published))
+        sort = cls.get_sort(filter_args)
+        if sort == "DATE_DESC":
+            query = query.order_by(db.desc(cls.published), db.desc(cls.id))
+        else:
+            query = query.order_by(db.asc(cls.published), db.asc(cls.id))
 
         if timefrom := filter_args.get("timefrom"):
             query = query.filter(NewsItem.published >= datetime.fromisoformat(timefrom))
@@ -233,24 +266,64 @@ class NewsItem(BaseModel):
         if timeto := filter_args.get("timeto"):
             query = query.filter(NewsItem.published <= datetime.fromisoformat(timeto))
 
-        offset = filter_args.get("offset", 0)
         limit = filter_args.get("limit", 20)
+        if cursor := filter_args.get("cursor"):
+            page_cursor = PageCursor.decode(cursor)
+            if page_cursor.sort != sort:
+                raise ValueError(f"Cursor was created for sort {page_cursor.sort} not {sort}")
+            return query.filter(page_cursor.condition(cls.published, cls.id, sort == "DATE_DESC")).limit(limit)
+
+        offset = filter_args.get("offset", 0)
         return query.offset(offset).limit(limit)
 
+    @classmethod
+    def iter_for_export(cls, filter_args: dict) -> Iterator[dict[str, Any]]:
+        """
+        Dicts of all news items matching the filter, unlimited unless a limit is given, read in batches of EXPORT_BATCH_SIZE
+        A limited export that filled its limit ends with {"next_cursor": ...} to resume from.
+        """
+        query = cls.get_filter_query({"limit": None} | filter_args)
+        query = query.options(selectinload(cls.attributes)).execution_options(yield_per=Config.EXPORT_BATCH_SIZE)
+        news_item = None
+        count = 0
+        for count, news_item in enumerate(db.session.execute(query).scalars(), start=1):
+            yield news_item.to_dict()
+        if (limit := filter_args.get("limit")) and news_item is not None and count >= int(limit):
+            yield {"next_cursor": PageCursor(sort=cls.get_sort(filter_args), value=news_item.published, id=news_item.id).encode()}
+
+    @classmethod
+    def get_sort(cls, filter_args: dict) -> str:
+        return "DATE_ASC" if filter_args.get("sort") == "DATE_ASC" else "DATE_DESC"
+
+    @classmethod
+    def get_all_for_api(cls, filter_args: dict | None, with_count: bool = False, user=None) -> tuple[dict[str, Any], int]:
+        filter_args = filter_args or {}
+        result, status = super().get_all_for_api(filter_args, with_count, user)
+        items = result["items"]
+        if items and len(items) == filter_args.get("limit", 20):
+            last_item = items[-1]
+            cursor = PageCursor(sort=cls.get_sort(filter_args), value=datetime.fromisoformat(last_item["published"]), id=last_item["id"])
+            result["next_cursor"] = cursor.encode()
+        return result, status
+
     def allowed_with_acl(self, user: User, require_write_access: bool) -> bool:
+        return self.source_allowed_with_acl(user, self.osint_source_id, require_write_access)
+
+    @classmethod
+    def source_allowed_with_acl(cls, user: User, osint_source_id: str | None, require_write_access: bool) -> bool:
         if not RoleBasedAccess.is_enabled():
             return True
 
         query = RBACQuery(
             user=user,
-            resource_id=self.osint_source_id,
+            resource_id=osint_source_id,
             resource_type=ItemType.OSINT_SOURCE,
             require_write_access=require_write_access,
         )
 
         access = RoleBasedAccessService.user_has_access_to_resource(query)
         if not access:
-            logger.warning(f"User {user.id} has no access to resource {self.osint_source_id}")
+            logger.warning(f"User {user.id} has no access to resource {osint_source_id}")
         return access
 
     @classmethod
@@ -6,6 +6,7 @@ from typing import Any
 from sqlalchemy.orm import Mapped, deferred
 
 from core.managers.db_manager import db
+from core.managers.blob_manager import get_blob_store
 from core.model.base_model import BaseModel
 from core.model.role import TLPLevel
 
@@ -18,6 +19,7 @@ class NewsItemAttribute(BaseModel):
     value: Mapped[str] = db.Column(db.String(), nullable=False)
     binary_mime_type: Mapped[str] = db.Column(db.String())
     binary_data: Mapped = deferred(db.Column(db.LargeBinary))
+    binary_hash: Mapped[str | None] = db.Column(db.String(64), nullable=True)
     created: Mapped[datetime] = db.Column(db.DateTime, default=datetime.now)
 
     def __init__(self, key, value, binary_mime_type=None, binary_value=None, id=None):
@@ -27,15 +29,20 @@ class NewsItemAttribute(BaseModel):
         if binary_mime_type:
             self.binary_mime_type = binary_mime_type
 
-        with contextlib.suppress(Exception):
-            if binary_value:
-                self.binary_data = base64.b64decode(binary_value)
+        binary_data = None
+        with contextlib.suppress(ValueError):
+            binary_data = base64.b64decode(binary_value) if binary_value else None
+        if binary_data:
+            self.binary_hash = get_blob_store().put(binary_data)
 
     def to_dict(self) -> dict[str, Any]:
-        data = super().to_dict()
-        data.pop("binary_mime_type", None)
-        data.pop("binary_data", None)
-        return data
+        return self.columns_to_dict(column.name for column in self.__table__.columns if not column.name.startswith("binary_"))
+
+    def get_binary_data(self) -> bytes | None:
+        if self.binary_hash:
+            return get_blob_store().get(self.binary_hash)
+        # attributes stored before the blob store keep their data inline
+        return self.binary_data
 
     @classmethod
     def get_by_key(cls, attributes: list["NewsItemAttribute"], key: str) -> "NewsItemAttribute | None":
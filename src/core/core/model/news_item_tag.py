@@ -1,5 +1,9 @@
-from sqlalchemy import func
-from sqlalchemy.orm import Mapped, relationship
+from collections import Counter
+from datetime import date, datetime
+from sqlalchemy import func, event, inspect
+from sqlalchemy.ext.associationproxy import association_proxy
+from sqlalchemy.orm import Mapped, relationship, Session
+from sqlalchemy.dialects import postgresql, sqlite
 
 from typing import Any, TYPE_CHECKING
 from core.managers.db_manager import db
@@ -9,35 +13,95 @@ if TYPE_CHECKING:
     from core.model.story import Story
 
 
+class Tag(BaseModel):
+    """
+    Tag dictionary, one row per case-folded tag name
+    """
+
+    __tablename__ = "tag"
+
+    id: Mapped[int] = db.Column(db.Integer, primary_key=True)
+    name: Mapped[str] = db.Column(db.String(255), nullable=False)
+    tag_type: Mapped[str] = db.Column(db.String(255), nullable=False, default="misc", index=True)
+    name_key: Mapped[str] = db.Column(db.String(255), nullable=False, unique=True, index=True)
+
+    def __init__(self, name: str, tag_type: str = "misc"):
+        self.name = name
+        self.tag_type = tag_type
+        self.name_key = self.make_key(name)
+
+    @staticmethod
+    def make_key(name: str) -> str:
+        return name.casefold()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"name": self.name, "tag_type": self.tag_type}
+
+    @classmethod
+    def find_by_name(cls, tag_name: str) -> "Tag | None":
+        return cls.get_first(db.select(cls).filter(cls.name_key == cls.make_key(tag_name)))
+
+    @classmethod
+    def get_or_create(cls, tags: dict[str, str]) -> list["Tag"]:
+        """
+        Dictionary entries for {name: tag_type}, missing names are inserted with one upsert, existing ones keep their spelling and type
+        """
+        wanted: dict[str, tuple[str, str]] = {}
+        for name, tag_type in tags.items():
+            if not name:
+                continue
+            wanted.setdefault(cls.make_key(name), (name, tag_type))
+        if not wanted:
+            return []
+
+        def lookup(keys) -> dict[str, "Tag"]:
+            return {tag.name_key: tag for tag in db.session.execute(db.select(cls).where(cls.name_key.in_(keys))).scalars()}
+
+        found = lookup(wanted.keys())
+        if missing := [key for key in wanted if key not in found]:
+            dialect_insert = postgresql.insert if db.session.connection().dialect.name == "postgresql" else sqlite.insert
+            rows = [{"name": wanted[key][0], "tag_type": wanted[key][1], "name_key": key} for key in missing]
+            db.session.execute(dialect_insert(cls).values(rows).on_conflict_do_nothing(index_elements=["name_key"]))
+            found |= lookup(missing)
+        return [found[key] for key in wanted]
+
+
 class NewsItemTag(BaseModel):
+    """
+    Association of a story with a dictionary tag
+    """
+
     __tablename__ = "news_item_tag"
+    __table_args__ = (db.Index("ix_news_item_tag_story_tag", "story_id", "tag_id", unique=True),)
 
     id: Mapped[int] = db.Column(db.Integer, primary_key=True)
-    name: Mapped[str] = db.Column(db.String(255))
-    tag_type: Mapped[str] = db.Column(db.String(255))
     story_id: Mapped[str] = db.Column(db.ForeignKey("story.id"))
     story: Mapped["Story"] = relationship("Story", back_populates="tags")
+    tag_id: Mapped[int] = db.Column(db.ForeignKey("tag.id"), nullable=False, index=True)
+    tag: Mapped[Tag] = relationship(Tag, lazy="joined")
 
-    def __init__(self, name, tag_type):
-        self.name = name
-        self.tag_type = tag_type
+    name = association_proxy("tag", "name")
+    tag_type = association_proxy("tag", "tag_type")
+
+    def __init__(self, tag: Tag):
+        self.tag = tag
 
     @classmethod
     def get_filtered_tags(cls, filter_args: dict) -> dict[str, str]:
         # sourcery skip: identity-comprehension
-        query = db.select(cls.name, cls.tag_type)
+        query = db.select(TagStatistics.name, TagStatistics.tag_type).group_by(TagStatistics.name, TagStatistics.tag_type)
 
         if search := filter_args.get("search"):
-            query = query.filter(cls.name.ilike(f"%{search}%"))
+            query = query.filter(TagStatistics.name.ilike(f"%{search}%"))
 
         if tag_type := filter_args.get("tag_type"):
-            query = query.filter(cls.tag_type == tag_type)
+            query = query.filter(TagStatistics.tag_type == tag_type)
 
         if min_size := filter_args.get("min_size"):
             # returns only tags where the name appears at least min_size times in the database
-            query = query.group_by(cls.name, cls.tag_type).having(func.count(cls.name) >= min_size)
+            query = query.having(func.sum(TagStatistics.count) >= min_size)
             # order by size
-            query = query.order_by(func.count(cls.name).desc())
+            query = query.order_by(func.sum(TagStatistics.count).desc())
 
         offset = filter_args.get("offset", 0)
         limit = filter_args.get("limit", 20)
@@ -50,6 +114,14 @@ class NewsItemTag(BaseModel):
         tags = cls.get_filtered_tags(filter_args)
         return list(tags.keys())
 
+    @classmethod
+    def delete_all(cls) -> tuple[dict[str, Any], int]:
+        db.session.execute(db.delete(cls))
+        db.session.execute(db.delete(Tag))
+        db.session.execute(db.delete(TagStatistics))
+        db.session.commit()
+        return {"message": f"All {cls.__name__} deleted"}, 200
+
     @classmethod
     def remove_by_story(cls, story):
         db.delete(cls).where(cls.story_id == story.id)
@@ -65,11 +137,7 @@ class NewsItemTag(BaseModel):
         }
 
     @classmethod
-    def find_by_name(cls, tag_name: str) -> "NewsItemTag | None":
-        return cls.get_first(db.select(cls).filter(cls.name.ilike(tag_name)))
-
-    @classmethod
-    def apply_sort(cls, query, sort_str: str):
+    def apply_sort(cls, query, sort_str: str, columns: dict):
         if not sort_str:
             return query
 
@@ -78,8 +146,8 @@ class NewsItemTag(BaseModel):
             return query
 
         column_name, sort_order = parts
-        column = getattr(cls, column_name, None)
-        if not column:
+        column = columns.get(column_name)
+        if column is None:
             return query
 
         query = query.order_by(column if sort_order == "asc" else db.desc(column))
@@ -87,16 +155,16 @@ class NewsItemTag(BaseModel):
 
     @classmethod
     def get_cluster_by_filter(cls, filter):
-        query = db.select(cls).with_only_columns(cls.name, func.count(cls.name).label("size"))
+        size = func.sum(TagStatistics.count).label("size")
+        query = db.select(TagStatistics.name, size).group_by(TagStatistics.name)
         if tag_type := filter.get("tag_type"):
-            query = query.filter(cls.tag_type == tag_type).group_by(cls.name)
+            query = query.filter(TagStatistics.tag_type == tag_type)
 
         count = cls.get_filtered_count(query)
 
         if search := filter.get("search"):
-            query = query.filter(cls.name.ilike(f"%{search}%"))
-        if sort := filter.get("sort", "sort_desc"):
-            query = cls.apply_sort(query, sort)
+            query = query.filter(TagStatistics.name.ilike(f"%{search}%"))
+        query = cls.apply_sort(query, filter.get("sort") or "size_desc", {"name": TagStatistics.name, "size": size})
 
         if offset := filter.get("offset"):
             query = query.offset(offset)
@@ -111,30 +179,166 @@ class NewsItemTag(BaseModel):
     @classmethod
     def get_tag_types(cls) -> list[tuple[str, int]]:
         items = db.session.execute(
-            db.select(cls.tag_type, func.count(cls.name).label("type_count")).group_by(cls.tag_type).order_by(db.desc("type_count"))
+            db.select(TagStatistics.tag_type, func.sum(TagStatistics.count).label("type_count"))
+            .group_by(TagStatistics.tag_type)
+            .order_by(db.desc("type_count"))
         ).all()
         return [(row[0], row[1]) for row in items] if items else []
 
     @classmethod
-    def parse_tags(cls, tags: list | dict) -> dict[str, "NewsItemTag"]:
+    def parse_tags(cls, tags: list | dict) -> dict[str, str]:
+        """
+        Requested tags as {name: tag_type}
+        """
         if isinstance(tags, dict):
-            return cls._parse_dict_tags(tags)
-
-        return cls._parse_list_tags(tags)
-
-    @classmethod
-    def _parse_dict_tags(cls, tags: dict) -> dict[str, "NewsItemTag"]:
-        return {tag_name: NewsItemTag(name=tag_name, tag_type=tag.get("tag_type", "misc")) for tag_name, tag in tags.items()}
+            return {tag_name: tag.get("tag_type", "misc") for tag_name, tag in tags.items()}
 
-    @classmethod
-    def _parse_list_tags(cls, tags: list) -> dict[str, "NewsItemTag"]:
         new_tags = {}
         for tag in tags:
             if isinstance(tag, dict):
-                tag_name = tag.get("name")
-                tag_type = tag.get("tag_type", "misc")
+                new_tags[tag.get("name")] = tag.get("tag_type", "misc")
             else:
-                tag_name = tag
-                tag_type = "misc"
-            new_tags[tag_name] = NewsItemTag(name=tag_name, tag_type=tag_type)
+                new_tags[tag] = "misc"
         return new_tags
+
+
+class TagStatistics(BaseModel):
+    """
+    Rollup of tag counts per (name, tag_type, day of story creation), maintained by the tag write hooks below
+    """
+
+    __tablename__ = "tag_statistics"
+
+    name: Mapped[str] = db.Column(db.String(255), primary_key=True)
+    tag_type: Mapped[str] = db.Column(db.String(255), primary_key=True)
+    day: Mapped[date] = db.Column(db.Date, primary_key=True, index=True)
+    count: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def apply_deltas(cls, session: Session, deltas: Counter):
+        """
+        Add count deltas keyed by (name, tag_type, day) with one upsert and drop rows that reach zero
+        """
+        rows = [
+            {"name": name, "tag_type": tag_type, "day": day, "count": delta}
+            for (name, tag_type, day), delta in deltas.items()
+            if delta and name is not None and tag_type is not None
+        ]
+        if not rows:
+            return
+        connection = session.connection()
+        dialect_insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+        stmt = dialect_insert(cls.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["name", "tag_type", "day"], set_={"count": cls.__table__.c.count + stmt.excluded.count}
+        )
+        connection.execute(stmt, rows)
+        connection.execute(db.delete(cls.__table__).where(cls.__table__.c.count <= 0))
+
+    @classmethod
+    def record_moves(cls, session: Session, moves: list[tuple[str, str, datetime | None, datetime | None]]):
+        """
+        Account for tags moved between stories by bulk UPDATE as (name, tag_type, old story created, new story created)
+        """
+        deltas = Counter()
+        for name, tag_type, old_created, new_created in moves:
+            deltas[(name, tag_type, cls.day_of(old_created))] -= 1
+            deltas[(name, tag_type, cls.day_of(new_created))] += 1
+        cls.apply_deltas(session, deltas)
+
+    @staticmethod
+    def day_of(created: datetime | None) -> date:
+        return (created or datetime.now()).date()
+
+
+def collect_tag_changes(session: Session) -> list[tuple[int, str, str, Any]]:
+    """
+    Tag count changes of the pending flush as (sign, name, tag_type, story, story id or story creation time)
+    """
+    from core.model.story import Story
+
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, NewsItemTag) and (story := current_story(inspect(obj))) is not None:
+            changes.append((1, obj.name, obj.tag_type, story))
+    for obj in session.deleted:
+        if isinstance(obj, NewsItemTag) and inspect(obj).has_identity:
+            state = inspect(obj)
+            changes.append((-1, *committed_tag_key(state)))
+    for obj in session.dirty:
+        if isinstance(obj, Story) and (history := inspect(obj).attrs.created.history).deleted and history.added:
+            for tag in obj.tags:
+                if not inspect(tag).persistent or tag in session.dirty or tag in session.deleted:
+                    continue
+                changes.append((-1, tag.name, tag.tag_type, history.deleted[0]))
+                changes.append((1, tag.name, tag.tag_type, history.added[0]))
+        if not isinstance(obj, NewsItemTag) or obj in session.deleted:
+            continue
+        state = inspect(obj)
+        if not any(state.attrs[key].history.has_changes() for key in ("tag_id", "tag", "story_id", "story")):
+            continue
+        changes.append((-1, *committed_tag_key(state)))
+        if (story := current_story(state)) is not None:
+            changes.append((1, obj.name, obj.tag_type, story))
+    return changes
+
+
+def current_story(state) -> Any:
+    """
+    Story a tag belongs to after the flush, None for orphans which the delete-orphan cascade removes
+    """
+    if state.attrs.story.history.has_changes():
+        return state.attrs.story.value
+    return state.attrs.story.value or state.attrs.story_id.value
+
+
+def committed_tag_key(state) -> tuple[str, str, Any]:
+    def committed(key):
+        history = state.attrs[key].history
+        return history.deleted[0] if history.deleted else state.attrs[key].value
+
+    story_id = committed("story_id")
+    if story_id is None and (story := committed("story")) is not None:
+        story_id = story.id
+    tag = committed("tag")
+    if tag is None and (tag_id := committed("tag_id")) is not None:
+        tag = state.session.get(Tag, tag_id)
+    if tag is None:
+        return None, None, story_id
+    return tag.name, tag.tag_type, story_id
+
+
+def track_tag_statistics(session: Session, flush_context, instances):
+    from core.model.story import Story
+
+    if not (changes := collect_tag_changes(session)):
+        return
+    story_ids = {story for *_, story in changes if isinstance(story, str)}
+    created_by_id = {}
+    if story_ids:
+        with session.no_autoflush:
+            created_by_id = dict(session.execute(db.select(Story.id, Story.created).where(Story.id.in_(story_ids))).tuples().all())
+
+    deltas = session.info.setdefault("tag_statistics", Counter())
+    for sign, name, tag_type, story in changes:
+        if isinstance(story, datetime):
+            created = story
+        elif isinstance(story, str) or story is None:
+            created = created_by_id.get(story)
+        else:
+            created = story.created
+        deltas[(name, tag_type, TagStatistics.day_of(created))] += sign
+
+
+def apply_tag_statistics(session: Session, flush_context):
+    if deltas := session.info.pop("tag_statistics", None):
+        TagStatistics.apply_deltas(session, deltas)
+
+
+def discard_tag_statistics(session: Session, previous_transaction):
+    session.info.pop("tag_statistics", None)
+
+
+event.listen(Session, "before_flush", track_tag_statistics)
+event.listen(Session, "after_flush", apply_tag_statistics)
+event.listen(Session, "after_soft_rollback", discard_tag_statistics)
@@ -8,6 +8,8 @@ from sqlalchemy.exc import IntegrityError
 from sqlalchemy.sql import Select
 
 from core.managers.db_manager import db
+from core.managers.blob_manager import get_blob_store
+from core.managers.cache_manager import track_changes, OSINT_SOURCE_CACHE_NAMESPACE
 from core.log import logger
 from core.model.role_based_access import RoleBasedAccess, ItemType
 from core.model.parameter_value import ParameterValue
@@ -38,6 +40,7 @@ class OSINTSource(BaseModel):
     groups: Mapped[list["OSINTSourceGroup"]] = relationship("OSINTSourceGroup", secondary="osint_source_group_osint_source")
 
     icon: Any = deferred(db.Column(db.LargeBinary))
+    icon_hash: Mapped[str | None] = db.Column(db.String(64), nullable=True)
     state: Mapped[int] = db.Column(db.SmallInteger, default=-1)
     last_collected: Mapped[datetime] = db.Column(db.DateTime, default=None)
     last_attempted: Mapped[datetime] = db.Column(db.DateTime, default=None)
@@ -49,7 +52,7 @@ class OSINTSource(BaseModel):
         self.description = description
         self.type = type if isinstance(type, COLLECTOR_TYPES) else COLLECTOR_TYPES(type.lower())
         if icon is not None and (icon_data := self.is_valid_base64(icon)):
-            self.icon = icon_data
+            self.set_icon(icon_data)
 
         self.parameters = Worker.parse_parameters(type, parameters)
 
@@ -87,25 +90,67 @@ class OSINTSource(BaseModel):
 
         return query.order_by(db.asc(cls.name))
 
+    def set_icon(self, icon: bytes | None):
+        self.icon_hash = get_blob_store().put(icon) if icon else None
+        self.icon = None
+
     def update_icon(self, icon):
-        self.icon = icon
+        self.set_icon(icon)
         db.session.commit()
 
+    @property
+    def icon_url(self) -> str | None:
+        """
+        Icon path relative to the API root, changes with the icon content so clients can cache it forever
+        """
+        return f"/assess/osint-sources/{self.id}/icon/{self.icon_hash}" if self.icon_hash else None
+
+    @classmethod
+    def get_icon_hash(cls, source_id: str) -> str | None:
+        return db.session.execute(db.select(cls.icon_hash).where(cls.id == source_id)).scalar_one_or_none()
+
+    @classmethod
+    def get_icon(cls, source_id: str) -> bytes | None:
+        row = db.session.execute(db.select(cls.icon, cls.icon_hash).where(cls.id == source_id)).one_or_none()
+        if row is None or row.icon_hash is None:
+            return None
+        # icons stored before the blob store keep their data inline
+        return row.icon or get_blob_store().get(row.icon_hash)
+
+    @staticmethod
+    def get_icon_mimetype(icon: bytes) -> str:
+        if icon.startswith(b"\x89PNG"):
+            return "image/png"
+        if icon.startswith(b"\xff\xd8"):
+            return "image/jpeg"
+        if icon.startswith((b"GIF87a", b"GIF89a")):
+            return "image/gif"
+        if icon.startswith(b"RIFF") and icon[8:12] == b"WEBP":
+            return "image/webp"
+        if icon.startswith(b"\x00\x00\x01\x00"):
+            return "image/x-icon"
+        if b"<svg" in icon[:1024]:
+            return "image/svg+xml"
+        return "application/octet-stream"
+
     @classmethod
     def from_dict(cls, data: dict[str, Any]) -> "OSINTSource":
         drop_keys = ["last_collected", "last_attempted", "state", "last_error_message"]
         [data.pop(key, None) for key in drop_keys if key in data]
         return cls(**data)
 
+    def to_base_dict(self) -> dict[str, Any]:
+        # never touch the deferred icon blob when serializing
+        return self.columns_to_dict(column.name for column in self.__table__.columns if column.name not in ("icon", "icon_hash"))
+
     def to_dict(self) -> dict[str, Any]:
-        data = super().to_dict()
+        data = self.to_base_dict()
         data["parameters"] = {parameter.parameter: parameter.value for parameter in self.parameters if parameter.value}
-        data["icon"] = base64.b64encode(self.icon).decode("utf-8") if self.icon else None
+        data["icon_url"] = self.icon_url
         return data
 
     def to_worker_dict(self) -> dict[str, Any]:
-        data = super().to_dict()
-        data.pop("icon", None)
+        data = self.to_base_dict()
         data["word_lists"] = []
         for group in self.groups:
             data["word_lists"].extend([word_list.to_dict() for word_list in group.word_lists if word_list])
@@ -115,7 +160,7 @@ class OSINTSource(BaseModel):
     def to_assess_dict(self) -> dict[str, Any]:
         return {
             "id": self.id,
-            "icon": base64.b64encode(self.icon).decode("utf-8") if self.icon else None,
+            "icon_url": self.icon_url,
             "name": self.name,
             "type": self.type,
         }
@@ -161,7 +206,7 @@ class OSINTSource(BaseModel):
         osint_source.description = data.get("description")
         icon_str = data.get("icon")
         if icon_str is not None and (icon := osint_source.is_valid_base64(icon_str)):
-            osint_source.icon = icon
+            osint_source.set_icon(icon)
         if parameters := data.get("parameters"):
             update_parameter = ParameterValue.get_or_create_from_list(parameters)
             osint_source.parameters = ParameterValue.get_update_values(osint_source.parameters, update_parameter)
@@ -472,3 +517,9 @@ class OSINTSourceGroupOSINTSource(BaseModel):
 class OSINTSourceGroupWordList(BaseModel):
     osint_source_group_id = db.Column(db.String, db.ForeignKey("osint_source_group.id", ondelete="SET NULL"), primary_key=True)
     word_list_id = db.Column(db.Integer, db.ForeignKey("word_list.id", ondelete="SET NULL"), primary_key=True)
+
+
+track_changes(
+    OSINT_SOURCE_CACHE_NAMESPACE,
+    (OSINTSource, OSINTSourceParameterValue, OSINTSourceGroup, OSINTSourceGroupOSINTSource, OSINTSourceGroupWordList),
+)
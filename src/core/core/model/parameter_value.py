@@ -3,6 +3,7 @@ from enum import StrEnum, auto
 from sqlalchemy.orm import Mapped
 
 from core.managers.db_manager import db
+from core.managers.cache_manager import track_changes, OSINT_SOURCE_CACHE_NAMESPACE, WORKER_CACHE_NAMESPACE
 from core.model.base_model import BaseModel
 
 
@@ -72,3 +73,8 @@ class ParameterValue(BaseModel):
     @classmethod
     def from_parameter_list(cls, parameters: list[str]) -> list["ParameterValue"]:
         return [cls(parameter=parameter) for parameter in parameters]
+
+
+# parameter values are shared by OSINT sources, bots and workers
+track_changes(OSINT_SOURCE_CACHE_NAMESPACE, (ParameterValue,))
+track_changes(WORKER_CACHE_NAMESPACE, (ParameterValue,))
@@ -1,11 +1,14 @@
-from datetime import datetime, timedelta
+import json
+import hashlib
+from datetime import datetime, timedelta, date
 from typing import Any
 import uuid
-from base64 import b64encode, b64decode
+from base64 import b64decode
 from sqlalchemy.orm import deferred, Mapped, relationship
 from sqlalchemy.sql import Select
 
 from core.managers.db_manager import db
+from core.managers.blob_manager import get_blob_store
 from core.log import logger
 from core.model.role_based_access import ItemType
 from core.model.report_item import ReportItem
@@ -34,6 +37,8 @@ class Product(BaseModel):
     report_items: Mapped[list["ReportItem"]] = relationship("ReportItem", secondary="product_report_item", cascade="all, delete")
     last_rendered: Mapped[datetime] = db.Column(db.DateTime)
     render_result = deferred(db.Column(db.Text))
+    render_hash: Mapped[str | None] = db.Column(db.String(64), nullable=True)
+    render_fingerprint: Mapped[str | None] = db.Column(db.String(64), nullable=True)
 
     def __init__(self, title: str, product_type_id: int, description: str = "", report_items: list[str] | None = None, id: str | None = None):
         self.id = id or str(uuid.uuid4())
@@ -80,13 +85,12 @@ class Product(BaseModel):
         return query
 
     def to_dict(self) -> dict[str, Any]:
-        data = super().to_dict()
+        data = self.columns_to_dict(column.name for column in self.__table__.columns if not column.name.startswith("render_"))
         data["report_items"] = [report_item.id for report_item in self.report_items if report_item]
-        data.pop("render_result", None)
         return data
 
     def to_worker_dict(self) -> dict[str, Any]:
-        return {
+        data = {
             "id": self.id,
             "title": self.title,
             "type": self.product_type.type,
@@ -94,11 +98,23 @@ class Product(BaseModel):
             "mime_type": self.product_type.get_mimetype(),
             "report_items": [report_item.to_product_dict() for report_item in self.report_items if report_item],
         }
+        data["fingerprint"] = self.get_fingerprint(data)
+        data["render_fingerprint"] = self.render_fingerprint if self.render_hash else None
+        return data
+
+    def get_fingerprint(self, worker_data: dict[str, Any]) -> str:
+        """
+        Hash of everything a render depends on: the worker data, the template version and the current date presenters add
+        """
+        fingerprint = {"product": worker_data, "template": self.product_type.get_template_hash(), "date": date.today().isoformat()}
+        return hashlib.sha256(json.dumps(fingerprint, sort_keys=True, default=str).encode()).hexdigest()
 
-    def update_render(self, render_result):
+    def update_render(self, render_result, fingerprint: str | None = None):
         try:
             self.last_rendered = datetime.now()
-            self.render_result = b64encode(render_result).decode("ascii")
+            self.render_hash = get_blob_store().put(render_result)
+            self.render_result = None
+            self.render_fingerprint = fingerprint
             db.session.commit()
             return True
         except Exception:
@@ -106,24 +122,25 @@ class Product(BaseModel):
             return False
 
     @classmethod
-    def update_render_for_id(cls, product_id: str, render_result):
+    def update_render_for_id(cls, product_id: str, render_result, fingerprint: str | None = None):
         if not (product := cls.get(product_id)):
             return {"error": f"Product {product_id} not found"}, 404
-        if product.update_render(render_result):
+        if product.update_render(render_result, fingerprint):
             logger.debug(f"Render result for Product {product_id} updated")
             return {"message": f"Product {product_id} updated"}, 200
         return {"error": f"Product {product_id} not updated"}, 500
 
     @classmethod
-    def get_render(cls, product_id: str):
+    def get_render(cls, product_id: str) -> dict[str, Any] | None:
+        """
+        Blob store key of the latest render, renders stored before the blob store are returned inline as raw bytes
+        """
         if product := cls.get(product_id):
+            mime_type = product.product_type.get_mimetype()
+            if product.render_hash:
+                return {"mime_type": mime_type, "blob_key": product.render_hash, "blob": None}
             if product.render_result:
-                mime_type = product.product_type.get_mimetype()
-                if mime_type == "application/pdf":
-                    blob = product.render_result
-                else:
-                    blob = b64decode(product.render_result).decode("utf-8")  # type: ignore
-                return {"mime_type": product.product_type.get_mimetype(), "blob": blob}
+                return {"mime_type": mime_type, "blob_key": None, "blob": b64decode(product.render_result)}
         return None
 
     @classmethod
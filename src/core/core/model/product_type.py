@@ -1,4 +1,5 @@
 import os
+import hashlib
 from typing import Any
 from sqlalchemy.sql.expression import Select
 from sqlalchemy.orm import Mapped, relationship
@@ -129,6 +130,15 @@ class ProductType(BaseModel):
         full_path = get_presenter_template_path(self._get_template_path())
         return full_path if os.path.isfile(full_path) else ""
 
+    def get_template_hash(self) -> str:
+        """
+        Content hash of the template, used as its version
+        """
+        if not (template := self.get_template()):
+            return ""
+        with open(template, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
     def get_detail_json(self):
         data = self.to_dict()
         if template := self.get_template():
@@ -2,6 +2,7 @@ from datetime import datetime, timedelta
 
 import uuid
 from sqlalchemy import or_
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.sql.expression import false
 from sqlalchemy.sql import Select
 from sqlalchemy.orm import Mapped, relationship
@@ -331,6 +332,7 @@ class ReportItem(BaseModel):
             return {"error": "Report is used in a product"}, 409
 
         db.session.delete(report)
+        db.session.execute(db.delete(ReportItemLock).where(ReportItemLock.report_item_id == report_id))
         db.session.commit()
         return {"message": "Report successfully deleted"}, 200
 
@@ -432,3 +434,82 @@ class ReportItemCpe(BaseModel):
 
     def __init__(self, value):
         self.value = value
+
+
+class ReportItemLock(BaseModel):
+    """
+    Edit lock on a report item shared by all core processes, a lock expires unless its holder renews it within REPORT_ITEM_LOCK_TIMEOUT
+    """
+
+    __tablename__ = "report_item_lock"
+
+    report_item_id: Mapped[str] = db.Column(db.String(64), db.ForeignKey("report_item.id", ondelete="CASCADE"), primary_key=True)
+    user_id: Mapped[int] = db.Column(db.Integer, db.ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    lock_time: Mapped[datetime] = db.Column(db.DateTime, nullable=False)
+    expires: Mapped[datetime] = db.Column(db.DateTime, nullable=False, index=True)
+
+    @classmethod
+    def get_active(cls, report_item_id: str) -> "ReportItemLock | None":
+        return db.session.execute(
+            db.select(cls).where(cls.report_item_id == report_item_id, cls.expires >= datetime.now())
+        ).scalar_one_or_none()
+
+    @classmethod
+    def to_report_item_json(cls, report_item_id: str, lock: "ReportItemLock | None" = None) -> dict[str, Any]:
+        if lock is None:
+            return {"report_item_id": report_item_id, "locked": False}
+        return {
+            "report_item_id": report_item_id,
+            "locked": True,
+            "user_id": lock.user_id,
+            "lock_time": lock.lock_time.isoformat(),
+            "expires": lock.expires.isoformat(),
+        }
+
+    @classmethod
+    def get_json(cls, report_item_id: str) -> dict[str, Any]:
+        return cls.to_report_item_json(report_item_id, cls.get_active(report_item_id))
+
+    @classmethod
+    def acquire(cls, report_item_id: str, user_id: int, timeout: int) -> tuple[dict[str, Any], int, bool]:
+        """
+        Take or renew the lock with one upsert that only overwrites expired locks or locks of the same user.
+        Returns the lock json, the status and whether the lock was newly acquired.
+        """
+        if not db.session.get(ReportItem, report_item_id):
+            return {"error": "Report not found"}, 404, False
+        now = datetime.now()
+        dialect_insert = postgresql.insert if db.session.connection().dialect.name == "postgresql" else sqlite.insert
+        expires = now + timedelta(seconds=timeout)
+        stmt = dialect_insert(cls).values(report_item_id=report_item_id, user_id=user_id, lock_time=now, expires=expires)
+        held = (cls.user_id == stmt.excluded.user_id) & (cls.expires >= now)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["report_item_id"],
+            set_={
+                "user_id": stmt.excluded.user_id,
+                "lock_time": db.case((held, cls.lock_time), else_=stmt.excluded.lock_time),
+                "expires": stmt.excluded.expires,
+            },
+            where=(cls.expires < now) | (cls.user_id == stmt.excluded.user_id),
+        ).returning(cls.lock_time)
+        lock_time = db.session.execute(stmt).scalar_one_or_none()
+        db.session.commit()
+        lock = cls.get_active(report_item_id)
+        if lock_time is None:
+            return cls.to_report_item_json(report_item_id, lock) | {"error": "Report item is locked by another user"}, 409, False
+        return cls.to_report_item_json(report_item_id, lock), 200, lock_time == now
+
+    @classmethod
+    def release(cls, report_item_id: str, user_id: int) -> tuple[dict[str, Any], int, bool]:
+        """
+        Remove the lock if it is held by the user or expired.
+        Returns the lock json, the status and whether an active lock was released.
+        """
+        now = datetime.now()
+        released = db.session.execute(
+            db.delete(cls).where(cls.report_item_id == report_item_id, or_(cls.user_id == user_id, cls.expires < now)).returning(cls.expires)
+        ).scalar_one_or_none()
+        db.session.commit()
+        if lock := cls.get_active(report_item_id):
+            return cls.to_report_item_json(report_item_id, lock) | {"error": "Report item is locked by another user"}, 409, False
+        return cls.to_report_item_json(report_item_id), 200, released is not None and released >= now
@@ -6,10 +6,14 @@ from typing import Optional
 from enum import StrEnum
 
 from core.managers.db_manager import db
+from core.managers.cache_manager import invalidate
 from core.model.base_model import BaseModel
 from core.model.permission import Permission
 
 
+PRINCIPAL_CACHE_NAMESPACE = "principal"
+
+
 class TLPLevel(StrEnum):
     CLEAR = "clear"
     GREEN = "green"
@@ -17,6 +21,13 @@ class TLPLevel(StrEnum):
     AMBER = "amber"
     RED = "red"
 
+    @property
+    def rank(self) -> int:
+        """
+        Position in the TLP order from clear to red, StrEnum comparison would be alphabetical
+        """
+        return list(TLPLevel).index(self)
+
 
 class Role(BaseModel):
     __tablename__ = "role"
@@ -89,6 +100,7 @@ class Role(BaseModel):
         permissions = data.get("permissions", [])
         role.permissions = Permission.get_bulk(permissions)
         db.session.commit()
+        invalidate(PRINCIPAL_CACHE_NAMESPACE)
         return {"message": f"Succussfully updated {role.name}", "id": f"{role.id}"}, 201
 
 
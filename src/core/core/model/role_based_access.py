@@ -1,3 +1,5 @@
+import time
+from flask import g, has_request_context
 from sqlalchemy import or_
 from sqlalchemy.sql.expression import Select, true
 from sqlalchemy.orm import Mapped, relationship
@@ -7,6 +9,7 @@ from enum import StrEnum, auto
 from core.managers.db_manager import db
 from core.model.base_model import BaseModel
 from core.model.role import Role
+from core.config import Config
 
 
 class ItemType(StrEnum):
@@ -17,6 +20,44 @@ class ItemType(StrEnum):
     PRODUCT_TYPE = auto()
 
 
+ACL_CACHE_NAMESPACE = "acl"
+# ACL version -> (expires, enabled item types)
+enabled_types_cache: dict[int, tuple[float, frozenset[str]]] = {}
+
+
+class ACLVersion(BaseModel):
+    """
+    Single row counter bumped in every transaction that changes ACLs, shared by all processes to invalidate in-process ACL caches
+    """
+
+    __tablename__ = "acl_version"
+
+    id: Mapped[int] = db.Column(db.Integer, primary_key=True)
+    version: Mapped[int] = db.Column(db.Integer, nullable=False, default=0)
+
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Current ACL version, read once per request
+        """
+        if has_request_context() and "acl_version" in g:
+            return g.acl_version
+        version = db.session.execute(db.select(cls.version).where(cls.id == 1)).scalar_one_or_none() or 0
+        if has_request_context():
+            g.acl_version = version
+        return version
+
+    @classmethod
+    def bump(cls, session):
+        if not session.execute(db.update(cls).where(cls.id == 1).values(version=cls.version + 1)).rowcount:
+            session.add(cls(id=1, version=1))
+
+    @classmethod
+    def forget(cls):
+        if has_request_context():
+            g.pop("acl_version", None)
+
+
 class RoleBasedAccess(BaseModel):
     __tablename__ = "role_based_access"
 
@@ -46,15 +87,27 @@ class RoleBasedAccess(BaseModel):
         if roles:
             self.roles = Role.get_bulk(roles)
 
+    @classmethod
+    def get_enabled_types(cls) -> frozenset[str]:
+        """
+        Item types with at least one enabled ACL, cached until the ACL version changes or ACL_CACHE_TTL passes
+        """
+        version = ACLVersion.get_version()
+        if (cached := enabled_types_cache.get(version)) is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        query = db.select(cls.item_type).where(cls.enabled == true()).distinct()
+        enabled_types = frozenset(item_type.value for item_type in db.session.execute(query).scalars() if item_type)
+        enabled_types_cache.clear()
+        enabled_types_cache[version] = (time.monotonic() + Config.ACL_CACHE_TTL, enabled_types)
+        return enabled_types
+
     @classmethod
     def is_enabled(cls) -> bool:
-        query = db.select(db.exists().where(cls.enabled == true()))
-        return db.session.execute(query).scalar_one()
+        return bool(cls.get_enabled_types())
 
     @classmethod
     def is_enabled_for_type(cls, item_type) -> bool:
-        query = db.select(db.exists().where(cls.enabled == true()).where(cls.item_type == item_type))
-        return db.session.execute(query).scalar_one()
+        return item_type in cls.get_enabled_types()
 
     def to_dict(self) -> dict[str, Any]:
         data = super().to_dict()
@@ -1,8 +1,11 @@
+import json
 import uuid
+import hashlib
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Sequence
-from sqlalchemy import or_, func
-from sqlalchemy.orm import aliased, Mapped, relationship
+from typing import Any, Iterator, Sequence
+from sqlalchemy import or_, func, event, intersect
+from sqlalchemy.orm import aliased, load_only, Mapped, relationship, selectinload
 from sqlalchemy.sql.expression import false, null
 from sqlalchemy.sql import Select
 from sqlalchemy.exc import IntegrityError
@@ -10,16 +13,62 @@ from sqlalchemy.exc import IntegrityError
 from collections import Counter
 
 from core.managers.db_manager import db
+from core.managers.cache_manager import cache, get_version, is_shared, track_changes, STORY_CACHE_NAMESPACE, OSINT_SOURCE_CACHE_NAMESPACE
+from core.config import Config
 from core.model.base_model import BaseModel
 from core.log import logger
 from core.model.user import User
 from core.model.role import TLPLevel
-from core.model.news_item_tag import NewsItemTag
-from core.model.role_based_access import ItemType
+from core.model.news_item_tag import NewsItemTag, Tag, TagStatistics
+from core.model.role_based_access import ItemType, ACL_CACHE_NAMESPACE
 from core.model.osint_source import OSINTSourceGroup, OSINTSource, OSINTSourceGroupOSINTSource
 from core.model.news_item import NewsItem
 from core.model.news_item_attribute import NewsItemAttribute
 from core.service.role_based_access import RBACQuery, RoleBasedAccessService
+from core.service.pagination import PageCursor
+from core.service.story_search import StorySearchService, create_search_structures, drop_search_structures
+
+
+@dataclass
+class StoryFields:
+    """
+    Field projection of worker story feeds, parsed from e.g. fields=title,tags,news_items.content
+    news_items is None when no news item field was requested, the ids are always included
+    """
+
+    story: set[str]
+    news_items: set[str] | None
+
+    relations = ("news_items", "tags", "attributes")
+
+    @classmethod
+    def parse(cls, fields: str) -> "StoryFields":
+        story_columns = set(Story.__table__.columns.keys())
+        news_item_fields = {*NewsItem.__table__.columns.keys(), "attributes"}
+        story: set[str] = {"id"}
+        news_items: set[str] | None = None
+        for field in filter(None, (field.strip() for field in fields.split(","))):
+            parent, _, child = field.partition(".")
+            if not child and (parent in story_columns or parent in cls.relations):
+                story.add(parent)
+                if parent == "news_items":
+                    news_items = (news_items or set()) | news_item_fields
+            elif parent == "news_items" and child in news_item_fields:
+                news_items = (news_items or set()) | {child}
+            else:
+                raise ValueError(f"Unknown story field {field}")
+        if news_items is not None:
+            story.add("news_items")
+            news_items.add("id")
+        return cls(story, news_items)
+
+    @property
+    def story_columns(self) -> set[str]:
+        return self.story.difference(self.relations)
+
+    @property
+    def news_item_columns(self) -> set[str]:
+        return (self.news_items or set()) - {"attributes"}
 
 
 class Story(BaseModel):
@@ -37,6 +86,7 @@ class Story(BaseModel):
     likes: Mapped[int] = db.Column(db.Integer, default=0)
     dislikes: Mapped[int] = db.Column(db.Integer, default=0)
     relevance: Mapped[int] = db.Column(db.Integer, default=0)
+    tlp_rank: Mapped[int | None] = db.Column(db.Integer, index=True)
 
     comments: Mapped[str] = db.Column(db.String(), default="")
     summary: Mapped[str] = db.Column(db.Text, default="")
@@ -44,6 +94,9 @@ class Story(BaseModel):
     attributes: Mapped[list["NewsItemAttribute"]] = relationship("NewsItemAttribute", secondary="story_news_item_attribute")
     tags: Mapped[list["NewsItemTag"]] = relationship("NewsItemTag", back_populates="story", cascade="all, delete-orphan")
 
+    sort_columns = {"date": "created", "relevance": "relevance", "updated": "updated"}
+    count_ignored_args = {"sort", "limit", "offset", "cursor", "no_count", "estimate_count"}
+
     def __init__(
         self,
         title: str,
@@ -138,6 +191,14 @@ class Story(BaseModel):
         # Apply the filter using NOT IN to exclude stories found in the subquery
         return query.filter(Story.id.notin_(subquery))
 
+    @classmethod
+    def _add_search_to_query(cls, query: Select, search: str) -> Select:
+        search_subquery = StorySearchService.search_subquery(search)
+        if search_subquery is None:
+            return query
+        query = query.join(search_subquery, search_subquery.c.story_id == cls.id)
+        return query.add_columns(func.max(search_subquery.c.search_rank).label("search_rank"))
+
     @classmethod
     def get_filter_query(cls, filter_args: dict) -> Select:
         query = db.select(cls).group_by(cls.id).join(NewsItem, NewsItem.story_id == cls.id)
@@ -157,17 +218,7 @@ class Story(BaseModel):
             query = query.filter(OSINTSource.id.in_(source))
 
         if search := filter_args.get("search"):
-            search = search.strip()
-            if search.startswith('"') and search.endswith('"'):
-                words = [search[1:-1]]
-            else:
-                words = search.split()
-            query = query.join(
-                StorySearchIndex,
-                Story.id == StorySearchIndex.story_id,
-            )
-            for word in words:
-                query = query.filter(StorySearchIndex.data.ilike(f"%{word}%"))
+            query = cls._add_search_to_query(query, search)
 
         if exclude_attr := filter_args.get("exclude_attr"):
             query = cls._add_exclude_attr_filter(query, exclude_attr)
@@ -204,9 +255,13 @@ class Story(BaseModel):
             ).filter(ReportItemStory.story_id == null())
 
         if tags := filter_args.get("tags"):
-            for tag in tags:
-                alias = aliased(NewsItemTag)
-                query = query.join(alias, Story.id == alias.story_id).filter(or_(alias.name == tag, alias.tag_type == tag))
+            tag_matches = [
+                db.select(NewsItemTag.story_id)
+                .join(Tag, Tag.id == NewsItemTag.tag_id)
+                .where(or_(Tag.name_key == Tag.make_key(tag), Tag.tag_type == tag))
+                for tag in tags
+            ]
+            query = query.filter(Story.id.in_(intersect(*tag_matches) if len(tag_matches) > 1 else tag_matches[0]))
 
         if filter_range := filter_args.get("range", "").lower():
             date_limit = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
@@ -235,36 +290,60 @@ class Story(BaseModel):
         return query
 
     @classmethod
-    def _add_sorting_to_query(cls, filter_args: dict, query):
-        if sort := filter_args.get("sort", "date_desc").lower():
-            if sort == "date_desc":
-                query = query.order_by(db.desc(cls.created))
+    def _get_sort_key(cls, filter_args: dict, query: Select) -> tuple[str, Any, bool]:
+        """
+        Resolve the sort argument to (sort mode, sort column, descending), unknown modes fall back to date_desc
+        """
+        sort = (filter_args.get("sort") or "date_desc").lower()
+        if sort == "search_rank" and "search_rank" in query.selected_columns:
+            return sort, query.selected_columns.search_rank, True
+
+        column_name, _, direction = sort.rpartition("_")
+        if column_name not in cls.sort_columns or direction not in ("asc", "desc"):
+            return "date_desc", cls.created, True
+        return sort, getattr(cls, cls.sort_columns[column_name]), direction == "desc"
 
-            elif sort == "date_asc":
-                query = query.order_by(db.asc(cls.created))
-
-            elif sort == "relevance_desc":
-                query = query.order_by(db.desc(cls.relevance))
-
-            elif sort == "relevance_asc":
-                query = query.order_by(db.asc(cls.relevance))
-
-            elif sort == "updated_desc":
-                query = query.order_by(db.desc(cls.updated))
-
-            elif sort == "updated_asc":
-                query = query.order_by(db.asc(cls.updated))
-
-        return query
+    @classmethod
+    def _add_sorting_to_query(cls, filter_args: dict, query):
+        _, sort_column, descending = cls._get_sort_key(filter_args, query)
+        if descending:
+            return query.order_by(db.desc(sort_column), db.desc(cls.id))
+        return query.order_by(db.asc(sort_column), db.asc(cls.id))
 
     @classmethod
     def _add_paging_to_query(cls, filter_args: dict, query):
-        if offset := filter_args.get("offset"):
+        if cursor := filter_args.get("cursor"):
+            query = cls._add_cursor_to_query(filter_args, query, PageCursor.decode(cursor))
+        elif offset := filter_args.get("offset"):
             query = query.offset(offset)
         if limit := filter_args.get("limit"):
             query = query.limit(limit)
         return query
 
+    @classmethod
+    def _add_cursor_to_query(cls, filter_args: dict, query: Select, cursor: PageCursor) -> Select:
+        sort, sort_column, descending = cls._get_sort_key(filter_args, query)
+        if cursor.sort != sort:
+            raise ValueError(f"Cursor was created for sort {cursor.sort} not {sort}")
+        condition = cursor.condition(sort_column, cls.id, descending)
+        if sort == "search_rank":
+            return query.having(condition)
+        return query.filter(condition)
+
+    @classmethod
+    def _get_next_cursor(cls, filter_args: dict, query: Select, rows) -> str | None:
+        limit = filter_args.get("limit")
+        if not limit or len(rows) < int(limit):
+            return None
+        return cls._get_row_cursor(filter_args, query, rows[-1])
+
+    @classmethod
+    def _get_row_cursor(cls, filter_args: dict, query: Select, last_row) -> str:
+        sort, sort_column, _ = cls._get_sort_key(filter_args, query)
+        last_story = last_row[0]
+        value = last_row.search_rank if sort == "search_rank" else getattr(last_story, sort_column.key)
+        return PageCursor(sort=sort, value=value, id=last_story.id).encode()
+
     @classmethod
     def _add_ACL_check(cls, query, user: User):
         rbac = RBACQuery(user=user, resource_type=ItemType.OSINT_SOURCE)
@@ -275,18 +354,110 @@ class Story(BaseModel):
         return RoleBasedAccessService.filter_query_with_tlp(query, user)
 
     @classmethod
-    def get_by_filter(cls, filter_args: dict, user: User | None = None):
-        base_query = cls.get_filter_query(filter_args)
+    def _add_eager_loading_to_query(cls, query: Select) -> Select:
+        return query.options(
+            selectinload(cls.news_items).selectinload(NewsItem.attributes),
+            selectinload(cls.tags),
+            selectinload(cls.attributes),
+        )
+
+    @classmethod
+    def _add_projection_to_query(cls, filter_args: dict, query: Select, fields: StoryFields) -> Select:
+        """
+        Load only the projected columns and relations, plus the sort column needed for the next cursor
+        """
+        _, sort_column, _ = cls._get_sort_key(filter_args, query)
+        columns = {getattr(cls, column) for column in fields.story_columns}
+        if sort_column.key in cls.__table__.columns:
+            columns.add(sort_column)
+        options = [load_only(*columns)]
+        if fields.news_items is not None:
+            news_item_options = [load_only(NewsItem.story_id, *(getattr(NewsItem, column) for column in fields.news_item_columns))]
+            if "attributes" in fields.news_items:
+                news_item_options.append(selectinload(NewsItem.attributes))
+            options.append(selectinload(cls.news_items).options(*news_item_options))
+        if "tags" in fields.story:
+            options.append(selectinload(cls.tags))
+        if "attributes" in fields.story:
+            options.append(selectinload(cls.attributes))
+        return query.options(*options)
+
+    @classmethod
+    def get_filter_query_with_acl(cls, filter_args: dict, user: User | None) -> Select:
+        query = cls.get_filter_query(filter_args)
         if user:
-            base_query = cls._add_ACL_check(base_query, user)
-            base_query = cls._add_TLP_check(base_query, user)
+            query = cls._add_ACL_check(query, user)
+            query = cls._add_TLP_check(query, user)
+        return query
 
-        query = cls._add_sorting_to_query(filter_args, base_query)
+    @classmethod
+    def get_by_filter(
+        cls, filter_args: dict, user: User | None = None, fields: StoryFields | None = None
+    ) -> tuple[list["Story"], str | None]:
+        query = cls.get_filter_query_with_acl(filter_args, user)
+        query = cls._add_sorting_to_query(filter_args, query)
         query = cls._add_paging_to_query(filter_args, query)
+        if fields is None:
+            query = cls._add_eager_loading_to_query(query)
+        else:
+            query = cls._add_projection_to_query(filter_args, query, fields)
 
-        if filter_args.get("no_count", False):
-            return cls.get_filtered(query), 0
-        return cls.get_filtered(query), cls.get_filtered_count(base_query)
+        rows = db.session.execute(query).all()
+        return [row[0] for row in rows], cls._get_next_cursor(filter_args, query, rows)
+
+    @classmethod
+    def _get_count_cache_key(cls, filter_args: dict, user: User | None, estimate: bool = False) -> str:
+        count_args = {
+            key: sorted(value) if isinstance(value, list) else value
+            for key, value in filter_args.items()
+            if key not in cls.count_ignored_args and value not in (None, "", [])
+        }
+        if user:
+            tlp_level = user.get_highest_tlp()
+            access_signature = {"roles": sorted(user.get_roles()), "tlp": tlp_level.value if tlp_level else None}
+        else:
+            access_signature = {}
+        key_data = json.dumps({"filter": count_args, "access": access_signature, "estimate": estimate}, sort_keys=True, default=str)
+        # story visibility also depends on role permissions and source group membership
+        versions = ":".join(
+            get_version(namespace) for namespace in (STORY_CACHE_NAMESPACE, OSINT_SOURCE_CACHE_NAMESPACE, ACL_CACHE_NAMESPACE)
+        )
+        return f"story_count:{versions}:{hashlib.sha256(key_data.encode()).hexdigest()}"
+
+    @classmethod
+    def get_estimated_count(cls, query: Select) -> int | None:
+        """
+        Row estimate of the PostgreSQL planner for a query, None on other databases
+        """
+        connection = db.session.connection()
+        if connection.dialect.name != "postgresql":
+            return None
+        compiled = query.compile(dialect=connection.dialect, compile_kwargs={"render_postcompile": True})
+        plan = connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"]) if plan else None
+
+    @classmethod
+    def get_total_count(cls, filter_args: dict, user: User | None = None) -> tuple[int, bool]:
+        """
+        Total number of stories matching the filter as (count, exact)
+        Counts are cached per filter and access signature until stories change, if the cache is shared between workers.
+        With estimate_count the planner estimate is used instead of counting when it exceeds COUNT_ESTIMATE_THRESHOLD.
+        """
+        estimate = str(filter_args.get("estimate_count", "")).lower() == "true"
+        cache_key = cls._get_count_cache_key(filter_args, user, estimate) if is_shared() else None
+        if cache_key and (cached := cache.get(cache_key)):
+            return cached
+
+        query = cls.get_filter_query_with_acl(filter_args, user)
+        estimated_count = cls.get_estimated_count(query) if estimate else None
+        if estimated_count is not None and estimated_count >= Config.COUNT_ESTIMATE_THRESHOLD:
+            result = (estimated_count, False)
+        else:
+            result = (cls.get_filtered_count(query), True)
+
+        if cache_key:
+            cache.set(cache_key, result, timeout=Config.COUNT_CACHE_TIMEOUT)
+        return result
 
     @classmethod
     def get_date_counts(cls, news_items: list[dict[str, Any]]) -> Counter:
@@ -298,38 +469,72 @@ class Story(BaseModel):
         return max(date_counts.values(), default=0)
 
     @classmethod
-    def get_item_dict(cls, story: "Story", user: User) -> dict[str, Any]:
+    def get_item_dict(cls, story: "Story", in_reports_count: int, user_vote: dict[str, bool]) -> dict[str, Any]:
         item = story.to_dict()
-        item["in_reports_count"] = ReportItemStory.count(story.id)
-        item["user_vote"] = NewsItemVote.get_user_vote(story.id, user.id)
+        item["in_reports_count"] = in_reports_count
+        item["user_vote"] = user_vote
         return item
 
     @classmethod
     def get_by_filter_json(cls, filter_args, user):
-        stories, count = cls.get_by_filter(filter_args=filter_args, user=user)
+        """
+        Serialize a page of stories with a constant number of queries:
+        the page itself, one selectin load per relationship, one grouped query each for report counts and votes
+        and the total count unless it is cached
+        """
+        stories, next_cursor = cls.get_by_filter(filter_args=filter_args, user=user)
         items = []
         max_item_count = 0
 
         if not stories:
             return {"items": []}, 404
 
+        story_ids = [story.id for story in stories]
+        in_reports_counts = ReportItemStory.count_by_story_ids(story_ids)
+        user_votes = NewsItemVote.get_user_votes(story_ids, user.id)
+
         for story in stories:
-            item = cls.get_item_dict(story, user)
+            item = cls.get_item_dict(story, in_reports_counts.get(story.id, 0), user_votes.get(story.id, NewsItemVote.empty_vote()))
 
             current_max_item = cls.get_max_item_count(item["news_items"])
             max_item_count = max(max_item_count, current_max_item)
 
             items.append(item)
 
+        result: dict[str, Any] = {"items": items, "max_item": max_item_count}
+        if next_cursor:
+            result["next_cursor"] = next_cursor
+
         if filter_args.get("no_count", False):
-            return {"items": items, "max_item": max_item_count}, 200
+            return result, 200
+
+        count, count_exact = cls.get_total_count(filter_args, user)
+        return {"total_count": count, "total_count_exact": count_exact} | result
 
-        return {"total_count": count, "items": items, "max_item": max_item_count}
+    @classmethod
+    def get_for_worker(cls, filter_args: dict, fields: StoryFields | None = None) -> tuple[list[dict[str, Any]], str | None]:
+        stories, next_cursor = cls.get_by_filter(filter_args=filter_args, fields=fields)
+        return [story.to_worker_dict(fields) for story in stories], next_cursor
 
     @classmethod
-    def get_for_worker(cls, filter_args: dict) -> list[dict[str, Any]]:
-        stories, _ = cls.get_by_filter(filter_args=filter_args)
-        return [story.to_worker_dict() for story in stories] if stories else []
+    def iter_for_export(cls, filter_args: dict, fields: StoryFields | None = None) -> Iterator[dict[str, Any]]:
+        """
+        Worker dicts of all stories matching the filter, read in batches of EXPORT_BATCH_SIZE from a server side cursor
+        A limited export that filled its limit ends with {"next_cursor": ...} to resume from.
+        """
+        query = cls.get_filter_query_with_acl(filter_args, None)
+        query = cls._add_sorting_to_query(filter_args, query)
+        query = cls._add_paging_to_query(filter_args, query)
+        if fields is None:
+            query = cls._add_eager_loading_to_query(query)
+        else:
+            query = cls._add_projection_to_query(filter_args, query, fields)
+        row = None
+        count = 0
+        for count, row in enumerate(db.session.execute(query.execution_options(yield_per=Config.EXPORT_BATCH_SIZE)), start=1):
+            yield row[0].to_worker_dict(fields)
+        if (limit := filter_args.get("limit")) and row is not None and count >= int(limit):
+            yield {"next_cursor": cls._get_row_cursor(filter_args, query, row)}
 
     @classmethod
     def add(cls, data) -> "Story":
@@ -362,6 +567,7 @@ class Story(BaseModel):
                 }
             ).id
         except IntegrityError:
+            db.session.rollback()
             logger.warning("NewsItem already exists")
             return None
 
@@ -389,23 +595,93 @@ class Story(BaseModel):
 
         return {"message": "success", "id": story_id}, 200
 
+    @classmethod
+    def prepare_news_item_batch(cls, news_items_list: list[dict]) -> tuple[list[dict], dict[str, dict]]:
+        """
+        Validate and hash a batch of news items, returns one result per input item and the unique new items by hash
+        """
+        results = []
+        candidates: dict[str, dict] = {}
+        for news_item in news_items_list:
+            if err := cls.check_news_item_data(news_item):
+                logger.warning(err)
+                results.append({"status": "invalid", **err})
+                continue
+            news_item_hash = news_item.get("hash") or NewsItem.get_hash(
+                news_item.get("title", ""), news_item.get("link", ""), news_item.get("content", "")
+            )
+            status = "duplicate" if news_item_hash in candidates else "added"
+            results.append({"status": status, "hash": news_item_hash})
+            candidates.setdefault(news_item_hash, {**news_item, "hash": news_item_hash})
+
+        for news_item_hash in NewsItem.get_known(NewsItem.hash, list(candidates)):
+            candidates.pop(news_item_hash)
+        for result in results:
+            if result["status"] == "added" and result["hash"] not in candidates:
+                result["status"] = "duplicate"
+        return results, candidates
+
+    @classmethod
+    def build_from_news_item(cls, news_item: dict) -> "Story":
+        story = cls(
+            title=news_item.get("title", ""),
+            description=news_item.get("review", news_item.get("content", "")),
+            created=news_item.get("published", datetime.now()),
+            news_items=[NewsItem.from_dict(news_item)],
+        )
+        story.update_tlp()
+        return story
+
     @classmethod
     def add_news_items(cls, news_items_list: list[dict]):
-        ids = []
+        """
+        Add a batch of news items as new stories in one transaction, items with known hashes are skipped.
+        Returns one result per input item with status added, duplicate or invalid.
+        """
         try:
-            for news_item in news_items_list:
-                if err := cls.check_news_item_data(news_item):
-                    logger.warning(err)
-                    continue
-                if story_id := cls.add_from_news_item(news_item):
-                    ids.append(story_id)
-            db.session.commit()
+            results, candidates = cls.prepare_news_item_batch(news_items_list)
+            story_ids = cls.bulk_add_news_items(candidates)
         except Exception as e:
+            db.session.rollback()
             logger.exception(f"Failed to add news items: {e}")
             return {"error": f"Failed to add news items: {e}"}, 400
 
+        for result in results:
+            if result["status"] == "added":
+                if story_id := story_ids.get(result["hash"]):
+                    result["id"] = story_id
+                else:
+                    result["status"] = "duplicate"
+
+        ids = [result["id"] for result in results if result["status"] == "added"]
         logger.info(f"Added {len(ids)} news items - {ids}")
-        return {"message": f"Added {len(ids)} news items", "ids": ids}, 200
+        return {"message": f"Added {len(ids)} news items", "ids": ids, "results": results}, 200
+
+    @classmethod
+    def bulk_add_news_items(cls, candidates: dict[str, dict]) -> dict[str, str]:
+        """
+        Insert stories, news items, attributes and search index rows for all candidates in one flush.
+        Falls back to adding one by one if a concurrent ingest inserted one of the hashes in the meantime.
+        """
+        if not candidates:
+            return {}
+        stories = {news_item_hash: cls.build_from_news_item(news_item) for news_item_hash, news_item in candidates.items()}
+        story_ids = {news_item_hash: story.id for news_item_hash, story in stories.items()}
+        search_index_rows = [{"story_id": story.id, "data": StorySearchIndex.build_data(story)} for story in stories.values()]
+        try:
+            db.session.add_all(stories.values())
+            db.session.flush()
+            db.session.execute(db.insert(StorySearchIndex), search_index_rows)
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            logger.warning("Concurrent insert of news items detected, adding one by one")
+            return {
+                news_item_hash: story_id
+                for news_item_hash, news_item in candidates.items()
+                if (story_id := cls.add_from_news_item(news_item))
+            }
+        return story_ids
 
     @classmethod
     def update(cls, story_id: str, data, user=None):
@@ -526,7 +802,7 @@ class Story(BaseModel):
         if cls.is_assigned_to_report([story_id]):
             return {"error": f"Story with: {story_id} assigned to a report"}, 500
 
-        for news_item in story.news_items:
+        for news_item in story.news_items[:]:
             if news_item.allowed_with_acl(user, True):
                 story.news_items.remove(news_item)
                 news_item.delete_item()
@@ -571,13 +847,10 @@ class Story(BaseModel):
                 return {"error": "not_found"}, 404
 
             new_tags = NewsItemTag.parse_tags(tags)
-            for tag_name, new_tag in new_tags.items():
-                if tag_name in [tag.name for tag in story.tags]:
-                    continue
-                if existing_tag := NewsItemTag.find_by_name(tag_name):
-                    new_tag.name = existing_tag.name
-                    new_tag.tag_type = existing_tag.tag_type
-                story.tags.append(new_tag)
+            existing_tag_ids = {tag.tag_id for tag in story.tags}
+            for tag in Tag.get_or_create(new_tags):
+                if tag.id not in existing_tag_ids:
+                    story.tags.append(NewsItemTag(tag))
             if bot_type:
                 story.attributes.append(NewsItemAttribute(key=bot_type, value=f"{len(new_tags)}"))
             db.session.commit()
@@ -586,109 +859,139 @@ class Story(BaseModel):
             logger.log_debug_trace("Update News Item Tags Failed")
             return {"error": str(e)}, 500
 
+    @classmethod
+    def update_tags_bulk(cls, story_tags: dict[str, list | dict], bot_type: str = "") -> tuple[dict, int]:
+        """
+        Apply tags to many stories in one transaction, stories and tag names are resolved in batch
+        """
+        errors = {}
+        new_tags: dict[str, dict[str, str]] = {}
+        for story_id, tags in story_tags.items():
+            try:
+                new_tags[story_id] = NewsItemTag.parse_tags(tags)
+            except (AttributeError, TypeError):
+                errors[story_id] = 400
+        try:
+            stories = {
+                story.id: story
+                for story in db.session.execute(
+                    db.select(cls).where(cls.id.in_(new_tags)).options(selectinload(cls.tags), selectinload(cls.attributes))
+                ).scalars()
+            }
+            requested: dict[str, str] = {}
+            for tags in new_tags.values():
+                for tag_name, tag_type in tags.items():
+                    requested.setdefault(tag_name, tag_type)
+            dictionary = {tag.name_key: tag for tag in Tag.get_or_create(requested)}
+
+            associations = []
+            deltas = Counter()
+            for story_id, tags in new_tags.items():
+                if not (story := stories.get(story_id)):
+                    errors[story_id] = 404
+                    continue
+                existing_tag_ids = {tag.tag_id for tag in story.tags}
+                for tag_name in tags:
+                    tag = dictionary.get(Tag.make_key(tag_name)) if tag_name else None
+                    if tag is not None and tag.id not in existing_tag_ids:
+                        associations.append({"story_id": story_id, "tag_id": tag.id})
+                        deltas[(tag.name, tag.tag_type, TagStatistics.day_of(story.created))] += 1
+                        existing_tag_ids.add(tag.id)
+                if bot_type:
+                    story.attributes.append(NewsItemAttribute(key=bot_type, value=f"{len(tags)}"))
+            if associations:
+                db.session.execute(db.insert(NewsItemTag), associations)
+                TagStatistics.apply_deltas(db.session, deltas)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.log_debug_trace("Bulk Update News Item Tags Failed")
+            return {"error": str(e)}, 500
+        if errors:
+            return {"message": "Some tags failed to update", "errors": errors}, 207
+        return {"message": "Tags updated"}, 200
+
     @classmethod
     def group_multiple_stories(cls, story_mappings: list[list[str]]):
-        results = [cls.group_stories(story_ids) for story_ids in story_mappings]
-        if any(result[1] == 500 for result in results):
+        from core.service.story_grouping import StoryGroupingService
+
+        try:
+            grouping = StoryGroupingService()
+            grouping.group(story_mappings)
+            grouping.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.exception(f"Grouping Stories Failed - {str(e)}")
             return {"error": "grouping failed"}, 500
         return {"message": "success"}, 200
 
     @classmethod
     def move_items_to_story(cls, story_id: str, news_item_ids: list[int], user: User | None = None):
+        from core.service.story_grouping import StoryGroupingService
+
         try:
-            story = cls.get(story_id)
-            if not story:
-                return {"error": "not_found"}, 404
-            for item in news_item_ids:
-                news_item = NewsItem.get(item)
-                if not news_item:
-                    continue
-                if user is None or news_item.allowed_with_acl(user, True):
-                    story.news_items.append(news_item)
-                    story.relevance += 1
-                    story.add(story)
-                    story.update_status()
-            cls.update_stories({story})
-            db.session.commit()
-            return {"message": "success"}, 200
+            grouping = StoryGroupingService(user)
+            result = grouping.move_items(story_id, news_item_ids)
+            grouping.commit()
+            return result
         except Exception:
+            db.session.rollback()
             logger.log_debug_trace("Grouping Stories Failed")
             return {"error": "grouping failed"}, 500
 
     @classmethod
     def group_stories(cls, story_ids: list[str], user: User | None = None):
-        try:
-            if len(story_ids) < 2 or any(not isinstance(a_id, str) or len(a_id) == 0 for a_id in story_ids):
-                return {"error": "at least two valid Story ids needed"}, 404
-
-            first_story = Story.get(story_ids.pop(0))
-            if not first_story:
-                return {"error": "Story not found"}, 404
-            processed_stories = {first_story}
-            for item in story_ids:
-                story = Story.get(item)
-                if not story:
-                    continue
+        from core.service.story_grouping import StoryGroupingService
 
-                first_story.tags = list({tag.name: tag for tag in first_story.tags + story.tags}.values())
-                for news_item in story.news_items[:]:
-                    if user is None or news_item.allowed_with_acl(user, True):
-                        first_story.news_items.append(news_item)
-                        first_story.relevance += 1
-                        story.news_items.remove(news_item)
-                processed_stories.add(story)
-
-            cls.update_stories(processed_stories)
-            db.session.commit()
-            return {"message": "Clustering Stories successful", "id": first_story.id}, 200
+        try:
+            grouping = StoryGroupingService(user)
+            result = grouping.group([story_ids])[0]
+            grouping.commit()
+            return result
         except Exception as e:
+            db.session.rollback()
             logger.exception(f"Grouping Stories Failed - {str(e)}")
             return {"error": f"Grouping Stories Failed - {str(e)}"}, 500
 
     @classmethod
     def ungroup_multiple_stories(cls, story_ids: list[int], user: User | None = None):
-        results = [cls.ungroup_story(story_id, user) for story_id in story_ids]
-        if any(result[1] == 500 for result in results):
+        from core.service.story_grouping import StoryGroupingService
+
+        try:
+            grouping = StoryGroupingService(user)
+            grouping.ungroup(story_ids)
+            grouping.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.exception(f"Ungrouping Stories Failed - {str(e)}")
             return {"error": "grouping failed"}, 400
         return {"message": "success"}, 200
 
     @classmethod
     def ungroup_story(cls, story_id: int, user: User | None = None):
+        from core.service.story_grouping import StoryGroupingService
+
         try:
-            story = cls.get(story_id)
-            if not story:
-                return {"error": "Story not found"}, 404
-            for news_item in story.news_items[:]:
-                if user is None or news_item.allowed_with_acl(user, True):
-                    cls.create_from_item(news_item)
-            cls.update_stories({story})
-            db.session.commit()
-            return {"message": "Ungrouping Stories successful"}, 200
+            grouping = StoryGroupingService(user)
+            result = grouping.ungroup([story_id])[0]
+            grouping.commit()
+            return result
         except Exception as e:
+            db.session.rollback()
             logger.exception(f"Ungrouping Stories Failed - {str(e)}")
             return {"error": f"Ungrouping Stories failed - {str(e)}"}, 500
 
     @classmethod
     def remove_news_items_from_story(cls, newsitem_ids: list, user: User | None = None):
+        from core.service.story_grouping import StoryGroupingService
+
         try:
-            processed_stories = set()
-            for item in newsitem_ids:
-                news_item = NewsItem.get(item)
-                if not news_item:
-                    continue
-                if user:
-                    if not news_item.allowed_with_acl(user, True):
-                        continue
-                story = Story.get(news_item.story_id)
-                if not story:
-                    continue
-                story.news_items.remove(news_item)
-                processed_stories.add(story)
-                cls.create_from_item(news_item)
-            db.session.commit()
-            cls.update_stories(processed_stories)
-            return {"message": "success"}, 200
+            grouping = StoryGroupingService(user)
+            result = grouping.remove_news_items(newsitem_ids)
+            grouping.commit()
+            return result
         except Exception:
+            db.session.rollback()
             logger.log_debug_trace("Grouping News Item stories Failed")
             return {"error": "ungroup failed"}, 500
 
@@ -734,12 +1037,21 @@ class Story(BaseModel):
         for news_item in self.news_items:
             if tlp_level := news_item.get_tlp():
                 tlp_level_enum = TLPLevel(tlp_level)
-                if highest_tlp is None or tlp_level_enum > highest_tlp:
+                if highest_tlp is None or tlp_level_enum.rank > highest_tlp.rank:
                     highest_tlp = tlp_level_enum
 
         if highest_tlp:
             logger.debug(f"Setting TLP level {highest_tlp} for story {self.id}")
             NewsItemAttribute.set_or_update(self.attributes, "TLP", highest_tlp.value)
+        self.update_tlp_rank()
+
+    def update_tlp_rank(self):
+        tlp_attribute = NewsItemAttribute.get_by_key(self.attributes, "TLP")
+        try:
+            self.tlp_rank = TLPLevel(tlp_attribute.value).rank if tlp_attribute else None
+        except ValueError:
+            logger.warning(f"Invalid TLP level {tlp_attribute.value} for story {self.id}")
+            self.tlp_rank = None
 
     def to_dict(self) -> dict[str, Any]:
         data = super().to_dict()
@@ -755,7 +1067,9 @@ class Story(BaseModel):
         data["user_vote"] = NewsItemVote.get_user_vote(self.id, user_id)
         return data
 
-    def to_worker_dict(self) -> dict[str, Any]:
+    def to_worker_dict(self, fields: StoryFields | None = None) -> dict[str, Any]:
+        if fields is not None:
+            return self.to_projected_dict(fields)
         data = super().to_dict()
         data["news_items"] = [news_item.to_dict() for news_item in self.news_items]
         data["tags"] = {tag.name: tag.to_dict() for tag in self.tags}
@@ -763,6 +1077,16 @@ class Story(BaseModel):
             data["attributes"] = [news_item_attribute.to_dict() for news_item_attribute in attributes]
         return data
 
+    def to_projected_dict(self, fields: StoryFields) -> dict[str, Any]:
+        data = self.columns_to_dict(fields.story_columns)
+        if fields.news_items is not None:
+            data["news_items"] = [news_item.to_projected_dict(fields.news_items) for news_item in self.news_items]
+        if "tags" in fields.story:
+            data["tags"] = {tag.name: tag.to_dict() for tag in self.tags}
+        if "attributes" in fields.story:
+            data["attributes"] = [news_item_attribute.to_dict() for news_item_attribute in self.attributes]
+        return data
+
 
 class StorySearchIndex(BaseModel):
     __tablename__ = "story_search_index"
@@ -789,6 +1113,11 @@ class StorySearchIndex(BaseModel):
             search_index = StorySearchIndex(story.id)
             db.session.add(search_index)
 
+        search_index.data = cls.build_data(story)
+        db.session.commit()
+
+    @classmethod
+    def build_data(cls, story: "Story") -> str:
         data_components = [
             story.title,
             story.description,
@@ -807,8 +1136,11 @@ class StorySearchIndex(BaseModel):
                 ]
             )
 
-        search_index.data = " ".join(data_components).lower()
-        db.session.commit()
+        return " ".join(data_components).lower()
+
+
+event.listen(StorySearchIndex.__table__, "after_create", create_search_structures)
+event.listen(StorySearchIndex.__table__, "before_drop", drop_search_structures)
 
 
 class NewsItemVote(BaseModel):
@@ -834,6 +1166,15 @@ class NewsItemVote(BaseModel):
     def get_user_vote(cls, item_id: str, user_id: int):
         if vote := cls.get_by_filter(item_id, user_id):
             return {"like": vote.like, "dislike": vote.dislike}
+        return cls.empty_vote()
+
+    @classmethod
+    def get_user_votes(cls, item_ids: list[str], user_id: int) -> dict[str, dict[str, bool]]:
+        votes = cls.get_filtered(db.select(cls).filter(cls.item_id.in_(item_ids), cls.user_id == user_id)) or []
+        return {vote.item_id: {"like": vote.like, "dislike": vote.dislike} for vote in votes}
+
+    @staticmethod
+    def empty_vote() -> dict[str, bool]:
         return {"like": False, "dislike": False}
 
 
@@ -855,3 +1196,13 @@ class ReportItemStory(BaseModel):
     @classmethod
     def count(cls, story):
         return cls.get_filtered_count(db.select(cls).filter_by(story_id=story))
+
+    @classmethod
+    def count_by_story_ids(cls, story_ids: list[str]) -> dict[str, int]:
+        query = db.select(cls.story_id, func.count(cls.report_item_id)).filter(cls.story_id.in_(story_ids)).group_by(cls.story_id)
+        return {story_id: count for story_id, count in db.session.execute(query).tuples()}
+
+
+story_data_models = (Story, NewsItem, NewsItemAttribute, NewsItemTag, StoryNewsItemAttribute, ReportItemStory, StorySearchIndex)
+
+track_changes(STORY_CACHE_NAMESPACE, story_data_models)
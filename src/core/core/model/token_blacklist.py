@@ -1,8 +1,52 @@
-from datetime import datetime
+import time
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Mapped
 
 from core.managers.db_manager import db
 from core.model.base_model import BaseModel
+from core.config import Config
+
+
+class RevokedTokens:
+    """
+    In process copy of the token blacklist, refreshed at most every REVOKED_TOKEN_REFRESH_INTERVAL seconds.
+    Refreshes re-read a REVOKED_TOKEN_REFRESH_MARGIN window before the previous one, because concurrent revocations can commit
+    out of order, and the whole blacklist is reloaded every REVOKED_TOKEN_RELOAD_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self.tokens: dict[str, datetime] = {}
+        self.refreshed_at: float | None = None
+        self.reloaded_at: float | None = None
+        self.window_start: datetime | None = None
+
+    def add(self, token: str, created: datetime):
+        self.tokens[token] = created
+
+    def refresh(self):
+        now = time.monotonic()
+        if self.refreshed_at is not None and now - self.refreshed_at < Config.REVOKED_TOKEN_REFRESH_INTERVAL:
+            return
+        window_start = datetime.now()
+        expired = window_start - timedelta(seconds=Config.JWT_ACCESS_TOKEN_EXPIRES)
+        query = db.select(TokenBlacklist.token, TokenBlacklist.created)
+        if self.window_start is None or self.reloaded_at is None or now - self.reloaded_at >= Config.REVOKED_TOKEN_RELOAD_INTERVAL:
+            self.tokens = {token: created for token, created in db.session.execute(query.where(TokenBlacklist.created >= expired))}
+            self.reloaded_at = now
+        else:
+            since = self.window_start - timedelta(seconds=Config.REVOKED_TOKEN_REFRESH_MARGIN)
+            self.tokens.update((token, created) for token, created in db.session.execute(query.where(TokenBlacklist.created >= since)))
+            for token in [token for token, created in self.tokens.items() if created < expired]:
+                self.tokens.pop(token, None)
+        self.window_start = window_start
+        self.refreshed_at = now
+
+    def __contains__(self, token: str) -> bool:
+        self.refresh()
+        return token in self.tokens
+
+
+revoked_tokens = RevokedTokens()
 
 
 class TokenBlacklist(BaseModel):
@@ -19,13 +63,13 @@ class TokenBlacklist(BaseModel):
     def add(cls, token: str):
         db.session.add(TokenBlacklist(token))
         db.session.commit()
+        revoked_tokens.add(token, datetime.now())
 
     @classmethod
     def invalid(cls, token: str) -> bool:
-        query = db.select(db.exists().where(cls.token == token))
-        return db.session.execute(query).scalar_one()
+        return token in revoked_tokens
 
     @classmethod
     def delete_older(cls, check_time):
-        db.select(TokenBlacklist).filter(TokenBlacklist.created < check_time).delete()
+        db.session.execute(db.delete(TokenBlacklist).where(TokenBlacklist.created < check_time))
         db.session.commit()
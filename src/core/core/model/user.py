@@ -6,11 +6,12 @@ from sqlalchemy.sql import Select
 from sqlalchemy.orm import Mapped, relationship
 
 from core.managers.db_manager import db
+from core.managers.cache_manager import invalidate
 from core.model.role import Role
 from core.model.permission import Permission
 from core.model.organization import Organization
 from core.model.base_model import BaseModel
-from core.model.role import TLPLevel
+from core.model.role import TLPLevel, PRINCIPAL_CACHE_NAMESPACE
 from core.log import logger
 
 
@@ -31,6 +32,9 @@ class User(BaseModel):
     profile_id: Mapped[int] = db.Column(db.Integer, db.ForeignKey("user_profile.id", ondelete="CASCADE"))
     profile: Mapped["UserProfile"] = relationship("UserProfile", cascade="all, delete")
 
+    # cached authorization state of the authenticated user, set by PrincipalService
+    principal = None
+
     def __init__(
         self, username: str, name: str, organization: int, roles: list[int], permissions: list[str] | None = None, password=None, id=None
     ):
@@ -105,10 +109,14 @@ class User(BaseModel):
         if update_username := data.pop("username", None):
             user.username = update_username
 
+        user.principal = None
         db.session.commit()
+        invalidate(PRINCIPAL_CACHE_NAMESPACE)
         return {"message": f"User {user_id} updated", "id": user_id}, 200
 
     def get_permissions(self):
+        if self.principal:
+            return list(self.principal.permissions)
         all_permissions = {permission.id for permission in self.permissions if permission}
 
         for role in self.roles:
@@ -117,14 +125,18 @@ class User(BaseModel):
         return list(all_permissions)
 
     def get_roles(self):
+        if self.principal:
+            return list(self.principal.role_ids)
         return [role.id for role in self.roles]
 
     def get_highest_tlp(self) -> TLPLevel | None:
+        if self.principal:
+            return self.principal.tlp_level
         highest_tlp = None
         for role in self.roles:
             if tlp_level := role.tlp_level:
                 tlp_level_enum = TLPLevel(tlp_level)
-                if highest_tlp is None or tlp_level_enum > highest_tlp:
+                if highest_tlp is None or tlp_level_enum.rank > highest_tlp.rank:
                     highest_tlp = tlp_level_enum
         return highest_tlp
 
@@ -142,6 +154,7 @@ class User(BaseModel):
     def delete(cls, id: int) -> tuple[dict[str, Any], int]:
         result = super().delete(id)
         UserProfile.delete(id)
+        invalidate(PRINCIPAL_CACHE_NAMESPACE)
         return result
 
     @classmethod
@@ -5,6 +5,7 @@ from sqlalchemy.sql import Select
 from sqlalchemy.orm import Mapped, relationship
 
 from core.managers.db_manager import db
+from core.managers.cache_manager import track_changes, WORKER_CACHE_NAMESPACE
 from core.model.parameter_value import ParameterValue
 from core.model.base_model import BaseModel
 from core.log import logger
@@ -242,3 +243,6 @@ class Worker(BaseModel):
 class WorkerParameterValue(BaseModel):
     worker_id = db.Column(db.String, db.ForeignKey("worker.id", ondelete="CASCADE"), primary_key=True)
     parameter_value_id = db.Column(db.Integer, db.ForeignKey("parameter_value.id"), primary_key=True)
+
+
+track_changes(WORKER_CACHE_NAMESPACE, (Worker, WorkerParameterValue))
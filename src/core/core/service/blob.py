@@ -0,0 +1,77 @@
+from base64 import b64decode
+
+from core.managers.db_manager import db
+from core.managers.blob_manager import get_blob_store
+from core.config import Config
+from core.log import logger
+from core.model.product import Product
+from core.model.news_item_attribute import NewsItemAttribute
+from core.model.osint_source import OSINTSource
+
+
+class BlobService:
+    """
+    Maintenance of the blob store: moves data still stored inline in the database and deletes blobs no row references
+    """
+
+    batch_size = 100
+
+    @classmethod
+    def referenced_keys(cls) -> set[str]:
+        query = db.union(
+            db.select(Product.render_hash.label("key")).where(Product.render_hash.is_not(None)),
+            db.select(NewsItemAttribute.binary_hash).where(NewsItemAttribute.binary_hash.is_not(None)),
+            db.select(OSINTSource.icon_hash).where(OSINTSource.icon_hash.is_not(None)),
+        )
+        return set(db.session.execute(query).scalars())
+
+    @classmethod
+    def move_inline_data(cls) -> dict[str, int]:
+        store = get_blob_store()
+        moved = {"products": 0, "news_item_attributes": 0, "osint_sources": 0}
+        product_query = db.select(Product).where(Product.render_result.is_not(None)).limit(cls.batch_size)
+        while products := db.session.execute(product_query).scalars().all():
+            for product in products:
+                product.render_hash = store.put(b64decode(product.render_result))
+                product.render_result = None
+            moved["products"] += len(products)
+            db.session.commit()
+        attribute_query = db.select(NewsItemAttribute).where(NewsItemAttribute.binary_data.is_not(None)).limit(cls.batch_size)
+        while attributes := db.session.execute(attribute_query).scalars().all():
+            for attribute in attributes:
+                attribute.binary_hash = store.put(attribute.binary_data)
+                attribute.binary_data = None
+            moved["news_item_attributes"] += len(attributes)
+            db.session.commit()
+        source_query = db.select(OSINTSource).where(OSINTSource.icon.is_not(None)).limit(cls.batch_size)
+        while sources := db.session.execute(source_query).scalars().all():
+            for source in sources:
+                source.set_icon(source.icon)
+            moved["osint_sources"] += len(sources)
+            db.session.commit()
+        return moved
+
+    @classmethod
+    def collect_garbage(cls) -> int:
+        """
+        Delete unreferenced blobs older than BLOB_GC_MIN_AGE, younger ones may belong to a transaction that has not committed yet
+        """
+        store = get_blob_store()
+        referenced = cls.referenced_keys()
+        deleted = 0
+        for key in list(store.list_keys(Config.BLOB_GC_MIN_AGE)):
+            if key not in referenced:
+                store.delete(key)
+                deleted += 1
+        logger.info(f"Deleted {deleted} unreferenced blobs")
+        return deleted
+
+    @classmethod
+    def run_maintenance(cls) -> tuple[dict, int]:
+        try:
+            moved = cls.move_inline_data()
+            return {"moved": moved, "deleted": cls.collect_garbage()}, 200
+        except Exception:
+            db.session.rollback()
+            logger.exception("Blob maintenance failed")
+            return {"error": "Blob maintenance failed"}, 500
@@ -0,0 +1,36 @@
+import json
+import zlib
+from typing import Any, Iterable, Iterator
+
+
+class ExportService:
+    """
+    Encodes exported rows as newline delimited JSON, optionally gzip compressed, in chunks of roughly chunk_size bytes
+    """
+
+    chunk_size = 64 * 1024
+
+    @classmethod
+    def ndjson(cls, items: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+        buffer = bytearray()
+        for item in items:
+            buffer += json.dumps(item, default=str, separators=(",", ":")).encode()
+            buffer += b"\n"
+            if len(buffer) >= cls.chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        if buffer:
+            yield bytes(buffer)
+
+    @classmethod
+    def gzip(cls, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        compressor = zlib.compressobj(wbits=31)
+        for chunk in chunks:
+            if compressed := compressor.compress(chunk):
+                yield compressed
+        yield compressor.flush()
+
+    @classmethod
+    def stream(cls, items: Iterable[dict[str, Any]], compress: bool = False) -> Iterator[bytes]:
+        chunks = cls.ndjson(items)
+        return cls.gzip(chunks) if compress else chunks
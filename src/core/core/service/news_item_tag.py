@@ -1,72 +1,70 @@
+from collections import defaultdict
 from datetime import datetime, timedelta
-from core.model.story import Story
-from core.model.news_item_tag import NewsItemTag
+from core.model.news_item_tag import TagStatistics
 from core.managers.db_manager import db
-from sqlalchemy import func
+from sqlalchemy import func, case
 
 
 class NewsItemTagService:
     @classmethod
     def find_largest_tag_clusters(cls, days: int = 7, limit: int = 12, min_count: int = 2):
-        start_date = datetime.now() - timedelta(days=days)
-
-        subquery = (
-            db.select(NewsItemTag.name, NewsItemTag.tag_type, Story.id, Story.created)
-            .join(NewsItemTag.story)
-            .filter(Story.created >= start_date)
-            .subquery()
-        )
-
-        dialect_name = db.session.get_bind().dialect.name
-        group_concat_fn = func.group_concat(subquery.c.created) if dialect_name == "sqlite" else func.array_agg(subquery.c.created)
-
+        start_day = (datetime.now() - timedelta(days=days)).date()
         stmt = (
-            db.select(subquery.c.name, subquery.c.tag_type, group_concat_fn, func.count(subquery.c.name).label("count"))
-            .select_from(subquery.join(Story, subquery.c.id == Story.id))
-            .group_by(subquery.c.name, subquery.c.tag_type)
-            .having(func.count(subquery.c.name) >= min_count)
-            .order_by(func.count(subquery.c.name).desc())
+            db.select(TagStatistics.name, TagStatistics.tag_type, func.sum(TagStatistics.count).label("size"))
+            .filter(TagStatistics.day >= start_day)
+            .group_by(TagStatistics.name, TagStatistics.tag_type)
+            .having(func.sum(TagStatistics.count) >= min_count)
+            .order_by(db.desc("size"))
             .limit(limit)
         )
-
-        result = db.session.execute(stmt).all()
-        if not result:
+        clusters = db.session.execute(stmt).all()
+        if not clusters:
             return []
 
-        results = []
-        for name, tag_type, created, count in result:
-            published = list(created.split(",")) if dialect_name == "sqlite" else [dt.isoformat() for dt in created]
-            results.append(
-                {
-                    "name": name,
-                    "tag_type": tag_type,
-                    "published": published,
-                    "size": count,
-                }
-            )
+        published = defaultdict(list)
+        days_query = db.select(TagStatistics.name, TagStatistics.tag_type, TagStatistics.day, TagStatistics.count).filter(
+            TagStatistics.day >= start_day, TagStatistics.name.in_({name for name, _, _ in clusters})
+        )
+        for name, tag_type, day, count in db.session.execute(days_query.order_by(TagStatistics.day)):
+            published[(name, tag_type)].extend([day.isoformat()] * count)
 
-        return results
+        return [
+            {"name": name, "tag_type": tag_type, "published": published[(name, tag_type)], "size": size} for name, tag_type, size in clusters
+        ]
 
     @classmethod
-    def get_n_biggest_tags_by_type(cls, tag_type: str, n: int, days: int = 0) -> dict[str, dict]:
-        stmt = db.select(NewsItemTag.name, func.count(NewsItemTag.name).label("name_count")).filter(NewsItemTag.tag_type == tag_type)
-
+    def get_largest_tag_types(cls, days: int, tags_per_type: int = 5) -> dict:
+        """
+        Tag types ordered by their total number of tags, each with its largest tags of the last days, in one query over the rollup
+        """
+        recent_count = TagStatistics.count
         if days > 0:
-            date_threshold = datetime.now() - timedelta(days=days)
-            stmt = stmt.join(Story, NewsItemTag.story_id == Story.id).filter(Story.created >= date_threshold)
+            start_day = (datetime.now() - timedelta(days=days)).date()
+            recent_count = case((TagStatistics.day >= start_day, TagStatistics.count), else_=0)
 
-        stmt = stmt.group_by(NewsItemTag.name).order_by(db.desc("name_count")).limit(n)
-
-        result = db.session.execute(stmt).all()
-
-        return {row[0]: {"name": row[0], "size": row[1]} for row in result}
+        per_tag = (
+            db.select(
+                TagStatistics.tag_type,
+                TagStatistics.name,
+                func.sum(TagStatistics.count).label("total"),
+                func.sum(recent_count).label("size"),
+            )
+            .group_by(TagStatistics.tag_type, TagStatistics.name)
+            .subquery()
+        )
+        ranked = db.select(
+            per_tag,
+            func.sum(per_tag.c.total).over(partition_by=per_tag.c.tag_type).label("type_size"),
+            func.row_number().over(partition_by=per_tag.c.tag_type, order_by=per_tag.c.size.desc()).label("rank"),
+        ).subquery()
+        stmt = (
+            db.select(ranked.c.tag_type, ranked.c.type_size, ranked.c.name, ranked.c.size)
+            .filter(ranked.c.rank <= tags_per_type, ranked.c.size > 0)
+            .order_by(ranked.c.type_size.desc(), ranked.c.tag_type, ranked.c.rank)
+        )
 
-    @classmethod
-    def get_largest_tag_types(cls, days: int) -> dict:
-        tag_types_with_count = NewsItemTag.get_tag_types()
         largest_tag_types = {}
-        for tag_type, count in tag_types_with_count:
-            if tags := cls.get_n_biggest_tags_by_type(tag_type, 5, days=days):
-                largest_tag_types[tag_type] = {"size": count, "name": tag_type, "tags": tags}
-
+        for tag_type, type_size, name, size in db.session.execute(stmt):
+            tag_type_entry = largest_tag_types.setdefault(tag_type, {"size": type_size, "name": tag_type, "tags": {}})
+            tag_type_entry["tags"][name] = {"name": name, "size": size}
         return largest_tag_types
@@ -0,0 +1,38 @@
+import json
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+from sqlalchemy import tuple_
+
+
+@dataclass
+class PageCursor:
+    """
+    Opaque keyset cursor pointing behind the last row of a page, identified by its sort value and id
+    """
+
+    sort: str
+    value: Any
+    id: str
+
+    def encode(self) -> str:
+        value = {"datetime": self.value.isoformat()} if isinstance(self.value, datetime) else self.value
+        payload = json.dumps({"sort": self.sort, "value": value, "id": self.id}, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+            value = payload["value"]
+            if isinstance(value, dict):
+                value = datetime.fromisoformat(value["datetime"])
+            return cls(sort=payload["sort"], value=value, id=payload["id"])
+        except (ValueError, KeyError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {token}") from e
+
+    def condition(self, sort_column, id_column, descending: bool):
+        if descending:
+            return tuple_(sort_column, id_column) < (self.value, self.id)
+        return tuple_(sort_column, id_column) > (self.value, self.id)
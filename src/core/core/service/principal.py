@@ -0,0 +1,91 @@
+import time
+from dataclasses import dataclass
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.managers.db_manager import db
+from core.managers.cache_manager import get_version
+from core.model.user import User
+from core.model.role import TLPLevel, PRINCIPAL_CACHE_NAMESPACE
+from core.model.role_based_access import ACLVersion
+from core.config import Config
+
+
+@dataclass(frozen=True)
+class Principal:
+    """
+    Authorization relevant state of an authenticated user, cached per (username, token iat)
+    """
+
+    user_id: int
+    username: str
+    permissions: frozenset[str]
+    role_ids: tuple[int, ...]
+    tlp_level: TLPLevel | None
+    user_columns: dict
+    version: str
+    acl_version: int
+    expires: float
+
+    def is_valid(self) -> bool:
+        return (
+            time.monotonic() < self.expires
+            and self.version == get_version(PRINCIPAL_CACHE_NAMESPACE)
+            and self.acl_version == ACLVersion.get_version()
+        )
+
+
+principals: dict[tuple[str, int | None], Principal] = {}
+
+
+class PrincipalService:
+    @classmethod
+    def get_principal(cls, username: str, issued_at: int | None) -> Principal | None:
+        principal = principals.get((username, issued_at))
+        if principal is not None and principal.is_valid():
+            return principal
+        principals.pop((username, issued_at), None)
+        return None
+
+    @classmethod
+    def build_principal(cls, user: User) -> Principal:
+        return Principal(
+            user_id=user.id,
+            username=user.username,
+            permissions=frozenset(user.get_permissions()),
+            role_ids=tuple(user.get_roles()),
+            tlp_level=user.get_highest_tlp(),
+            user_columns={attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs},
+            version=get_version(PRINCIPAL_CACHE_NAMESPACE),
+            acl_version=ACLVersion.get_version(),
+            expires=time.monotonic() + Config.PRINCIPAL_CACHE_TTL,
+        )
+
+    @classmethod
+    def attach_user(cls, principal: Principal) -> User:
+        """
+        Attach the cached user to the current session without a SELECT, relationships are lazy loaded on access
+        """
+        if user := db.session.identity_map.get(db.session.identity_key(User, principal.user_id)):
+            return user
+        user = User.__mapper__.class_manager.new_instance()
+        for key, value in principal.user_columns.items():
+            set_committed_value(user, key, value)
+        make_transient_to_detached(user)
+        db.session.add(user)
+        return user
+
+    @classmethod
+    def load_user(cls, username: str, issued_at: int | None) -> User | None:
+        if principal := cls.get_principal(username, issued_at):
+            user = cls.attach_user(principal)
+        else:
+            if not (user := User.find_by_name(username)):
+                return None
+            principal = cls.build_principal(user)
+            if len(principals) > Config.PRINCIPAL_CACHE_SIZE:
+                principals.clear()
+            principals[(username, issued_at)] = principal
+        user.principal = principal
+        return user
@@ -1,13 +1,17 @@
-from dataclasses import dataclass
-from sqlalchemy import cast, String, select
-from sqlalchemy.orm import aliased
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from sqlalchemy import cast, String, select, event, inspect
+from sqlalchemy.orm import Session
 from sqlalchemy.sql import Select
 from sqlalchemy.sql.expression import true
 
 from core.managers.db_manager import db
-from core.model.user import User
-from core.model.role_based_access import RoleBasedAccess, RBACRole
-from core.model.role import TLPLevel
+from core.managers.cache_manager import invalidate
+from core.model.user import User, UserRole, UserPermission
+from core.model.role_based_access import RoleBasedAccess, RBACRole, ACLVersion, ACL_CACHE_NAMESPACE
+from core.model.role import Role, RolePermission, TLPLevel
+from core.config import Config
 
 
 @dataclass
@@ -18,7 +22,58 @@ class RBACQuery:
     require_write_access: bool = False
 
 
+@dataclass
+class ACLSnapshot:
+    """
+    Compiled ACLs of one user: readable and writable item ids per item type, "*" grants access to all items of a type
+    """
+
+    version: int
+    expires: float
+    enabled_types: frozenset[str]
+    readable: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+    writable: dict[str, set[str]] = field(default_factory=lambda: defaultdict(set))
+
+    def allowed_ids(self, resource_type: str, require_write_access: bool = False) -> set[str]:
+        return (self.writable if require_write_access else self.readable).get(resource_type, set())
+
+    def has_access(self, resource_type: str, resource_id: str | None, require_write_access: bool = False) -> bool:
+        if resource_type not in self.enabled_types:
+            return True
+        allowed_ids = self.allowed_ids(resource_type, require_write_access)
+        return "*" in allowed_ids or resource_id in allowed_ids
+
+
+acl_snapshots: dict[int, ACLSnapshot] = {}
+
+
 class RoleBasedAccessService:
+    @classmethod
+    def get_acl_snapshot(cls, user: User) -> ACLSnapshot:
+        """
+        ACL snapshot of a user, compiled with one query and kept in process until the ACL version changes or ACL_CACHE_TTL passes
+        """
+        version = ACLVersion.get_version()
+        snapshot = acl_snapshots.get(user.id)
+        if snapshot is not None and snapshot.version == version and time.monotonic() < snapshot.expires:
+            return snapshot
+
+        snapshot = ACLSnapshot(
+            version=version, expires=time.monotonic() + Config.ACL_CACHE_TTL, enabled_types=RoleBasedAccess.get_enabled_types()
+        )
+        query = (
+            select(RoleBasedAccess.item_type, RoleBasedAccess.item_id, RoleBasedAccess.read_only)
+            .join(RBACRole, RBACRole.acl_id == RoleBasedAccess.id)
+            .join(UserRole, UserRole.role_id == RBACRole.role_id)
+            .where(UserRole.user_id == user.id, RoleBasedAccess.enabled == true())
+        )
+        for item_type, item_id, read_only in db.session.execute(query):
+            snapshot.readable[item_type.value].add(item_id)
+            if not read_only:
+                snapshot.writable[item_type.value].add(item_id)
+        acl_snapshots[user.id] = snapshot
+        return snapshot
+
     @classmethod
     def user_has_access_to_resource(cls, rbac_query: RBACQuery) -> bool:
         """
@@ -26,35 +81,18 @@ class RoleBasedAccessService:
         """
         if not RoleBasedAccess.is_enabled_for_type(rbac_query.resource_type):
             return True
-        return any(cls._is_authorized(acl_entry, rbac_query) for role in rbac_query.user.roles for acl_entry in role.acls)
-
-    @staticmethod
-    def _is_authorized(acl_entry: RoleBasedAccess, rbac_query: RBACQuery) -> bool:
-        matches_resource = acl_entry.item_type.value == rbac_query.resource_type and acl_entry.item_id in [rbac_query.resource_id, "*"]
-        is_enabled = acl_entry.enabled
-        has_required_access = not rbac_query.require_write_access or not acl_entry.read_only
-
-        return bool(matches_resource and is_enabled and has_required_access)
+        snapshot = cls.get_acl_snapshot(rbac_query.user)
+        return snapshot.has_access(rbac_query.resource_type, rbac_query.resource_id, rbac_query.require_write_access)
 
     @classmethod
     def filter_query_with_tlp(cls, query: Select, user: User) -> Select:
-        from core.model.story import Story, StoryNewsItemAttribute
-        from core.model.news_item_attribute import NewsItemAttribute
+        from core.model.story import Story
 
         user_tlp_level = user.get_highest_tlp()
         if not user_tlp_level or user_tlp_level.value == "red":
             return query
 
-        tlp_attribute_subquery = (
-            select(StoryNewsItemAttribute.story_id)
-            .join(NewsItemAttribute, NewsItemAttribute.id == StoryNewsItemAttribute.news_item_attribute_id)
-            .filter(
-                NewsItemAttribute.key == "TLP", NewsItemAttribute.value.in_([level.value for level in TLPLevel if level <= user_tlp_level])
-            )
-            .subquery()
-        )
-
-        return query.filter(Story.id.in_(tlp_attribute_subquery))
+        return query.filter(Story.tlp_rank <= user_tlp_level.rank)
 
     @classmethod
     def filter_report_query_with_tlp(cls, query: Select, user: User) -> Select:
@@ -68,7 +106,7 @@ class RoleBasedAccessService:
             select(ReportItemAttribute.report_item_id)
             .filter(
                 ReportItemAttribute.attribute_type == AttributeType.TLP,
-                ReportItemAttribute.value.in_([level.value for level in TLPLevel if level <= user_tlp_level]),
+                ReportItemAttribute.value.in_([level.value for level in TLPLevel if level.rank <= user_tlp_level.rank]),
             )
             .subquery()
         )
@@ -77,28 +115,13 @@ class RoleBasedAccessService:
 
     @classmethod
     def filter_query_with_acl(cls, query: Select, rbac_query: RBACQuery) -> Select:
-        role_ids = [role.id for role in rbac_query.user.roles]
         item_type = rbac_query.resource_type
         if not RoleBasedAccess.is_enabled_for_type(item_type):
             return query
         model_class = cls.get_model_class(item_type)
 
-        rbac_role_alias = aliased(RBACRole)
-        role_based_access_alias = aliased(RoleBasedAccess)
-
-        # Query to find item_ids accessible by any of the roles or check for wildcard access
-        access_check_subquery = (
-            select(role_based_access_alias.item_id)
-            .join(rbac_role_alias, role_based_access_alias.id == rbac_role_alias.acl_id)
-            .where(
-                role_based_access_alias.item_type == item_type,
-                role_based_access_alias.enabled == true(),
-                rbac_role_alias.role_id.in_(role_ids),
-            )
-            .distinct()
-        ).subquery()
-
-        if db.session.execute(select(db.exists().where(access_check_subquery.c.item_id == "*"))).scalar():
+        allowed_ids = cls.get_acl_snapshot(rbac_query.user).allowed_ids(item_type)
+        if "*" in allowed_ids:
             return query
 
         if item_type in ["report_item_type", "product_type", "word_list"]:
@@ -106,7 +129,7 @@ class RoleBasedAccessService:
         else:
             id_field = model_class.id
 
-        return query.where(id_field.in_(access_check_subquery))  # type: ignore
+        return query.where(id_field.in_(sorted(allowed_ids)))  # type: ignore
 
     @classmethod
     def get_model_class(cls, resource_type: str):
@@ -130,3 +153,57 @@ class RoleBasedAccessService:
             return ProductType
         else:
             raise ValueError(f"Unknown resource type: {resource_type}")
+
+
+# models whose changes alter ACLs, permissions or TLP levels of users, cached principals and ACL snapshots depend on them
+ACL_MODELS = (RoleBasedAccess, RBACRole, UserRole, UserPermission, Role, RolePermission)
+
+
+def user_access_changed(session: Session, user: User) -> bool:
+    attrs = inspect(user).attrs
+    return user in session.new or user in session.deleted or attrs.roles.history.has_changes() or attrs.permissions.history.has_changes()
+
+
+def track_acl_changes(session: Session, flush_context, instances):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, ACL_MODELS) or (isinstance(obj, User) and user_access_changed(session, obj)):
+            session.info["acl_changed"] = True
+            return
+
+
+def track_acl_statements(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and issubclass(mapper.class_, ACL_MODELS):
+        orm_execute_state.session.info["acl_changed"] = True
+
+
+def bump_acl_version(session: Session):
+    """
+    Bump the shared ACL version in the committing transaction, so other processes see the change together with the new ACLs
+    """
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    if session.info.get("acl_changed") and not session.info.get("acl_version_bumped"):
+        session.info["acl_version_bumped"] = True
+        ACLVersion.bump(session)
+
+
+def invalidate_acl_cache(session: Session):
+    session.info.pop("acl_version_bumped", None)
+    if session.info.pop("acl_changed", False):
+        ACLVersion.forget()
+        invalidate(ACL_CACHE_NAMESPACE)
+
+
+def discard_acl_changes(session: Session, previous_transaction):
+    session.info.pop("acl_changed", None)
+    session.info.pop("acl_version_bumped", None)
+
+
+event.listen(Session, "before_flush", track_acl_changes)
+event.listen(Session, "do_orm_execute", track_acl_statements)
+event.listen(Session, "before_commit", bump_acl_version)
+event.listen(Session, "after_commit", invalidate_acl_cache)
+event.listen(Session, "after_soft_rollback", discard_acl_changes)
@@ -0,0 +1,204 @@
+from collections import Counter, defaultdict
+from sqlalchemy import delete, update
+from sqlalchemy.orm import selectinload
+
+from core.managers.db_manager import db
+from core.log import logger
+from core.model.user import User
+from core.model.story import Story, StorySearchIndex
+from core.model.news_item import NewsItem
+from core.model.news_item_tag import NewsItemTag, Tag, TagStatistics
+
+
+class StoryGroupingService:
+    """
+    Set based grouping and ungrouping of stories.
+    Referenced stories and news items are loaded in bulk, ACLs are checked once per OSINT source,
+    news items and tags are moved with bulk UPDATEs and every affected story is refreshed once in a single transaction.
+    """
+
+    def __init__(self, user: User | None = None):
+        self.user = user
+        self.source_access: dict[str | None, bool] = {}
+        self.affected_story_ids: set[str] = set()
+        self.relevance_changes: Counter[str] = Counter()
+
+    def has_write_access(self, osint_source_id: str | None) -> bool:
+        if self.user is None:
+            return True
+        if osint_source_id not in self.source_access:
+            self.source_access[osint_source_id] = NewsItem.source_allowed_with_acl(self.user, osint_source_id, require_write_access=True)
+        return self.source_access[osint_source_id]
+
+    def group(self, story_mappings: list[list[str]]) -> list[tuple[dict, int]]:
+        all_story_ids = {story_id for story_ids in story_mappings for story_id in story_ids if isinstance(story_id, str)}
+        story_created = dict(db.session.execute(db.select(Story.id, Story.created).where(Story.id.in_(all_story_ids))).tuples().all())
+        existing_story_ids = set(story_created)
+
+        items_by_story = defaultdict(list)
+        for news_item_id, story_id, osint_source_id in db.session.execute(
+            db.select(NewsItem.id, NewsItem.story_id, NewsItem.osint_source_id).where(NewsItem.story_id.in_(existing_story_ids))
+        ):
+            items_by_story[story_id].append((news_item_id, osint_source_id))
+
+        tags_by_story = defaultdict(list)
+        tag_origins = {}
+        for tag_id, story_id, tag_name, tag_type in db.session.execute(
+            db.select(NewsItemTag.id, NewsItemTag.story_id, Tag.name, Tag.tag_type)
+            .join(Tag, Tag.id == NewsItemTag.tag_id)
+            .where(NewsItemTag.story_id.in_(existing_story_ids))
+        ):
+            tags_by_story[story_id].append((tag_id, tag_name))
+            tag_origins[tag_id] = (tag_name, tag_type, story_created[story_id])
+
+        item_moves: dict[str, str] = {}
+        tag_moves: dict[int, str] = {}
+        results = []
+        for story_ids in story_mappings:
+            if len(story_ids) < 2 or any(not isinstance(story_id, str) or len(story_id) == 0 for story_id in story_ids):
+                results.append(({"error": "at least two valid Story ids needed"}, 404))
+                continue
+            target_id, *source_ids = story_ids
+            if target_id not in existing_story_ids:
+                results.append(({"error": "Story not found"}, 404))
+                continue
+
+            self.affected_story_ids.add(target_id)
+            for source_id in source_ids:
+                if source_id not in existing_story_ids or source_id == target_id:
+                    continue
+                self.move_tags(tags_by_story, source_id, target_id, tag_moves)
+
+                remaining_items = []
+                for news_item_id, osint_source_id in items_by_story[source_id]:
+                    if self.has_write_access(osint_source_id):
+                        item_moves[news_item_id] = target_id
+                        items_by_story[target_id].append((news_item_id, osint_source_id))
+                        self.relevance_changes[target_id] += 1
+                    else:
+                        remaining_items.append((news_item_id, osint_source_id))
+                items_by_story[source_id] = remaining_items
+                self.affected_story_ids.add(source_id)
+                if not remaining_items:
+                    existing_story_ids.discard(source_id)
+
+            results.append(({"message": "Clustering Stories successful", "id": target_id}, 200))
+
+        self.apply_moves(NewsItem, item_moves)
+        self.apply_moves(NewsItemTag, tag_moves)
+        TagStatistics.record_moves(db.session, [(*tag_origins[tag_id], story_created[story_id]) for tag_id, story_id in tag_moves.items()])
+        return results
+
+    def move_tags(self, tags_by_story: dict[str, list], source_id: str, target_id: str, tag_moves: dict[int, str]):
+        target_tag_names = {tag_name for _, tag_name in tags_by_story[target_id]}
+        remaining_tags = []
+        for tag_id, tag_name in tags_by_story[source_id]:
+            if tag_name in target_tag_names:
+                remaining_tags.append((tag_id, tag_name))
+                continue
+            tag_moves[tag_id] = target_id
+            tags_by_story[target_id].append((tag_id, tag_name))
+            target_tag_names.add(tag_name)
+        tags_by_story[source_id] = remaining_tags
+
+    def move_items(self, story_id: str, news_item_ids: list) -> tuple[dict, int]:
+        if not Story.get(story_id):
+            return {"error": "not_found"}, 404
+
+        item_moves = {}
+        for news_item_id, current_story_id, osint_source_id in db.session.execute(
+            db.select(NewsItem.id, NewsItem.story_id, NewsItem.osint_source_id).where(NewsItem.id.in_(news_item_ids))
+        ):
+            if current_story_id == story_id or not self.has_write_access(osint_source_id):
+                continue
+            item_moves[news_item_id] = story_id
+            self.relevance_changes[story_id] += 1
+            if current_story_id:
+                self.affected_story_ids.add(current_story_id)
+
+        self.affected_story_ids.add(story_id)
+        self.apply_moves(NewsItem, item_moves)
+        return {"message": "success"}, 200
+
+    def ungroup(self, story_ids: list) -> list[tuple[dict, int]]:
+        existing_story_ids = set(db.session.execute(db.select(Story.id).where(Story.id.in_(story_ids))).scalars())
+        news_items = db.session.execute(db.select(NewsItem).where(NewsItem.story_id.in_(existing_story_ids))).scalars().all()
+        self.split_off(news_items)
+        return [
+            ({"message": "Ungrouping Stories successful"}, 200) if story_id in existing_story_ids else ({"error": "Story not found"}, 404)
+            for story_id in story_ids
+        ]
+
+    def remove_news_items(self, news_item_ids: list) -> tuple[dict, int]:
+        news_items = (
+            db.session.execute(db.select(NewsItem).where(NewsItem.id.in_(news_item_ids), NewsItem.story_id.isnot(None))).scalars().all()
+        )
+        self.split_off(news_items)
+        return {"message": "success"}, 200
+
+    def split_off(self, news_items):
+        """
+        Move every news item the user may write to a new story of its own
+        """
+        for news_item in news_items:
+            if not self.has_write_access(news_item.osint_source_id):
+                continue
+            self.affected_story_ids.add(news_item.story_id)
+            new_story = Story(
+                title=news_item.title,
+                created=news_item.published,
+                description=news_item.review or news_item.content,
+                news_items=[news_item],
+            )
+            db.session.add(new_story)
+            self.affected_story_ids.add(new_story.id)
+
+    def apply_moves(self, model, moves: dict):
+        if moves:
+            db.session.execute(update(model), [{"id": item_id, "story_id": story_id} for item_id, story_id in moves.items()])
+
+    def commit(self):
+        """
+        Refresh relevance, TLP, timestamps and search index of all affected stories once, delete emptied stories and commit
+        """
+        db.session.flush()
+        if not self.affected_story_ids:
+            db.session.commit()
+            return
+
+        stories = (
+            db.session.execute(
+                db.select(Story)
+                .where(Story.id.in_(self.affected_story_ids))
+                .options(
+                    selectinload(Story.news_items).selectinload(NewsItem.attributes), selectinload(Story.attributes), selectinload(Story.tags)
+                )
+                .execution_options(populate_existing=True)
+            )
+            .scalars()
+            .all()
+        )
+        search_indexes = {
+            search_index.story_id: search_index
+            for search_index in db.session.execute(
+                db.select(StorySearchIndex).where(StorySearchIndex.story_id.in_(self.affected_story_ids))
+            ).scalars()
+        }
+
+        if empty_story_ids := [story.id for story in stories if not story.news_items]:
+            logger.debug(f"Deleting empty Stories - {empty_story_ids}")
+            db.session.execute(delete(StorySearchIndex).where(StorySearchIndex.story_id.in_(empty_story_ids)))
+
+        for story in stories:
+            if not story.news_items:
+                db.session.delete(story)
+                continue
+            story.relevance += self.relevance_changes[story.id]
+            story.update_tlp()
+            story.update_timestamps()
+            if search_index := search_indexes.get(story.id):
+                search_index.data = StorySearchIndex.build_data(story)
+            else:
+                db.session.add(StorySearchIndex(story.id, StorySearchIndex.build_data(story)))
+
+        db.session.commit()
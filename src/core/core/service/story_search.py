@@ -0,0 +1,168 @@
+import re
+from dataclasses import dataclass
+from sqlalchemy import Text, and_, case, cast, column, func, literal, literal_column, table, text
+from sqlalchemy.dialects.postgresql import TSQUERY
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql import Select
+
+from core.managers.db_manager import db
+from core.config import Config
+
+
+SEARCH_TERM_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+SEARCH_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+@dataclass
+class SearchTerm:
+    raw: str
+    tokens: list[str]
+    prefix: bool = False
+
+
+def parse_search(search: str) -> list[SearchTerm]:
+    """
+    Split a search string into terms.
+    "quoted text" is matched as a phrase, a trailing * turns the last token into a prefix match.
+    """
+    terms = []
+    for phrase, word in SEARCH_TERM_PATTERN.findall(search.strip()):
+        raw = phrase or word
+        prefix = bool(word) and word.endswith("*")
+        if tokens := SEARCH_TOKEN_PATTERN.findall(raw.lower()):
+            terms.append(SearchTerm(raw=raw.rstrip("*"), tokens=tokens, prefix=prefix))
+    return terms
+
+
+class SearchBackend:
+    """
+    Fallback backend that matches the story search index with ILIKE, no index usage and no ranking
+    """
+
+    name = "like"
+
+    def create_statements(self) -> list[str]:
+        return []
+
+    def drop_statements(self) -> list[str]:
+        return []
+
+    def match_query(self, terms: list[SearchTerm]) -> Select:
+        from core.model.story import StorySearchIndex
+
+        conditions = [StorySearchIndex.data.ilike(f"%{term.raw}%") for term in terms]
+        return db.select(StorySearchIndex.story_id, literal(0).label("search_rank")).where(and_(*conditions))
+
+
+class PostgresSearchBackend(SearchBackend):
+    """
+    Stored tsvector column with a GIN index, ranked with ts_rank_cd
+    """
+
+    name = "postgresql"
+
+    def create_statements(self) -> list[str]:
+        return [
+            "ALTER TABLE story_search_index ADD COLUMN IF NOT EXISTS search_vector tsvector "
+            "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(data, ''))) STORED",
+            "CREATE INDEX IF NOT EXISTS ix_story_search_index_search_vector ON story_search_index USING GIN (search_vector)",
+        ]
+
+    def to_tsquery(self, terms: list[SearchTerm]):
+        """
+        Let Postgres tokenize every term with the same parser as the tsvector, so domains, IPs and CVE IDs stay single lexemes.
+        A prefix term gets :* appended to its last lexeme
+        """
+        ts_query = None
+        for term in terms:
+            term_query = func.phraseto_tsquery("simple", term.raw)
+            if term.prefix:
+                prefix_query = cast(cast(term_query, Text).concat(":*"), TSQUERY)
+                term_query = case((func.numnode(term_query) == 0, term_query), else_=prefix_query)
+            ts_query = term_query if ts_query is None else ts_query.op("&&")(term_query)
+        return ts_query
+
+    def match_query(self, terms: list[SearchTerm]) -> Select:
+        from core.model.story import StorySearchIndex
+
+        search_vector = literal_column("story_search_index.search_vector")
+        ts_query = self.to_tsquery(terms)
+        return db.select(StorySearchIndex.story_id, func.ts_rank_cd(search_vector, ts_query).label("search_rank")).where(
+            search_vector.op("@@")(ts_query)
+        )
+
+
+class SQLiteSearchBackend(SearchBackend):
+    """
+    External content FTS5 table kept in sync with triggers, ranked with the hidden bm25 rank column
+    """
+
+    name = "sqlite"
+    fts_table = "story_search_index_fts"
+
+    def create_statements(self) -> list[str]:
+        fts = self.fts_table
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(data, content='story_search_index', content_rowid='id')",
+            f"""CREATE TRIGGER IF NOT EXISTS story_search_index_ai AFTER INSERT ON story_search_index BEGIN
+                INSERT INTO {fts}(rowid, data) VALUES (new.id, new.data);
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS story_search_index_ad AFTER DELETE ON story_search_index BEGIN
+                INSERT INTO {fts}({fts}, rowid, data) VALUES ('delete', old.id, old.data);
+            END""",
+            f"""CREATE TRIGGER IF NOT EXISTS story_search_index_au AFTER UPDATE ON story_search_index BEGIN
+                INSERT INTO {fts}({fts}, rowid, data) VALUES ('delete', old.id, old.data);
+                INSERT INTO {fts}(rowid, data) VALUES (new.id, new.data);
+            END""",
+        ]
+
+    def drop_statements(self) -> list[str]:
+        return [f"DROP TABLE IF EXISTS {self.fts_table}"]
+
+    def to_match(self, terms: list[SearchTerm]) -> str:
+        return " ".join(f'"{" ".join(term.tokens)}"{"*" if term.prefix else ""}' for term in terms)
+
+    def match_query(self, terms: list[SearchTerm]) -> Select:
+        from core.model.story import StorySearchIndex
+
+        fts_table = table(self.fts_table, column("rowid"), column("rank"))
+        fts_column = literal_column(self.fts_table)
+        return (
+            db.select(StorySearchIndex.story_id, (-fts_table.c.rank).label("search_rank"))
+            .join(fts_table, fts_table.c.rowid == StorySearchIndex.id)
+            .where(fts_column.op("MATCH")(self.to_match(terms)))
+        )
+
+
+search_backends: dict[str, SearchBackend] = {
+    backend.name: backend for backend in (SearchBackend(), PostgresSearchBackend(), SQLiteSearchBackend())
+}
+
+
+def get_search_backend(dialect_name: str | None = None) -> SearchBackend:
+    if Config.SEARCH_BACKEND != "auto":
+        return search_backends[Config.SEARCH_BACKEND]
+    dialect_name = dialect_name or db.session.get_bind().dialect.name
+    return search_backends.get(dialect_name, search_backends["like"])
+
+
+def create_search_structures(target, connection: Connection, **kw):
+    for statement in get_search_backend(connection.dialect.name).create_statements():
+        connection.execute(text(statement))
+
+
+def drop_search_structures(target, connection: Connection, **kw):
+    for statement in get_search_backend(connection.dialect.name).drop_statements():
+        connection.execute(text(statement))
+
+
+class StorySearchService:
+    @classmethod
+    def search_subquery(cls, search: str):
+        """
+        Subquery of (story_id, search_rank) for all stories matching the search string, higher rank is more relevant
+        """
+        terms = parse_search(search)
+        if not terms:
+            return None
+        return get_search_backend().match_query(terms).subquery("story_search")
@@ -0,0 +1,62 @@
+"""
+full text search index for story_search_index (tsvector + GIN on postgresql, FTS5 on sqlite)
+"""
+
+from yoyo import step
+
+__depends__ = {"20240427_01_e4nGV-initial-migration-noop"}
+
+
+postgres_apply = [
+    "ALTER TABLE story_search_index ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('simple', coalesce(data, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_story_search_index_search_vector ON story_search_index USING GIN (search_vector)",
+]
+
+postgres_rollback = [
+    "DROP INDEX IF EXISTS ix_story_search_index_search_vector",
+    "ALTER TABLE story_search_index DROP COLUMN IF EXISTS search_vector",
+]
+
+sqlite_apply = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS story_search_index_fts USING fts5(data, content='story_search_index', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS story_search_index_ai AFTER INSERT ON story_search_index BEGIN
+        INSERT INTO story_search_index_fts(rowid, data) VALUES (new.id, new.data);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS story_search_index_ad AFTER DELETE ON story_search_index BEGIN
+        INSERT INTO story_search_index_fts(story_search_index_fts, rowid, data) VALUES ('delete', old.id, old.data);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS story_search_index_au AFTER UPDATE ON story_search_index BEGIN
+        INSERT INTO story_search_index_fts(story_search_index_fts, rowid, data) VALUES ('delete', old.id, old.data);
+        INSERT INTO story_search_index_fts(rowid, data) VALUES (new.id, new.data);
+    END""",
+    "INSERT INTO story_search_index_fts(story_search_index_fts) VALUES ('rebuild')",
+]
+
+sqlite_rollback = [
+    "DROP TRIGGER IF EXISTS story_search_index_ai",
+    "DROP TRIGGER IF EXISTS story_search_index_ad",
+    "DROP TRIGGER IF EXISTS story_search_index_au",
+    "DROP TABLE IF EXISTS story_search_index_fts",
+]
+
+
+def is_sqlite(conn) -> bool:
+    return type(conn).__module__.startswith("sqlite3")
+
+
+def execute_all(conn, statements: list[str]):
+    cursor = conn.cursor()
+    for statement in statements:
+        cursor.execute(statement)
+
+
+def apply_step(conn):
+    execute_all(conn, sqlite_apply if is_sqlite(conn) else postgres_apply)
+
+
+def rollback_step(conn):
+    execute_all(conn, sqlite_rollback if is_sqlite(conn) else postgres_rollback)
+
+
+steps = [step(apply_step, rollback_step)]
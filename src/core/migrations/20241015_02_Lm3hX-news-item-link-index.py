@@ -0,0 +1,9 @@
+"""
+index news_item.link for the collector known item lookup
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_01_Rk7qP-story-search-fulltext"}
+
+steps = [step("CREATE INDEX IF NOT EXISTS ix_news_item_link ON news_item (link)", "DROP INDEX IF EXISTS ix_news_item_link")]
@@ -0,0 +1,29 @@
+"""
+indexed story.tlp_rank column with the effective TLP level of a story (0 clear ... 4 red), backfilled from the story TLP attribute
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_02_Lm3hX-news-item-link-index"}
+
+
+backfill = """
+UPDATE story SET tlp_rank = (
+    SELECT MAX(CASE news_item_attribute.value
+        WHEN 'clear' THEN 0
+        WHEN 'green' THEN 1
+        WHEN 'amber+strict' THEN 2
+        WHEN 'amber' THEN 3
+        WHEN 'red' THEN 4
+    END)
+    FROM story_news_item_attribute
+    JOIN news_item_attribute ON news_item_attribute.id = story_news_item_attribute.news_item_attribute_id
+    WHERE story_news_item_attribute.story_id = story.id AND news_item_attribute."key" = 'TLP'
+)
+"""
+
+steps = [
+    step("ALTER TABLE story ADD COLUMN tlp_rank INTEGER", "ALTER TABLE story DROP COLUMN tlp_rank"),
+    step("CREATE INDEX IF NOT EXISTS ix_story_tlp_rank ON story (tlp_rank)", "DROP INDEX IF EXISTS ix_story_tlp_rank"),
+    step(backfill),
+]
@@ -0,0 +1,14 @@
+"""
+dashboard_statistics table holding the precomputed dashboard snapshot
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_03_Tq8vN-story-tlp-rank"}
+
+steps = [
+    step(
+        "CREATE TABLE IF NOT EXISTS dashboard_statistics (id INTEGER PRIMARY KEY, data JSON, as_of TIMESTAMP)",
+        "DROP TABLE IF EXISTS dashboard_statistics",
+    )
+]
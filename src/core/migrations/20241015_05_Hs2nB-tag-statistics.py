@@ -0,0 +1,33 @@
+"""
+tag_statistics rollup of tag counts per (name, tag_type, day), backfilled from news_item_tag
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_04_Dv7wK-dashboard-statistics"}
+
+
+create_table = """
+CREATE TABLE IF NOT EXISTS tag_statistics (
+    name VARCHAR(255) NOT NULL,
+    tag_type VARCHAR(255) NOT NULL,
+    day DATE NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (name, tag_type, day)
+)
+"""
+
+backfill = """
+INSERT INTO tag_statistics (name, tag_type, day, count)
+SELECT news_item_tag.name, news_item_tag.tag_type, date(COALESCE(story.created, CURRENT_TIMESTAMP)), COUNT(*)
+FROM news_item_tag
+JOIN story ON story.id = news_item_tag.story_id
+WHERE news_item_tag.name IS NOT NULL AND news_item_tag.tag_type IS NOT NULL
+GROUP BY news_item_tag.name, news_item_tag.tag_type, date(COALESCE(story.created, CURRENT_TIMESTAMP))
+"""
+
+steps = [
+    step(create_table, "DROP TABLE IF EXISTS tag_statistics"),
+    step("CREATE INDEX IF NOT EXISTS ix_tag_statistics_day ON tag_statistics (day)", "DROP INDEX IF EXISTS ix_tag_statistics_day"),
+    step(backfill),
+]
@@ -0,0 +1,104 @@
+"""
+tag dictionary with a case-folded unique name_key, news_item_tag becomes a (story_id, tag_id) association
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_05_Hs2nB-tag-statistics"}
+
+
+rebuild_tag_statistics = [
+    "DELETE FROM tag_statistics",
+    """INSERT INTO tag_statistics (name, tag_type, day, count)
+    SELECT tag.name, tag.tag_type, date(COALESCE(story.created, CURRENT_TIMESTAMP)), COUNT(*)
+    FROM news_item_tag
+    JOIN tag ON tag.id = news_item_tag.tag_id
+    JOIN story ON story.id = news_item_tag.story_id
+    GROUP BY tag.name, tag.tag_type, date(COALESCE(story.created, CURRENT_TIMESTAMP))""",
+]
+
+
+def is_sqlite(conn) -> bool:
+    return type(conn).__module__.startswith("sqlite3")
+
+
+def execute_all(cursor, statements: list[str]):
+    for statement in statements:
+        cursor.execute(statement)
+
+
+def apply_step(conn):
+    sqlite = is_sqlite(conn)
+    param = "?" if sqlite else "%s"
+    cursor = conn.cursor()
+    execute_all(
+        cursor,
+        [
+            f"""CREATE TABLE IF NOT EXISTS tag (
+                id {"INTEGER" if sqlite else "SERIAL"} PRIMARY KEY,
+                name VARCHAR(255) NOT NULL,
+                tag_type VARCHAR(255) NOT NULL DEFAULT 'misc',
+                name_key VARCHAR(255) NOT NULL
+            )""",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_tag_name_key ON tag (name_key)",
+            "CREATE INDEX IF NOT EXISTS ix_tag_tag_type ON tag (tag_type)",
+        ],
+    )
+
+    # the spelling and type of the oldest tag wins for names that only differ in case
+    cursor.execute(
+        """SELECT news_item_tag.name, news_item_tag.tag_type, news_item_tag.id FROM news_item_tag
+        JOIN (SELECT MIN(id) AS id FROM news_item_tag WHERE name IS NOT NULL GROUP BY name) oldest ON oldest.id = news_item_tag.id
+        ORDER BY news_item_tag.id"""
+    )
+    names = cursor.fetchall()
+    tags = {}
+    for name, tag_type, _ in names:
+        tags.setdefault(name.casefold(), (name, tag_type or "misc"))
+    cursor.executemany(
+        f"INSERT INTO tag (name, tag_type, name_key) VALUES ({param}, {param}, {param})",
+        [(name, tag_type, key) for key, (name, tag_type) in tags.items()],
+    )
+    cursor.execute("SELECT name_key, id FROM tag")
+    tag_ids = dict(cursor.fetchall())
+
+    cursor.execute("CREATE TEMPORARY TABLE tag_name_map (name VARCHAR(255) PRIMARY KEY, tag_id INTEGER NOT NULL)")
+    cursor.executemany(
+        f"INSERT INTO tag_name_map (name, tag_id) VALUES ({param}, {param})", [(name, tag_ids[name.casefold()]) for name, _, _ in names]
+    )
+    execute_all(
+        cursor,
+        [
+            "ALTER TABLE news_item_tag ADD COLUMN tag_id INTEGER" + ("" if sqlite else " REFERENCES tag (id)"),
+            "UPDATE news_item_tag SET tag_id = (SELECT tag_id FROM tag_name_map WHERE tag_name_map.name = news_item_tag.name)",
+            "DROP TABLE tag_name_map",
+            """DELETE FROM news_item_tag WHERE tag_id IS NULL
+            OR id NOT IN (SELECT MIN(id) FROM news_item_tag WHERE tag_id IS NOT NULL GROUP BY story_id, tag_id)""",
+            "ALTER TABLE news_item_tag DROP COLUMN name",
+            "ALTER TABLE news_item_tag DROP COLUMN tag_type",
+            "CREATE UNIQUE INDEX IF NOT EXISTS ix_news_item_tag_story_tag ON news_item_tag (story_id, tag_id)",
+            "CREATE INDEX IF NOT EXISTS ix_news_item_tag_tag_id ON news_item_tag (tag_id)",
+            *rebuild_tag_statistics,
+        ],
+    )
+    if not sqlite:
+        cursor.execute("ALTER TABLE news_item_tag ALTER COLUMN tag_id SET NOT NULL")
+
+
+def rollback_step(conn):
+    execute_all(
+        conn.cursor(),
+        [
+            "ALTER TABLE news_item_tag ADD COLUMN name VARCHAR(255)",
+            "ALTER TABLE news_item_tag ADD COLUMN tag_type VARCHAR(255)",
+            "UPDATE news_item_tag SET name = (SELECT tag.name FROM tag WHERE tag.id = news_item_tag.tag_id), "
+            "tag_type = (SELECT tag.tag_type FROM tag WHERE tag.id = news_item_tag.tag_id)",
+            "DROP INDEX IF EXISTS ix_news_item_tag_story_tag",
+            "DROP INDEX IF EXISTS ix_news_item_tag_tag_id",
+            "ALTER TABLE news_item_tag DROP COLUMN tag_id",
+            "DROP TABLE IF EXISTS tag",
+        ],
+    )
+
+
+steps = [step(apply_step, rollback_step)]
@@ -0,0 +1,25 @@
+"""
+report_item_lock table shared by all core processes, replaces the in-memory lock registry of the SSE manager
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_06_Rk4pW-tag-dictionary"}
+
+
+create_table = """
+CREATE TABLE IF NOT EXISTS report_item_lock (
+    report_item_id VARCHAR(64) PRIMARY KEY REFERENCES report_item (id) ON DELETE CASCADE,
+    user_id INTEGER NOT NULL REFERENCES "user" (id) ON DELETE CASCADE,
+    lock_time TIMESTAMP NOT NULL,
+    expires TIMESTAMP NOT NULL
+)
+"""
+
+steps = [
+    step(create_table, "DROP TABLE IF EXISTS report_item_lock"),
+    step(
+        "CREATE INDEX IF NOT EXISTS ix_report_item_lock_expires ON report_item_lock (expires)",
+        "DROP INDEX IF EXISTS ix_report_item_lock_expires",
+    ),
+]
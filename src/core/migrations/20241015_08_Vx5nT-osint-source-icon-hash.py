@@ -0,0 +1,28 @@
+"""
+osint_source.icon_hash content hash of the icon, used in icon URLs and as ETag
+"""
+
+import hashlib
+from yoyo import step
+
+__depends__ = {"20241015_07_Lc3pQ-report-item-lock"}
+
+
+def is_sqlite(conn) -> bool:
+    return type(conn).__module__.startswith("sqlite3")
+
+
+def apply_step(conn):
+    param = "?" if is_sqlite(conn) else "%s"
+    cursor = conn.cursor()
+    cursor.execute("ALTER TABLE osint_source ADD COLUMN icon_hash VARCHAR(64)")
+    cursor.execute("SELECT id, icon FROM osint_source WHERE icon IS NOT NULL")
+    hashes = [(hashlib.sha256(bytes(icon)).hexdigest(), source_id) for source_id, icon in cursor.fetchall() if icon]
+    cursor.executemany(f"UPDATE osint_source SET icon_hash = {param} WHERE id = {param}", hashes)
+
+
+def rollback_step(conn):
+    conn.cursor().execute("ALTER TABLE osint_source DROP COLUMN icon_hash")
+
+
+steps = [step(apply_step, rollback_step)]
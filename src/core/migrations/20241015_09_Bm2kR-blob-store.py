@@ -0,0 +1,13 @@
+"""
+blob store keys for product renders and news item attribute binaries, inline data is moved by the admin blob maintenance
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_08_Vx5nT-osint-source-icon-hash"}
+
+
+steps = [
+    step("ALTER TABLE product ADD COLUMN render_hash VARCHAR(64)", "ALTER TABLE product DROP COLUMN render_hash"),
+    step("ALTER TABLE news_item_attribute ADD COLUMN binary_hash VARCHAR(64)", "ALTER TABLE news_item_attribute DROP COLUMN binary_hash"),
+]
@@ -0,0 +1,12 @@
+"""
+fingerprint of the data and template a product render was generated from
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_09_Bm2kR-blob-store"}
+
+
+steps = [
+    step("ALTER TABLE product ADD COLUMN render_fingerprint VARCHAR(64)", "ALTER TABLE product DROP COLUMN render_fingerprint"),
+]
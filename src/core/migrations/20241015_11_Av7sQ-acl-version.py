@@ -0,0 +1,16 @@
+"""
+acl_version counter shared by all core processes, bumped with every ACL change to invalidate in-process ACL caches
+"""
+
+from yoyo import step
+
+__depends__ = {"20241015_10_Rf8tW-product-render-fingerprint"}
+
+
+steps = [
+    step(
+        "CREATE TABLE IF NOT EXISTS acl_version (id INTEGER PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)",
+        "DROP TABLE IF EXISTS acl_version",
+    ),
+    step("INSERT INTO acl_version (id, version) VALUES (1, 0)"),
+]
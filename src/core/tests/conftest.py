@@ -1,6 +1,8 @@
 import os
 import sys
+import shutil
 import pytest
+import tempfile
 from dotenv import load_dotenv
 from sqlalchemy.orm import scoped_session, sessionmaker
 
@@ -12,6 +14,8 @@ if not current_path.endswith("src/core"):
     sys.exit("Tests must be run from within src/core")
 
 load_dotenv(dotenv_path=env_file, override=True)
+# blobs written by tests must not end up in the data folder of the working tree
+blob_folder = os.environ.setdefault("BLOB_FOLDER", tempfile.mkdtemp(prefix="taranis_blobs_"))
 
 
 @pytest.fixture(scope="session")
@@ -29,6 +33,9 @@ def app():
 
     yield app
 
+    if blob_folder.startswith(tempfile.gettempdir()):
+        shutil.rmtree(blob_folder, ignore_errors=True)
+
 
 @pytest.fixture(scope="session")
 def client(app):
@@ -77,6 +84,24 @@ def session(db, request):
     return db.session
 
 
+@pytest.fixture
+def query_counter(app):
+    """Collects the SQL statements executed during a test"""
+    from sqlalchemy import event
+    from core.managers.db_manager import db
+
+    statements = []
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count_statement)
+    yield statements
+    event.remove(engine, "before_cursor_execute", count_statement)
+
+
 @pytest.fixture(scope="session")
 def access_token(app):
     from flask_jwt_extended import create_access_token
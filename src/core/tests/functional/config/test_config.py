@@ -177,6 +177,22 @@ class TestUserConfigApi(BaseTest):
         assert response.json["items"][0]["id"] == user_id
         assert "password" not in response.json["items"][0]
 
+    def test_modify_user_permissions_acl_version(self, client, auth_header, cleanup_user):
+        """
+        This test changes the name and then the permissions of a user.
+        It expects only the permission change to bump the shared ACL version, cached principals of other processes depend on it
+        """
+        from core.model.role_based_access import ACLVersion
+
+        user_id = cleanup_user["id"]
+        version = ACLVersion.get_version()
+        self.assert_put_ok(client, uri=f"users/{user_id}", json_data={"name": "Testy McTestFace"}, auth_header=auth_header)
+        ACLVersion.forget()
+        assert ACLVersion.get_version() == version
+        self.assert_put_ok(client, uri=f"users/{user_id}", json_data={"permissions": ["ANALYZE_ACCESS"]}, auth_header=auth_header)
+        ACLVersion.forget()
+        assert ACLVersion.get_version() == version + 1
+
     def test_delete_user(self, client, auth_header, cleanup_user):
         user_id = cleanup_user["id"]
         response = self.assert_delete_ok(client, uri=f"users/{user_id}", auth_header=auth_header)
@@ -374,6 +390,56 @@ class TestAcls(BaseTest):
         response = self.assert_delete_ok(client, uri=f"acls/{acl_id}", auth_header=auth_header)
         assert response.json["message"] == f"RoleBasedAccess {acl_id} deleted"
 
+    def test_acl_snapshot(self, client, auth_header):
+        """
+        This test creates, changes and deletes an ACL for the admin roles.
+        It expects the cached ACL snapshot of the admin to follow every change
+        """
+        from core.model.user import User
+        from core.service.role_based_access import RoleBasedAccessService
+
+        user = User.find_by_name("admin")
+        acl = {"id": 43, "name": "test_acl_snapshot", "description": "", "item_type": "word_list", "item_id": "snapshot_id"}
+        self.assert_post_ok(client, uri="acls", json_data=acl | {"roles": user.get_roles()}, auth_header=auth_header)
+        snapshot = RoleBasedAccessService.get_acl_snapshot(user)
+        assert snapshot.has_access("word_list", "snapshot_id")
+        assert not snapshot.has_access("word_list", "snapshot_id", require_write_access=True)
+        assert not snapshot.has_access("word_list", "other_id")
+        assert RoleBasedAccessService.get_acl_snapshot(user) is snapshot
+
+        self.assert_put_ok(client, uri="acls/43", json_data={"read_only": False}, auth_header=auth_header)
+        assert RoleBasedAccessService.get_acl_snapshot(user).has_access("word_list", "snapshot_id", require_write_access=True)
+
+        self.assert_delete_ok(client, uri="acls/43", auth_header=auth_header)
+        assert RoleBasedAccessService.get_acl_snapshot(user).has_access("word_list", "other_id")
+
+    def test_acl_version_shared(self, client, auth_header, monkeypatch):
+        """
+        This test changes the shared ACL version in the database behind the back of the process and lets the snapshot TTL expire.
+        It expects a new ACL snapshot in both cases
+        """
+        from core.config import Config
+        from core.managers.db_manager import db
+        from core.model.user import User
+        from core.model.role_based_access import ACLVersion
+        from core.service.role_based_access import RoleBasedAccessService
+
+        user = User.find_by_name("admin")
+        version = ACLVersion.get_version()
+        acl = {"id": 44, "name": "test_acl_version", "description": "", "item_type": "word_list", "item_id": "version_id"}
+        self.assert_post_ok(client, uri="acls", json_data=acl | {"roles": user.get_roles()}, auth_header=auth_header)
+        self.assert_delete_ok(client, uri="acls/44", auth_header=auth_header)
+        assert ACLVersion.get_version() == version + 2
+
+        snapshot = RoleBasedAccessService.get_acl_snapshot(user)
+        db.session.execute(db.text("UPDATE acl_version SET version = version + 1"))
+        db.session.commit()
+        ACLVersion.forget()  # the version is read once per request
+        monkeypatch.setattr(Config, "ACL_CACHE_TTL", 0)
+        fresh = RoleBasedAccessService.get_acl_snapshot(user)
+        assert fresh is not snapshot
+        assert RoleBasedAccessService.get_acl_snapshot(user) is not fresh
+
 
 class TestPublisherPreset(BaseTest):
     base_uri = "/api/config"
@@ -68,6 +68,41 @@ class TestAnalyzeApi(BaseTest):
 
         assert "Successfully updated Report Item" in response_data.get("message"), "The update operation should return a success message."
 
+    def test_report_item_lock(self, app, client, auth_header, auth_header_user_permissions, cleanup_report_item):
+        """
+        PUT to /api/analyze/report-items/<report_id>/lock and /unlock as two different users.
+        It expects only one holder at a time, renewals by the holder and takeover of an expired lock
+        """
+        from datetime import datetime, timedelta
+        from core.managers.db_manager import db
+        from core.model.report_item import ReportItemLock
+
+        report_id = cleanup_report_item["id"]
+        locked = self.assert_put_ok(client, f"report-items/{report_id}/lock", {}, auth_header).get_json()
+        assert locked["locked"] is True
+
+        response = client.put(f"{self.base_uri}/report-items/{report_id}/lock", json={}, headers=auth_header_user_permissions)
+        assert response.status_code == 409
+        assert response.get_json()["user_id"] == locked["user_id"]
+        response = client.put(f"{self.base_uri}/report-items/{report_id}/unlock", json={}, headers=auth_header_user_permissions)
+        assert response.status_code == 409
+
+        renewed = self.assert_put_ok(client, f"report-items/{report_id}/lock", {}, auth_header).get_json()
+        assert renewed["lock_time"] == locked["lock_time"]
+        assert renewed["expires"] >= locked["expires"]
+        assert self.assert_get_ok(client, f"report-items/{report_id}/locks", auth_header).get_json() == renewed
+
+        with app.app_context():
+            lock = db.session.get(ReportItemLock, report_id)
+            lock.expires = datetime.now() - timedelta(seconds=1)
+            db.session.commit()
+        assert self.assert_get_ok(client, f"report-items/{report_id}/locks", auth_header).get_json()["locked"] is False
+
+        taken = self.assert_put_ok(client, f"report-items/{report_id}/lock", {}, auth_header_user_permissions).get_json()
+        assert taken["user_id"] != locked["user_id"]
+        unlocked = self.assert_put_ok(client, f"report-items/{report_id}/unlock", {}, auth_header_user_permissions).get_json()
+        assert unlocked == {"report_item_id": report_id, "locked": False}
+
     def test_delete_report(self, client, auth_header, cleanup_report_item):
         """
         DELETE to /api/analyze/report-items/<report_id> endpoint to remove a report.
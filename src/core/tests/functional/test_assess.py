@@ -24,6 +24,38 @@ class TestAssessApi(BaseTest):
         item_ids = [item["id"] for item in items]
         assert "manual" in item_ids
 
+    def test_osint_source_icon(self, client, fake_source, auth_header, api_header):
+        """
+        This test uploads an icon for a source and loads it through the icon URL of the source list.
+        It expects no inline icon data, an immutable response with a strong ETag, 304 on revalidation and a redirect for stale URLs
+        """
+        import io
+
+        icon = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+        upload = client.put(
+            f"/api/worker/osint-sources/{fake_source}/icon",
+            data={"file": (io.BytesIO(icon), "icon.png")},
+            headers={"Authorization": api_header["Authorization"]},
+        )
+        assert upload.status_code == 200
+
+        items = self.assert_get_ok(client, "osint-sources-list", auth_header).get_json()["items"]
+        source = next(item for item in items if item["id"] == fake_source)
+        assert "icon" not in source
+        icon_url = source["icon_url"]
+
+        response = client.get(f"/api{icon_url}")
+        assert response.status_code == 200
+        assert response.data == icon
+        assert response.mimetype == "image/png"
+        assert response.headers["ETag"] == f'"{icon_url.rsplit("/", 1)[1]}"'
+        assert "immutable" in response.headers["Cache-Control"]
+
+        assert client.get(f"/api{icon_url}", headers={"If-None-Match": response.headers["ETag"]}).status_code == 304
+        stale = client.get(f"/api/assess/osint-sources/{fake_source}/icon/outdated")
+        assert stale.status_code == 302
+        assert stale.headers["Location"].endswith(icon_url)
+
     def test_post_AddNewsItem_auth(self, client, cleanup_news_item, auth_header):
         """
         This test queries the AddNewsItem authenticated.
@@ -76,6 +108,318 @@ class TestAssessApi(BaseTest):
         response = client.get("/api/assess/stories?limit=1", headers=auth_header)
         assert len(response.get_json()["items"]) == 1
 
+    def test_get_stories_query_count(self, client, stories, auth_header, query_counter, monkeypatch):
+        """
+        This test queries story pages of different sizes with the response cache disabled.
+        It expects the number of SQL statements not to grow with the page size
+        """
+        from core.config import Config
+
+        monkeypatch.setattr(Config, "RESPONSE_CACHE_TIMEOUT", 0)
+        client.get("/api/assess/stories?limit=3", headers=auth_header)
+        query_counter.clear()
+
+        client.get("/api/assess/stories?limit=1", headers=auth_header)
+        single_page_queries = len(query_counter)
+        query_counter.clear()
+
+        response = client.get("/api/assess/stories?limit=3", headers=auth_header)
+        assert len(response.get_json()["items"]) > 1
+        assert len(query_counter) == single_page_queries
+
+    def test_get_stories_cursor(self, client, stories, auth_header):
+        """
+        This test pages through the stories with cursors.
+        It expects the same stories in the same order as offset paging
+        """
+        for sort in ["date_desc", "date_asc", "relevance_desc", "updated_asc"]:
+            offset_ids = [item["id"] for item in client.get(f"/api/assess/stories?sort={sort}", headers=auth_header).get_json()["items"]]
+
+            cursor_ids = []
+            response = client.get(f"/api/assess/stories?sort={sort}&limit=1", headers=auth_header).get_json()
+            while True:
+                cursor_ids.extend(item["id"] for item in response["items"])
+                if "next_cursor" not in response:
+                    break
+                response = client.get(f"/api/assess/stories?sort={sort}&limit=1&cursor={response['next_cursor']}", headers=auth_header)
+                if response.status_code == 404:
+                    break
+                response = response.get_json()
+
+            assert cursor_ids == offset_ids
+
+        response = client.get("/api/assess/stories?cursor=invalid", headers=auth_header)
+        assert response.status_code == 400
+
+    def test_get_stories_count_cache(self, client, stories, auth_header, monkeypatch):
+        """
+        This test changes a story between two cached count requests.
+        It expects the cached total_count to be invalidated
+        """
+        from core.config import Config
+
+        monkeypatch.setattr(Config, "CACHE_TYPE", "RedisCache")
+        response = client.get("/api/assess/stories?read=false", headers=auth_header).get_json()
+        unread_count = response["total_count"]
+        assert response["total_count_exact"] is True
+
+        client.put(f"/api/assess/story/{stories[0]}", json={"read": True}, headers=auth_header)
+        response = client.get("/api/assess/stories?read=false", headers=auth_header).get_json()
+        assert response["total_count"] == unread_count - 1
+
+        client.put(f"/api/assess/story/{stories[0]}", json={"read": False}, headers=auth_header)
+        response = client.get("/api/assess/stories?read=false", headers=auth_header).get_json()
+        assert response["total_count"] == unread_count
+
+    def test_get_stories_estimated_count(self, stories, monkeypatch):
+        """
+        This test requests an estimated count above COUNT_ESTIMATE_THRESHOLD and an exact count for the same filter.
+        It expects the estimate to skip the exact COUNT and both results to be cached separately with a shared cache
+        """
+        from core.config import Config
+        from core.model.story import Story
+
+        exact_counts = []
+        filtered_count = Story.get_filtered_count
+        monkeypatch.setattr(Config, "CACHE_TYPE", "RedisCache")
+        monkeypatch.setattr(Config, "COUNT_ESTIMATE_THRESHOLD", 1000)
+        monkeypatch.setattr(Story, "get_estimated_count", classmethod(lambda cls, query: 5000))
+        monkeypatch.setattr(Story, "get_filtered_count", classmethod(lambda cls, query: exact_counts.append(query) or filtered_count(query)))
+
+        assert Story.get_total_count({"search": "estimate", "estimate_count": "true"}) == (5000, False)
+        assert exact_counts == []
+        assert Story.get_total_count({"search": "estimate"}) == (0, True)
+        assert len(exact_counts) == 1
+        assert Story.get_total_count({"search": "estimate", "estimate_count": "true"}) == (5000, False)
+
+    def test_get_estimated_count_postgres_statement(self, stories, monkeypatch):
+        """
+        This test requests a planner estimate for a source filter on a PostgreSQL connection.
+        It expects the EXPLAIN statement to contain the expanded IN list instead of POSTCOMPILE placeholders
+        """
+        from types import SimpleNamespace
+        from sqlalchemy.dialects import postgresql
+        from core.managers.db_manager import db
+        from core.model.story import Story
+
+        statements = []
+
+        def exec_driver_sql(statement, params):
+            statements.append((statement, params))
+            return SimpleNamespace(scalar=lambda: [{"Plan": {"Plan Rows": 42}}])
+
+        connection = SimpleNamespace(dialect=postgresql.psycopg2.dialect(), exec_driver_sql=exec_driver_sql)
+        monkeypatch.setattr(db.session, "connection", lambda: connection)
+        query = Story.get_filter_query_with_acl({"source": ["1", "2"]}, None)
+
+        assert Story.get_estimated_count(query) == 42
+        statement, params = statements[0]
+        assert statement.startswith("EXPLAIN (FORMAT JSON) ")
+        assert "POSTCOMPILE" not in statement
+        assert {"1", "2"} <= set(params.values())
+
+    def test_count_cache_key_acl_version(self, stories):
+        """
+        This test builds the count cache key for the same filter before and after an ACL change.
+        It expects a different key, cached counts must not outlive permission changes
+        """
+        from core.managers.cache_manager import invalidate
+        from core.model.role_based_access import ACL_CACHE_NAMESPACE
+        from core.model.story import Story
+
+        cache_key = Story._get_count_cache_key({"read": "false"}, None)
+        assert Story._get_count_cache_key({"read": "false"}, None) == cache_key
+        invalidate(ACL_CACHE_NAMESPACE)
+        assert Story._get_count_cache_key({"read": "false"}, None) != cache_key
+
+    def test_response_cache(self, client, stories, auth_header, auth_header_user_permissions, query_counter, monkeypatch):
+        """
+        This test repeats story and OSINT source list requests around a story update and for a second user.
+        It expects repeated requests to be served without SQL, an update to invalidate the story list and separate entries per user
+        """
+        from core.config import Config
+
+        # the test client runs in a single process, so the local cache stands in for a shared backend
+        monkeypatch.setattr(Config, "CACHE_TYPE", "RedisCache")
+        uri = "/api/assess/stories?read=false&limit=5"
+        unread = client.get(uri, headers=auth_header).get_json()["total_count"]
+        client.get("/api/assess/osint-sources-list", headers=auth_header)
+        query_counter.clear()
+        assert client.get(uri, headers=auth_header).get_json()["total_count"] == unread
+        assert client.get("/api/assess/osint-sources-list", headers=auth_header).status_code == 200
+        assert not [statement for statement in query_counter if "story" in statement or "osint_source" in statement]
+
+        client.put(f"/api/assess/story/{stories[0]}", json={"read": True}, headers=auth_header)
+        query_counter.clear()
+        assert client.get(uri, headers=auth_header).get_json()["total_count"] == unread - 1
+        assert [statement for statement in query_counter if "story" in statement]
+
+        query_counter.clear()
+        client.get(uri, headers=auth_header_user_permissions)
+        assert [statement for statement in query_counter if "story" in statement]
+        client.put(f"/api/assess/story/{stories[0]}", json={"read": False}, headers=auth_header)
+
+    def test_response_cache_local_backend(self, client, stories, auth_header, query_counter):
+        """
+        This test repeats an OSINT source list request with the default per-process SimpleCache.
+        It expects the response cache to stay disabled, other workers could not invalidate its entries
+        """
+        client.get("/api/assess/osint-sources-list", headers=auth_header)
+        query_counter.clear()
+        assert client.get("/api/assess/osint-sources-list", headers=auth_header).status_code == 200
+        assert [statement for statement in query_counter if "osint_source" in statement]
+
+    def test_search_stories(self, client, stories, auth_header):
+        """
+        This test queries the stories with full text search.
+        It expects token, prefix and phrase matches and ranked results
+        """
+        response = client.get("/api/assess/stories?search=congress", headers=auth_header)
+        assert response.get_json()["total_count"] == 1
+
+        response = client.get("/api/assess/stories?search=congr", headers=auth_header)
+        assert response.status_code == 404
+
+        response = client.get("/api/assess/stories?search=congr*", headers=auth_header)
+        assert response.get_json()["total_count"] == 1
+
+        response = client.get('/api/assess/stories?search="world congress"', headers=auth_header)
+        assert response.get_json()["total_count"] == 1
+
+        response = client.get('/api/assess/stories?search="congress world"', headers=auth_header)
+        assert response.status_code == 404
+
+        response = client.get("/api/assess/stories?search=test content&sort=search_rank", headers=auth_header)
+        assert response.get_json()["total_count"] == 2
+
+    def test_search_stories_identifiers(self, client, fake_source, auth_header):
+        """
+        This test adds a story mentioning a CVE ID, a domain and an IP address and searches for them.
+        It expects the identifiers to be found as written, also as prefix
+        """
+        from core.model.story import Story
+
+        news_items = [
+            {
+                "title": "Identifier Item",
+                "content": "CVE-2024-1234 exploited from 192.0.2.17 against example.com",
+                "source": "https://url",
+                "osint_source_id": fake_source,
+            }
+        ]
+        story_id = Story.add_news_items(news_items)[0]["ids"][0]
+
+        for search in ["CVE-2024-1234", "cve-2024*", "example.com", "192.0.2.17", "exploited example.com"]:
+            response = client.get(f"/api/assess/stories?search={search}", headers=auth_header)
+            assert [item["id"] for item in response.get_json()["items"]] == [story_id]
+
+        response = client.get("/api/assess/stories?search=CVE-2024-9999", headers=auth_header)
+        assert response.status_code == 404
+
+        client.delete(f"/api/assess/story/{story_id}", headers=auth_header)
+
+    def test_parse_search(self):
+        from core.service.story_search import parse_search
+
+        terms = parse_search('"World Congress" cve-2020-1234 bsi*')
+        assert [term.tokens for term in terms] == [["world", "congress"], ["cve", "2020", "1234"], ["bsi"]]
+        assert [term.prefix for term in terms] == [False, False, True]
+
+    def test_postgres_tsquery(self):
+        from sqlalchemy.dialects import postgresql
+        from core.service.story_search import PostgresSearchBackend, parse_search
+
+        ts_query = PostgresSearchBackend().to_tsquery(parse_search("example.com cve-2024*"))
+        compiled = ts_query.compile(dialect=postgresql.dialect())
+        assert str(compiled).startswith("phraseto_tsquery(") and " && " in str(compiled)
+        assert {"example.com", "cve-2024", ":*"} <= set(compiled.params.values())
+
+    def test_group_and_ungroup_stories(self, client, fake_source, auth_header, query_counter):
+        """
+        This test groups stories, removes a news item from the group and ungroups the rest.
+        It expects merged news items, tags and search index and a number of SQL statements independent of the group size
+        """
+        from core.model.story import Story
+
+        news_items = [
+            {"title": f"Grouping Item {word}", "content": f"grouping {word}", "source": "https://url", "osint_source_id": fake_source}
+            for word in ["alpha", "bravo", "charlie", "delta", "echo"]
+        ]
+        story_ids = Story.add_news_items(news_items)[0]["ids"]
+        Story.update_tags(story_ids[0], ["grouping", "alpha"])
+        Story.update_tags(story_ids[1], ["grouping", "bravo"])
+        Story.update_tags(story_ids[3], ["grouping"])
+        Story.update_tags(story_ids[4], ["grouping", "echo"])
+
+        query_counter.clear()
+        response = self.assert_put_ok(client, "stories/group", story_ids[3:5], auth_header)
+        small_group_queries = len(query_counter)
+        query_counter.clear()
+        response = self.assert_put_ok(client, "stories/group", story_ids[:3], auth_header)
+        assert len(query_counter) == small_group_queries
+        assert response.get_json()["id"] == story_ids[0]
+
+        grouped = client.get(f"/api/assess/story/{story_ids[0]}", headers=auth_header).get_json()
+        assert len(grouped["news_items"]) == 3
+        assert sorted(tag["name"] for tag in grouped["tags"]) == ["alpha", "bravo", "grouping"]
+        assert client.get(f"/api/assess/story/{story_ids[1]}", headers=auth_header).status_code == 404
+        response = client.get("/api/assess/stories?search=charlie", headers=auth_header).get_json()
+        assert [item["id"] for item in response["items"]] == [story_ids[0]]
+
+        charlie_id = next(item["id"] for item in grouped["news_items"] if item["title"].endswith("charlie"))
+        self.assert_put_ok(client, "news-items/ungroup", [charlie_id], auth_header)
+        assert len(client.get(f"/api/assess/story/{story_ids[0]}", headers=auth_header).get_json()["news_items"]) == 2
+
+        self.assert_put_ok(client, "stories/ungroup", [story_ids[0], story_ids[3]], auth_header)
+        assert client.get(f"/api/assess/story/{story_ids[0]}", headers=auth_header).status_code == 404
+        response = client.get("/api/assess/stories?search=grouping", headers=auth_header).get_json()
+        assert response["total_count"] == 5
+
+        for item in response["items"]:
+            client.delete(f"/api/assess/story/{item['id']}", headers=auth_header)
+
+    def test_story_tlp_filter(self, client, fake_source, auth_header):
+        """
+        This test adds stories with different TLP levels and queries them as a user limited to TLP:GREEN.
+        It expects only stories up to green and a TLP rank that follows grouping
+        """
+        from core.managers.db_manager import db
+        from core.model.story import Story
+        from core.model.user import User
+        from core.model.role import TLPLevel
+
+        news_items = [
+            {
+                "title": f"TLP Item {tlp}",
+                "content": "tlpfilter",
+                "source": "https://url",
+                "osint_source_id": fake_source,
+                "attributes": [{"key": "TLP", "value": tlp}],
+            }
+            for tlp in ["clear", "green", "amber", "red"]
+        ]
+        story_ids = Story.add_news_items(news_items)[0]["ids"]
+        assert [Story.get(story_id).tlp_rank for story_id in story_ids] == [0, 1, 3, 4]
+
+        user = User.find_by_name("user")
+        role = user.roles[0]
+        previous_tlp_level = role.tlp_level
+        role.tlp_level = TLPLevel.GREEN
+        db.session.commit()
+        try:
+            stories, _ = Story.get_by_filter({"search": "tlpfilter"}, user)
+            assert {story.id for story in stories} == set(story_ids[:2])
+
+            self.assert_put_ok(client, "stories/group", [story_ids[1], story_ids[2]], auth_header)
+            assert Story.get(story_ids[1]).tlp_rank == TLPLevel.AMBER.rank
+            stories, _ = Story.get_by_filter({"search": "tlpfilter"}, user)
+            assert [story.id for story in stories] == [story_ids[0]]
+        finally:
+            role.tlp_level = previous_tlp_level
+            db.session.commit()
+            for story_id in [story_ids[0], story_ids[1], story_ids[3]]:
+                client.delete(f"/api/assess/story/{story_id}", headers=auth_header)
+
     def test_get_NewsItem_auth(self, client, stories, auth_header):
         """
         This test queries the NewsItems Authenticated.
@@ -119,3 +463,96 @@ class TestAssessApi(BaseTest):
         assert len(response.get_json()) == 1
         response = client.get("/api/assess/tags?offset=1&min_size=1", headers=auth_header)
         assert len(response.get_json()) == 2
+
+    def assert_tag_statistics_match(self):
+        from core.managers.db_manager import db
+        from core.model.story import Story
+        from core.model.news_item_tag import NewsItemTag, Tag, TagStatistics
+
+        day = db.func.date(Story.created)
+        counted = (
+            db.select(Tag.name, Tag.tag_type, day, db.func.count())
+            .select_from(NewsItemTag)
+            .join(Tag)
+            .join(Story)
+            .group_by(Tag.name, Tag.tag_type, day)
+        )
+        expected = {(name, tag_type, str(day)): count for name, tag_type, day, count in db.session.execute(counted)}
+        rollup = db.select(TagStatistics.name, TagStatistics.tag_type, TagStatistics.day, TagStatistics.count)
+        assert {(name, tag_type, str(day)): count for name, tag_type, day, count in db.session.execute(rollup)} == expected
+
+    def test_tag_statistics(self, client, fake_source, auth_header):
+        """
+        This test tags, groups, resets and deletes stories created on different days.
+        It expects the tag statistics rollup to match the tags and the dashboard to read it
+        """
+        from datetime import datetime, timedelta
+        from core.managers.db_manager import db
+        from core.model.story import Story
+
+        news_items = [
+            {"title": f"Rollup Item {word}", "content": f"rollup {word}", "source": "https://url", "osint_source_id": fake_source}
+            for word in ["alpha", "bravo", "charlie"]
+        ]
+        story_ids = Story.add_news_items(news_items)[0]["ids"]
+        Story.get(story_ids[1]).created = datetime.now() - timedelta(days=3)
+        db.session.commit()
+        Story.update_tags(story_ids[0], {"rollup": {"tag_type": "rollup-type"}, "rollup-alpha": {"tag_type": "rollup-type"}})
+        Story.update_tags(story_ids[1], {"rollup": {"tag_type": "rollup-type"}, "rollup-bravo": {"tag_type": "rollup-type"}})
+        Story.update_tags(story_ids[2], {"rollup": {"tag_type": "rollup-type"}})
+        self.assert_tag_statistics_match()
+
+        trending = client.get("/api/dashboard/trending-clusters?days=1", headers=auth_header).get_json()
+        assert trending["rollup-type"]["size"] == 5
+        assert trending["rollup-type"]["tags"] == {
+            "rollup": {"name": "rollup", "size": 2},
+            "rollup-alpha": {"name": "rollup-alpha", "size": 1},
+        }
+        cluster = client.get("/api/dashboard/cluster/rollup-type", headers=auth_header).get_json()
+        assert cluster["items"][0] == {"name": "rollup", "size": 3}
+
+        Story.get(story_ids[2]).created = datetime.now() - timedelta(days=5)
+        db.session.commit()
+        self.assert_tag_statistics_match()
+        self.assert_put_ok(client, "stories/group", [story_ids[0], story_ids[1]], auth_header)
+        self.assert_tag_statistics_match()
+        Story.reset_tags(story_ids[2])
+        self.assert_tag_statistics_match()
+
+        client.delete(f"/api/assess/story/{story_ids[0]}", headers=auth_header)
+        client.delete(f"/api/assess/story/{story_ids[2]}", headers=auth_header)
+        self.assert_tag_statistics_match()
+        assert "rollup-type" not in client.get("/api/dashboard/trending-clusters", headers=auth_header).get_json()
+
+    def test_filter_stories_by_tags(self, client, fake_source, auth_header):
+        """
+        This test tags stories with differently cased names.
+        It expects one shared dictionary entry per name and multi tag filters to match stories carrying all tags
+        """
+        from core.model.story import Story
+        from core.model.news_item_tag import Tag
+
+        news_items = [
+            {"title": f"Tagged Item {word}", "content": f"tagged {word}", "source": "https://url", "osint_source_id": fake_source}
+            for word in ["delta", "echo"]
+        ]
+        story_ids = Story.add_news_items(news_items)[0]["ids"]
+        Story.update_tags(story_ids[0], {"Vienna": {"tag_type": "LOC"}, "Falcon": {"tag_type": "misc"}})
+        Story.update_tags(story_ids[1], ["vienna", "VIENNA", "Falcon"])
+        Story.update_tags(story_ids[1], {"Kraken": {"tag_type": "APT"}})
+
+        assert Tag.find_by_name("VIENNA").to_dict() == {"name": "Vienna", "tag_type": "LOC"}
+        assert [tag.to_dict() for tag in Story.get(story_ids[1]).tags] == [
+            {"name": "Vienna", "tag_type": "LOC"},
+            {"name": "Falcon", "tag_type": "misc"},
+            {"name": "Kraken", "tag_type": "APT"},
+        ]
+
+        def filtered(query: str) -> set[str]:
+            response = client.get(f"/api/assess/stories?{query}", headers=auth_header)
+            return {story["id"] for story in response.get_json()["items"]}
+
+        assert filtered("tags=vienna&tags=falcon") == set(story_ids)
+        assert filtered("tags=Vienna&tags=Kraken") == {story_ids[1]}
+        assert filtered("tags=LOC&tags=APT") == {story_ids[1]}
+        assert filtered("tags=Vienna&tags=unknown") == set()
@@ -20,3 +20,57 @@ class TestPublishApi(BaseTest):
         response = self.assert_get_ok(client, "products", auth_header)
         assert response.get_json()["total_count"] == 1
         assert response.get_json()["items"][0]["title"] == cleanup_product["title"]
+
+    def test_product_render(self, client, auth_header, api_header, cleanup_product):
+        """
+        This test uploads a render through the worker API and fetches it from /api/publish/products/<id>/render.
+        It expects the raw bytes from the blob store with an ETag and support for Range and conditional requests
+        """
+        from core.model.product import Product
+
+        render = b"Rendered product " * 100
+        response = client.put(
+            f"/api/worker/products/{cleanup_product['id']}", data=render, headers=api_header | {"Content-type": "text/plain"}
+        )
+        assert response.status_code == 200
+
+        response = client.get(f"{self.base_uri}/products/{cleanup_product['id']}/render", headers=auth_header)
+        assert response.status_code == 200
+        assert response.data == render
+        assert response.headers["Content-Type"] == "text/plain"
+        etag = response.headers["ETag"]
+
+        response = client.get(f"{self.base_uri}/products/{cleanup_product['id']}/render", headers=auth_header | {"Range": "bytes=0-7"})
+        assert response.status_code == 206
+        assert response.data == render[:8]
+
+        response = client.get(f"{self.base_uri}/products/{cleanup_product['id']}/render", headers=auth_header | {"If-None-Match": etag})
+        assert response.status_code == 304
+
+        product = Product.get(cleanup_product["id"])
+        assert product.render_result is None
+        assert product.render_hash == etag.strip('"')
+
+    def test_product_render_fingerprint(self, client, auth_header, api_header, cleanup_product):
+        """
+        This test uploads a render with the fingerprint from /api/worker/products/<id>.
+        It expects the fingerprint to be stored with the render and to change once the product changes
+        """
+        product = client.get(f"/api/worker/products/{cleanup_product['id']}", headers=api_header).get_json()
+        assert product["fingerprint"]
+        assert product["render_fingerprint"] != product["fingerprint"]
+
+        response = client.put(
+            f"/api/worker/products/{cleanup_product['id']}",
+            data=b"Rendered product",
+            headers=api_header | {"Content-type": "text/plain", "X-Render-Fingerprint": product["fingerprint"]},
+        )
+        assert response.status_code == 200
+        unchanged = client.get(f"/api/worker/products/{cleanup_product['id']}", headers=api_header).get_json()
+        assert unchanged["render_fingerprint"] == unchanged["fingerprint"] == product["fingerprint"]
+
+        response = client.put(f"{self.base_uri}/products/{cleanup_product['id']}", json={"title": "Changed Product"}, headers=auth_header)
+        assert response.status_code == 200
+        changed = client.get(f"/api/worker/products/{cleanup_product['id']}", headers=api_header).get_json()
+        assert changed["fingerprint"] != product["fingerprint"]
+        assert changed["render_fingerprint"] == product["fingerprint"]
@@ -0,0 +1,223 @@
+from tests.functional.helpers import BaseTest
+
+
+class TestWorkerApi(BaseTest):
+    base_uri = "/api/worker"
+
+    def make_news_items(self, source_id: str, prefix: str, count: int) -> list[dict]:
+        return [
+            {
+                "title": f"{prefix} News Item {i}",
+                "content": f"{prefix} content {i}",
+                "source": "https://url/feed.xml",
+                "link": f"https://url/{prefix}/{i}",
+                "osint_source_id": source_id,
+                "attributes": [{"key": "TLP", "value": "amber"}],
+            }
+            for i in range(count)
+        ]
+
+    def test_add_news_items(self, client, stories, news_items, fake_source, api_header, auth_header, query_counter):
+        """
+        This test adds a batch of news items with duplicates and invalid items.
+        It expects one result per item and a number of SQL statements independent of the batch size
+        """
+        batch = self.make_news_items(fake_source, "Batch", 2)
+        batch += [batch[0], news_items[0], {"source": "empty"}]
+
+        response = self.assert_post_ok(client, "news-items", batch, api_header)
+        results = response.get_json()["results"]
+        assert [result["status"] for result in results] == ["added", "added", "duplicate", "duplicate", "invalid"]
+        assert response.get_json()["ids"] == [results[0]["id"], results[1]["id"]]
+
+        story = client.get(f"/api/assess/story/{results[0]['id']}", headers=auth_header).get_json()
+        assert {"key": "TLP", "value": "amber"} in [{"key": a["key"], "value": a["value"]} for a in story["attributes"]]
+        response = client.get("/api/assess/stories?search=batch", headers=auth_header)
+        assert response.get_json()["total_count"] == 2
+
+        query_counter.clear()
+        small_ids = self.assert_post_ok(client, "news-items", self.make_news_items(fake_source, "Small", 2), api_header).get_json()["ids"]
+        small_batch_queries = len(query_counter)
+        query_counter.clear()
+        large_ids = self.assert_post_ok(client, "news-items", self.make_news_items(fake_source, "Large", 10), api_header).get_json()["ids"]
+        assert len(large_ids) == 10
+        assert len(query_counter) == small_batch_queries
+
+        for story_id in [results[0]["id"], results[1]["id"], *small_ids, *large_ids]:
+            client.delete(f"/api/assess/story/{story_id}", headers=auth_header)
+
+    def test_unknown_news_items(self, client, stories, news_items, api_header):
+        """
+        This test posts known and new hashes and links.
+        It expects only the new ones back
+        """
+        known = news_items[0]
+        request_data = {"hashes": [known["hash"], "new-hash"], "links": [known["link"], "https://url/new"]}
+        response = self.assert_post_ok(client, "news-items/unknown", request_data, api_header)
+        assert response.get_json() == {"hashes": ["new-hash"], "links": ["https://url/new"]}
+
+        response = client.post(f"{self.base_uri}/news-items/unknown", json=["new-hash"], headers=api_header)
+        assert response.status_code == 400
+
+    def test_dashboard_statistics(self, client, stories, api_header, auth_header, query_counter):
+        """
+        This test refreshes the dashboard snapshot.
+        It expects the dashboard to serve the snapshot with its as_of timestamp without counting again
+        """
+        snapshot = self.assert_post_ok(client, "dashboard-statistics", {}, api_header).get_json()
+        assert snapshot["total_news_items"] >= len(stories)
+        assert snapshot["as_of"]
+
+        query_counter.clear()
+        response = client.get("/api/dashboard", headers=auth_header)
+        assert response.get_json() == snapshot
+        assert not [statement for statement in query_counter if "count(" in statement.lower()]
+
+    def test_update_tags_bulk(self, client, fake_source, api_header, auth_header, query_counter):
+        """
+        This test tags batches of stories including an unknown story.
+        It expects a 207 naming the unknown story, the tags and bot markers on all others and a batch size independent query count
+        """
+        from core.model.story import Story
+
+        small_ids = Story.add_news_items(self.make_news_items(fake_source, "Tags Small", 2))[0]["ids"]
+        large_ids = Story.add_news_items(self.make_news_items(fake_source, "Tags Large", 6))[0]["ids"]
+
+        payload = {story_id: ["Bulk", {"name": "Bulk Type", "tag_type": "bulk"}] for story_id in small_ids} | {"unknown-story": ["bulk"]}
+        response = client.put(f"{self.base_uri}/tags?bot_type=bulk_bot", json=payload, headers=api_header)
+        assert response.status_code == 207
+        assert response.get_json()["errors"] == {"unknown-story": 404}
+
+        story = client.get(f"/api/assess/story/{small_ids[0]}", headers=auth_header).get_json()
+        assert sorted(tag["name"] for tag in story["tags"]) == ["Bulk", "Bulk Type"]
+        assert {"key": "bulk_bot", "value": "2"} in [{"key": a["key"], "value": a["value"]} for a in story["attributes"]]
+
+        query_counter.clear()
+        self.assert_put_ok(client, "tags?bot_type=bulk_bot", {story_id: ["bulk", "small"] for story_id in small_ids}, api_header)
+        small_batch_queries = len(query_counter)
+        query_counter.clear()
+        self.assert_put_ok(client, "tags?bot_type=bulk_bot", {story_id: ["bulk", "large"] for story_id in large_ids}, api_header)
+        assert len(query_counter) == small_batch_queries
+
+        story = client.get(f"/api/assess/story/{small_ids[1]}", headers=auth_header).get_json()
+        assert sorted(tag["name"] for tag in story["tags"]) == ["Bulk", "Bulk Type", "small"]
+
+        for story_id in [*small_ids, *large_ids]:
+            client.delete(f"/api/assess/story/{story_id}", headers=auth_header)
+
+    def test_export(self, client, stories, news_items, api_header):
+        """
+        This test exports stories and news items as plain and gzip compressed NDJSON, also in limited parts.
+        It expects one JSON document per line matching the filter, a next_cursor line to resume a limited export and a 400 for an invalid cursor
+        """
+        import gzip
+        import json
+
+        response = client.get(f"{self.base_uri}/stories/export", headers=api_header)
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+        exported = [json.loads(line) for line in response.get_data().splitlines()]
+        assert set(stories) <= {story["id"] for story in exported}
+        assert all("news_items" in story for story in exported)
+
+        response = client.get(f"{self.base_uri}/stories/export?limit=1", headers=api_header | {"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        first, control = [json.loads(line) for line in gzip.decompress(response.get_data()).splitlines()]
+        assert first["id"] == exported[0]["id"]
+        response = client.get(f"{self.base_uri}/stories/export?limit=1&cursor={control['next_cursor']}", headers=api_header)
+        assert json.loads(response.get_data().splitlines()[0])["id"] == exported[1]["id"]
+        response = client.get(f"{self.base_uri}/stories/export?limit={len(exported) + 1}", headers=api_header)
+        assert "next_cursor" not in json.loads(response.get_data().splitlines()[-1])
+
+        response = client.get(f"{self.base_uri}/news-items/export?sort=DATE_ASC", headers=api_header)
+        exported = [json.loads(line) for line in response.get_data().splitlines()]
+        assert {item["hash"] for item in news_items} <= {item["hash"] for item in exported}
+        assert [item["published"] for item in exported] == sorted(item["published"] for item in exported)
+
+        response = client.get(f"{self.base_uri}/news-items/export?sort=DATE_ASC&limit=1", headers=api_header)
+        first, control = [json.loads(line) for line in response.get_data().splitlines()]
+        assert first["id"] == exported[0]["id"]
+        response = client.get(f"{self.base_uri}/news-items/export?sort=DATE_ASC&limit=1&cursor={control['next_cursor']}", headers=api_header)
+        assert json.loads(response.get_data().splitlines()[0])["id"] == exported[1]["id"]
+
+        response = client.get(f"{self.base_uri}/news-items/export?cursor=invalid", headers=api_header)
+        assert response.status_code == 400
+
+    def test_stories_fields(self, client, stories, api_header, query_counter):
+        """
+        This test requests worker stories with a field projection.
+        It expects only the requested fields in the response and in the SELECTs, and a 400 for unknown fields
+        """
+        query_counter.clear()
+        response = client.get(f"{self.base_uri}/stories?fields=title,news_items.content", headers=api_header)
+        assert response.status_code == 200
+        for story in response.get_json():
+            assert set(story) == {"id", "title", "news_items"}
+            assert all(set(news_item) == {"id", "content"} for news_item in story["news_items"])
+        statements = " ".join(query_counter)
+        assert "story.description" not in statements
+        assert "news_item.review" not in statements
+        assert "news_item_attribute" not in statements
+
+        response = client.get(f"{self.base_uri}/stories?fields=tags,news_items.attributes", headers=api_header)
+        story = response.get_json()[0]
+        assert set(story) == {"id", "tags", "news_items"}
+        assert all(set(news_item) == {"id", "attributes"} for news_item in story["news_items"])
+
+        response = client.get(f"{self.base_uri}/stories?fields=title,news_items.unknown", headers=api_header)
+        assert response.status_code == 400
+
+    def test_compression(self, app, client, fake_source, stories, api_header, auth_header):
+        """
+        This test uploads gzip compressed news items and downloads stories with Accept-Encoding gzip.
+        It expects compressed bodies both ways and 415/413/400 for unsupported, oversized and corrupt bodies
+        """
+        import gzip
+        import json
+
+        body = gzip.compress(json.dumps(self.make_news_items(fake_source, "Compressed", 3)).encode())
+        headers = api_header | {"Content-Encoding": "gzip"}
+        response = client.post(f"{self.base_uri}/news-items", data=body, headers=headers)
+        assert response.status_code == 200
+        added_ids = response.get_json()["ids"]
+        assert len(added_ids) == 3
+
+        response = client.get(f"{self.base_uri}/stories", headers=api_header | {"Accept-Encoding": "gzip"})
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["Vary"]
+        assert set(added_ids) <= {story["id"] for story in json.loads(gzip.decompress(response.get_data()))}
+        assert "Content-Encoding" not in client.get(f"{self.base_uri}/stories", headers=api_header).headers
+
+        response = client.post(f"{self.base_uri}/news-items", data=body, headers=api_header | {"Content-Encoding": "br"})
+        assert response.status_code == 415
+        assert "gzip" in response.headers["Accept-Encoding"]
+        response = client.post(f"{self.base_uri}/news-items", data=body[:-20], headers=headers)
+        assert response.status_code == 400
+        max_size, app.wsgi_app.max_size = app.wsgi_app.max_size, 100
+        try:
+            assert client.post(f"{self.base_uri}/news-items", data=body, headers=headers).status_code == 413
+        finally:
+            app.wsgi_app.max_size = max_size
+
+        for story_id in added_ids:
+            client.delete(f"/api/assess/story/{story_id}", headers=auth_header)
+
+    def test_presenter_template_etag(self, app, client, api_header):
+        """
+        This test downloads a presenter template and revalidates it with If-None-Match.
+        It expects the template content hash as ETag and a 304 without body while the template is unchanged
+        """
+        from core.model.product_type import ProductType
+        from core.model.worker import PRESENTER_TYPES
+
+        with app.app_context():
+            presenter = ProductType.get_by_type(PRESENTER_TYPES.TEXT_PRESENTER)
+            presenter_id, template_hash = presenter.id, presenter.get_template_hash()
+
+        response = client.get(f"{self.base_uri}/presenters/{presenter_id}", headers=api_header | {"Accept-Encoding": "gzip"})
+        assert response.status_code == 200
+        assert response.headers["ETag"] == f'"{template_hash}"'
+
+        response = client.get(f"{self.base_uri}/presenters/{presenter_id}", headers=api_header | {"If-None-Match": response.headers["ETag"]})
+        assert response.status_code == 304
+        assert response.data == b""
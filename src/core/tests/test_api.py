@@ -33,6 +33,114 @@ def test_user_profile(client, auth_header):
     assert response.status_code == 200
 
 
+def test_cached_principal(client, auth_header, query_counter):
+    from core.model.role import Role
+
+    client.get("/api/assess/osint-sources-list", headers=auth_header)
+    query_counter.clear()
+    response = client.get("/api/assess/osint-sources-list", headers=auth_header)
+    assert response.status_code == 200
+    assert not [statement for statement in query_counter if "username" in statement or "role_permission" in statement]
+
+    admin_role = Role.filter_by_name("Admin")
+    Role.update(admin_role.id, {"permissions": admin_role.get_permissions(), "description": admin_role.description})
+    query_counter.clear()
+    client.get("/api/assess/osint-sources-list", headers=auth_header)
+    assert [statement for statement in query_counter if "username" in statement]
+
+
+def test_sse_coalescing(client, auth_header, monkeypatch):
+    from types import SimpleNamespace
+    from core.config import Config
+    from core.managers.sse_manager import sse_manager
+
+    posted = []
+    monkeypatch.setattr(Config, "DISABLE_SSE", False)
+    monkeypatch.setattr(Config, "SSE_QUEUE_SIZE", 3)
+    sse_manager.reset()
+    monkeypatch.setattr(sse_manager, "start_sender", lambda: None)
+    monkeypatch.setattr(sse_manager.session, "post", lambda **kwargs: posted.append(kwargs["json"]) or SimpleNamespace(ok=True))
+
+    for _ in range(50):
+        sse_manager.news_items_updated()
+    for report_item_id in range(3):
+        sse_manager.report_item_updated(report_item_id)
+    sse_manager.report_item_updated(2)
+
+    response = client.get("/api/admin/sse-metrics", headers=auth_header)
+    assert response.status_code == 200
+    assert response.json["queue_depth"] == 3
+    assert response.json["enqueued"] == 4
+    assert response.json["coalesced"] == 50
+    assert response.json["dropped"] == 1
+
+    sse_manager.flush()
+    assert posted == [{"data": report_item_id, "event": "report-item-updated"} for report_item_id in range(3)]
+    assert sse_manager.metrics()["sent"] == 3
+    assert sse_manager.metrics()["queue_depth"] == 0
+    sse_manager.reset()
+
+
+def test_sse_coalescing_keeps_order(monkeypatch):
+    from types import SimpleNamespace
+    from core.config import Config
+    from core.managers.sse_manager import sse_manager
+
+    posted = []
+    monkeypatch.setattr(Config, "DISABLE_SSE", False)
+    sse_manager.reset()
+    monkeypatch.setattr(sse_manager, "start_sender", lambda: None)
+    monkeypatch.setattr(sse_manager.session, "post", lambda **kwargs: posted.append(kwargs["json"]) or SimpleNamespace(ok=True))
+
+    sse_manager.report_item_locked("42")
+    sse_manager.report_item_unlocked("42")
+    sse_manager.report_item_locked("42")
+    sse_manager.flush()
+    assert [event["event"] for event in posted] == ["report-item-unlocked", "report-item-locked"]
+    sse_manager.reset()
+
+
 def test_auth_logout(client, auth_header):
     response = client.delete("/api/auth/logout", headers=auth_header)
     assert response.status_code == 200
+
+
+def test_revoked_tokens_out_of_order(app, monkeypatch):
+    from datetime import datetime, timedelta
+    from core.config import Config
+    from core.managers.db_manager import db
+    from core.model.token_blacklist import TokenBlacklist, revoked_tokens
+
+    monkeypatch.setattr(Config, "REVOKED_TOKEN_REFRESH_INTERVAL", 0)
+    with app.app_context():
+        assert not TokenBlacklist.invalid("late-token")
+        # a revocation created before the last refresh but committed after it, e.g. with a lower id from a slower transaction
+        late = TokenBlacklist("late-token")
+        late.created = datetime.now() - timedelta(seconds=10)
+        db.session.add(late)
+        db.session.commit()
+        assert TokenBlacklist.invalid("late-token")
+
+        db.session.delete(late)
+        db.session.commit()
+        monkeypatch.setattr(Config, "REVOKED_TOKEN_RELOAD_INTERVAL", 0)
+        assert not TokenBlacklist.invalid("late-token")
+        assert revoked_tokens.reloaded_at == revoked_tokens.refreshed_at
+
+
+def test_news_item_attribute_binary(app, monkeypatch):
+    import pytest
+    from core.managers import blob_manager
+    from core.model.news_item_attribute import NewsItemAttribute
+
+    with app.app_context():
+        attribute = NewsItemAttribute("attachment", "file.txt", "text/plain", "YmluYXJ5")
+        assert attribute.get_binary_data() == b"binary"
+        assert NewsItemAttribute("attachment", "file.txt", "text/plain", "not base64!").binary_hash is None
+
+        def fail(data):
+            raise OSError("No space left on device")
+
+        monkeypatch.setattr(blob_manager.get_blob_store(), "put", fail)
+        with pytest.raises(OSError):
+            NewsItemAttribute("attachment", "file.txt", "text/plain", "YmluYXJ5")
@@ -17,11 +17,13 @@ export function getProduct(product) {
 }
 
 export function getRenderdProduct(product) {
-  return apiService.get(`/publish/products/${product}/render`)
+  return apiService.get(`/publish/products/${product}/render`, {
+    responseType: 'arraybuffer'
+  })
 }
 
-export function triggerRenderProduct(product) {
-  return apiService.post(`/publish/products/${product}/render`)
+export function triggerRenderProduct(product, force = false) {
+  return apiService.post(`/publish/products/${product}/render?force=${force}`)
 }
 
 export function deleteProduct(product) {
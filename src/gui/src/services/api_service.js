@@ -23,8 +23,8 @@ export class ApiService {
     return getQueryStringFromNestedObject(filterObject)
   }
 
-  async get(resource) {
-    return await this._axios.get(resource).catch((error) => {
+  async get(resource, config = {}) {
+    return await this._axios.get(resource, config).catch((error) => {
       if (error.response.status === 401) {
         this.authStore.logout()
       }
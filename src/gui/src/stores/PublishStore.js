@@ -17,6 +17,8 @@ export const usePublishStore = defineStore(
     const product_types = ref({ total_count: 0, items: [] })
     const renderedProduct = ref(null)
     const renderedProductMimeType = ref(null)
+    const renderedProductBlob = ref(null)
+    let renderedProductURL = null
 
     async function loadProducts(data) {
       const response = await getAllProducts(data)
@@ -46,8 +48,18 @@ export const usePublishStore = defineStore(
 
     async function loadRenderedProduct(product_id) {
       const response = await getRenderdProduct(product_id)
-      renderedProduct.value = response.data
-      renderedProductMimeType.value = response.headers['content-type']
+      const mimeType = response.headers['content-type']
+      if (renderedProductURL) {
+        URL.revokeObjectURL(renderedProductURL)
+      }
+      renderedProductBlob.value = new Blob([response.data], { type: mimeType })
+      renderedProductMimeType.value = mimeType
+      renderedProductURL =
+        mimeType === 'application/pdf'
+          ? URL.createObjectURL(renderedProductBlob.value)
+          : null
+      renderedProduct.value =
+        renderedProductURL ?? new TextDecoder().decode(response.data)
     }
 
     async function patchProduct(product) {
@@ -91,6 +103,7 @@ export const usePublishStore = defineStore(
       product_types,
       renderedProduct,
       renderedProductMimeType,
+      renderedProductBlob,
       patchProduct,
       loadProducts,
       loadProductTypes,
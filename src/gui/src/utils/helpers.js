@@ -28,6 +28,11 @@ export function getSourceInfo(source) {
   return store.osint_sources.items.find((item) => item.id === source)
 }
 
+export function getIconURL(iconURL) {
+  const store = useMainStore()
+  return iconURL ? store.coreAPIURL + iconURL : null
+}
+
 export function notifySuccess(text) {
   const successMessage =
     typeof text !== 'string' ? getMessageFromResponse(text) : text
@@ -10,6 +10,8 @@ class BaseBot:
         self.type = "BASE_BOT"
         self.name = "Base Bot"
         self.description = "Base abstract type for all bots"
+        # story fields the bot reads, e.g. ["title", "news_items.content"], all fields when empty
+        self.story_fields: list[str] = []
 
     def execute(self):
         pass
@@ -44,7 +46,7 @@ class BaseBot:
 
     def get_stories(self, parameters) -> list:
         filter_dict = self.get_filter_dict(parameters)
-        data = self.core_api.get_stories(filter_dict)
+        data = self.core_api.get_stories(filter_dict, self.story_fields)
         if not data:
             logger.debug(f"No Stories for filter: {filter_dict}")
         return data
@@ -11,6 +11,7 @@ class GroupingBot(BaseBot):
         self.name = "Grouping Bot"
         self.description = "Bot for grouping news items into stories"
         self.default_regex = r"CVE-\d{4}-\d{4,7}"
+        self.story_fields = ["news_items.title", "news_items.content"]
 
     def execute(self, parameters=None):
         regexp = parameters.get("REGULAR_EXPRESSION", None)
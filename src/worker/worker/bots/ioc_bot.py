@@ -10,6 +10,7 @@ class IOCBot(BaseBot):
         self.type = "IOC_BOT"
         self.name = "IOC Bot"
         self.description = "Bot for finding indicators of compromise in news items"
+        self.story_fields = ["news_items.content"]
         self.included_ioc_types = [
             "bitcoin_addresses",
             "cves",
@@ -12,6 +12,7 @@ class NLPBot(BaseBot):
         self.type = "NLP_BOT"
         self.name = "NLP Bot"
         self.description = "Bot for naturale language processing of news items"
+        self.story_fields = ["tags", "news_items.content"]
 
         logger.debug("Setup NER Model...")
         self.ner_multi = Classifier.load("flair/ner-multi")
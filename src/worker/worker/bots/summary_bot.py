@@ -14,6 +14,7 @@ class SummaryBot(BaseBot):
         self.type = "SUMMARY_BOT"
         self.name = "Summary generation Bot"
         self.description = "Bot to generate summaries for stories"
+        self.story_fields = ["news_items.title", "news_items.content"]
         self.summary_threshold = 1000
         self.language = "en"
         logger.debug("Setup Summarization Model...")
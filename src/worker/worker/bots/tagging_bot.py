@@ -9,6 +9,7 @@ class TaggingBot(BaseBot):
         self.type = "TAGGING_BOT"
         self.name = "Tagging Bot"
         self.description = "Bot for tagging news items based on regular expressions"
+        self.story_fields = ["tags", "news_items.title", "news_items.review", "news_items.content"]
 
     def execute(self, parameters=None):
         regexp = parameters.get("REGULAR_EXPRESSION", None)
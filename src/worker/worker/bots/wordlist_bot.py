@@ -10,6 +10,7 @@ class WordlistBot(BaseBot):
         self.type = "WORDLIST_BOT"
         self.name = "Wordlist Bot"
         self.description = "Bot for tagging news items by wordlist"
+        self.story_fields = ["tags", "news_items.title", "news_items.review", "news_items.content"]
 
     def execute(self, parameters=None):
         ignore_case = self._set_ignore_case_flag(parameters)
@@ -137,10 +137,24 @@ class BaseWebCollector(BaseCollector):
         soup = BeautifulSoup(html_content, "html.parser")
         return [a["href"] for a in soup.find_all("a", href=True)]
 
-    def parse_digests(self) -> list[dict] | str:
+    def filter_unknown_links(self, links: list[str]) -> list[str]:
+        """
+        Drop links of articles core already stored, keeps all links if core can't be asked
+        """
+        if not links:
+            return links
+        result = self.core_api.get_unknown_news_items(links=list({self.sanitize_url(link) for link in links}))
+        if result is None:
+            return links
+        unknown_links = set(result.get("links", []))
+        logger.debug(f"{self.source_id}: skipping {len(links) - len(unknown_links)} known articles")
+        return [link for link in links if self.sanitize_url(link) in unknown_links]
+
+    def parse_digests(self, skip_known: bool = False) -> list[dict] | str:
         news_items = []
-        max_elements = min(len(self.split_digest_urls), self.digest_splitting_limit)
-        for split_digest_url in self.split_digest_urls[:max_elements]:
+        digest_urls = self.filter_unknown_links(self.split_digest_urls) if skip_known else self.split_digest_urls
+        max_elements = min(len(digest_urls), self.digest_splitting_limit)
+        for split_digest_url in digest_urls[:max_elements]:
             try:
                 news_items.append(self.news_item_from_article(split_digest_url))
             except ValueError as e:
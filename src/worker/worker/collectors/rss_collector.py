@@ -92,14 +92,22 @@ class RSSCollector(BaseWebCollector):
 
         return self.xpath_extraction(html_content, xpath)
 
+    def get_entry_link(self, feed_entry: feedparser.FeedParserDict, source) -> str:
+        link: str = str(feed_entry.get("link", ""))
+        if link_transformer := source["parameters"].get("LINK_TRANSFORMER", None):
+            link = self.link_transformer(link, link_transformer)
+        return link
+
+    def filter_known_entries(self, feed_entries: list[feedparser.FeedParserDict], source) -> list[feedparser.FeedParserDict]:
+        entry_links = [(feed_entry, self.get_entry_link(feed_entry, source)) for feed_entry in feed_entries]
+        unknown_links = set(self.filter_unknown_links([link for _, link in entry_links if link]))
+        return [feed_entry for feed_entry, link in entry_links if not link or link in unknown_links]
+
     def parse_feed_entry(self, feed_entry: feedparser.FeedParserDict, source) -> dict[str, str | datetime.datetime | list]:
         author: str = str(feed_entry.get("author", ""))
         title: str = str(feed_entry.get("title", ""))
         description: str = str(feed_entry.get("description", ""))
-        link: str = str(feed_entry.get("link", ""))
-
-        if link_transformer := source["parameters"].get("LINK_TRANSFORMER", None):
-            link = self.link_transformer(link, link_transformer)
+        link: str = self.get_entry_link(feed_entry, source)
 
         published = self.get_published_date(feed_entry)
 
@@ -174,18 +182,21 @@ class RSSCollector(BaseWebCollector):
     def get_digest_url_list(self, feed_entries) -> list:
         return [result for feed_entry in feed_entries for result in self.get_urls(feed_entry.get("summary"))]  # Flat list of URLs
 
-    def get_news_items(self, feed, source) -> list | str:
+    def get_news_items(self, feed, source, skip_known: bool = False) -> list | str:
         digest_splitting = source["parameters"].get("DIGEST_SPLITTING", False)
         if digest_splitting == "true":
-            return self.handle_digests(feed["entries"][:42])
+            return self.handle_digests(feed["entries"][:42], skip_known)
 
-        return self.parse_feed(feed["entries"][:42], source)
+        feed_entries = feed["entries"][:42]
+        if skip_known:
+            feed_entries = self.filter_known_entries(feed_entries, source)
+        return self.parse_feed(feed_entries, source)
 
-    def handle_digests(self, feed_entries: list[feedparser.FeedParserDict]) -> list[dict] | str:
+    def handle_digests(self, feed_entries: list[feedparser.FeedParserDict], skip_known: bool = False) -> list[dict] | str:
         self.split_digest_urls = self.get_digest_url_list(feed_entries)
         logger.info(f"RSS-Feed {self.source_id} returned {len(self.split_digest_urls)} available URLs")
 
-        return self.parse_digests()
+        return self.parse_digests(skip_known)
 
     def get_feed(self) -> feedparser.FeedParserDict:
         self.feed_content = self.make_request(self.feed_url)
@@ -214,7 +225,7 @@ class RSSCollector(BaseWebCollector):
 
         logger.info(f"RSS-Feed {source['id']} returned feed with {len(feed['entries'])} entries")
 
-        news_items = self.get_news_items(feed, source)
+        news_items = self.get_news_items(feed, source, skip_known=True)
 
         self.publish(news_items, source)
         return None
@@ -47,7 +47,7 @@ class SimpleWebCollector(BaseWebCollector):
         news_items = self.gather_news_items(source)
         return self.preview(news_items, source)
 
-    def handle_digests(self) -> list[dict] | str:
+    def handle_digests(self, skip_known: bool = False) -> list[dict] | str:
         if not self.xpath:
             raise ValueError("No XPATH set for digest splitting")
 
@@ -57,12 +57,12 @@ class SimpleWebCollector(BaseWebCollector):
         self.split_digest_urls = self.get_urls(content)
         logger.info(f"RSS-Feed {self.source_id} returned {len(self.split_digest_urls)} available URLs")
 
-        return self.parse_digests()
+        return self.parse_digests(skip_known)
 
-    def gather_news_items(self, source) -> list[NewsItem]:
+    def gather_news_items(self, source, skip_known: bool = False) -> list[NewsItem]:
         digest_splitting = source["parameters"].get("DIGEST_SPLITTING", False)
         if digest_splitting == "true":
-            return self.handle_digests()
+            return self.handle_digests(skip_known)
         return [self.news_item_from_article(self.web_url, self.xpath)]
 
     def web_collector(self, source, manual: bool = False):
@@ -81,7 +81,7 @@ class SimpleWebCollector(BaseWebCollector):
             return "Last-Modified < Last-Attempted"
 
         try:
-            news_items = self.gather_news_items(source)
+            news_items = self.gather_news_items(source, skip_known=True)
         except ValueError as e:
             logger.error(f"Simple Web Collector for {self.web_url} failed with error: {str(e)}")
 
@@ -17,6 +17,12 @@ class Settings(BaseSettings):
     DEBUG: bool = False
     SSL_VERIFICATION: bool = False
     REQUESTS_TIMEOUT: int = 60
+    CORE_REQUEST_COMPRESSION: Literal["none", "gzip", "zstd"] = "gzip"
+    CORE_COMPRESSION_MIN_SIZE: int = 1024
+    CORE_POOL_SIZE: int = 10
+    CORE_RETRIES: int = 3
+    CORE_RETRY_BACKOFF: float = 0.5
+    TEMPLATE_CACHE_SIZE: int = 32
     WORKER_TYPES: list[Literal["Bots", "Collectors", "Presenters", "Publishers"]] = ["Bots", "Collectors", "Presenters", "Publishers"]
     QUEUE_BROKER_SCHEME: Literal["amqp", "amqps"] = "amqp"
     QUEUE_BROKER_HOST: str = "localhost"
@@ -1,10 +1,56 @@
+import os
+import json
+import time
+import zlib
 import requests
-from urllib.parse import urlencode
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlencode, urlsplit
 
 from worker.log import logger
 from worker.config import Config
 from worker.types import Product
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# methods without side effects on repetition, PUT is excluded because e.g. tag updates append bot attributes
+RETRY_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "DELETE"})
+
+sessions: dict[int, requests.Session] = {}
+
+# presenter id -> (ETag, template) of the last template downloaded from core
+templates: dict[int, tuple[str, str]] = {}
+
+
+def create_session() -> requests.Session:
+    retry = Retry(
+        total=Config.CORE_RETRIES,
+        backoff_factor=Config.CORE_RETRY_BACKOFF,
+        backoff_jitter=Config.CORE_RETRY_BACKOFF,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=RETRY_METHODS,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=Config.CORE_POOL_SIZE, pool_block=True, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Keep-alive session shared by all CoreApi instances of a process, created after fork so pooled sockets are never shared
+    """
+    pid = os.getpid()
+    if (session := sessions.get(pid)) is None:
+        sessions.clear()
+        session = sessions[pid] = create_session()
+    return session
+
 
 class CoreApi:
     def __init__(self):
@@ -13,9 +59,46 @@ class CoreApi:
         self.headers = self.get_headers()
         self.verify = Config.SSL_VERIFICATION
         self.timeout = Config.REQUESTS_TIMEOUT
+        self.compression = self.get_request_compression()
+
+    def request(self, method: str, url: str, headers: dict | None = None, **kwargs) -> requests.Response:
+        start = time.perf_counter()
+        status = "failed"
+        try:
+            response = get_session().request(
+                method, url, headers=self.headers if headers is None else headers, verify=self.verify, timeout=self.timeout, **kwargs
+            )
+            status = response.status_code
+            return response
+        finally:
+            logger.debug(f"{method} {urlsplit(url).path} {status} in {(time.perf_counter() - start) * 1000:.1f} ms")
 
     def get_headers(self) -> dict:
-        return {"Authorization": f"Bearer {self.api_key}", "Content-type": "application/json"}
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-type": "application/json",
+            "Accept-Encoding": "zstd, gzip" if zstandard else "gzip",
+        }
+
+    def get_request_compression(self) -> str | None:
+        if Config.CORE_REQUEST_COMPRESSION == "zstd" and not zstandard:
+            logger.warning("CORE_REQUEST_COMPRESSION is zstd but zstandard is not installed, using gzip")
+            return "gzip"
+        return None if Config.CORE_REQUEST_COMPRESSION == "none" else Config.CORE_REQUEST_COMPRESSION
+
+    def encode_json(self, json_data) -> tuple[bytes, dict]:
+        """
+        Serialize a request body, compressed with the configured encoding once it reaches CORE_COMPRESSION_MIN_SIZE
+        """
+        body = json.dumps(json_data).encode()
+        if not self.compression or len(body) < Config.CORE_COMPRESSION_MIN_SIZE:
+            return body, self.headers
+        if self.compression == "zstd":
+            body = zstandard.ZstdCompressor().compress(body)
+        else:
+            compressor = zlib.compressobj(wbits=31)
+            body = compressor.compress(body) + compressor.flush()
+        return body, self.headers | {"Content-Encoding": self.compression}
 
     def check_response(self, response, url):
         try:
@@ -28,28 +111,26 @@ class CoreApi:
 
     def api_put(self, url, json_data=None):
         url = f"{self.api_url}{url}"
-        if not json_data:
-            json_data = {}
-        response = requests.put(url=url, headers=self.headers, verify=self.verify, json=json_data, timeout=self.timeout)
+        body, headers = self.encode_json(json_data or {})
+        response = self.request("PUT", url, headers=headers, data=body)
         return self.check_response(response, url)
 
     def api_post(self, url, json_data=None):
         url = f"{self.api_url}{url}"
-        if not json_data:
-            json_data = {}
-        response = requests.post(url=url, headers=self.headers, verify=self.verify, json=json_data, timeout=self.timeout)
+        body, headers = self.encode_json(json_data or {})
+        response = self.request("POST", url, headers=headers, data=body)
         return self.check_response(response, url)
 
     def api_get(self, url, params=None):
         url = f"{self.api_url}{url}"
         if params:
             url += f"?{urlencode(params)}"
-        response = requests.get(url=url, headers=self.headers, verify=self.verify, timeout=self.timeout)
+        response = self.request("GET", url)
         return self.check_response(response, url)
 
     def api_delete(self, url):
         url = f"{self.api_url}{url}"
-        response = requests.delete(url=url, headers=self.headers, verify=self.verify, timeout=self.timeout)
+        response = self.request("DELETE", url)
         return self.check_response(response, url)
 
     def get_bot_config(self, bot_id: str) -> dict | None:
@@ -68,7 +149,7 @@ class CoreApi:
     def get_product_render(self, product_id: int) -> Product | None:
         try:
             url = f"{self.api_url}/worker/products/{product_id}/render"
-            response = requests.get(url=url, headers=self.headers, verify=self.verify, timeout=self.timeout)
+            response = self.request("GET", url)
             if not response.ok:
                 logger.error(f"Call to {url} failed {response.status_code}")
                 return None
@@ -81,17 +162,30 @@ class CoreApi:
         return self.api_get(f"/worker/publishers/{publisher_id}")
 
     def get_template(self, presenter: int) -> str | None:
+        """
+        Template of a presenter, revalidated with If-None-Match so unchanged templates are not downloaded again
+        """
         url = f"{self.api_url}/worker/presenters/{presenter}"
-        response = requests.get(url=url, headers=self.headers, verify=self.verify, timeout=self.timeout)
-        return response.text if response.ok else None
+        headers = self.headers
+        if cached := templates.get(presenter):
+            headers = headers | {"If-None-Match": cached[0]}
+        response = self.request("GET", url, headers=headers)
+        if response.status_code == 304 and cached:
+            return cached[1]
+        if not response.ok:
+            templates.pop(presenter, None)
+            return None
+        if etag := response.headers.get("ETag"):
+            templates[presenter] = (etag, response.text)
+        return response.text
 
-    def upload_rendered_product(self, product_id, product) -> dict | None:
+    def upload_rendered_product(self, product_id, product, fingerprint: str | None = None) -> dict | None:
         url = f"{self.api_url}/worker/products/{product_id}"
         headers = self.headers.copy()
         headers["Content-type"] = product["mime_type"]
-        return self.check_response(
-            requests.put(url=url, data=product["data"], headers=headers, verify=self.verify, timeout=self.timeout), url
-        )
+        if fingerprint:
+            headers["X-Render-Fingerprint"] = fingerprint
+        return self.check_response(self.request("PUT", url, headers=headers, data=product["data"]), url)
 
     def get_schedule(self) -> dict | None:
         try:
@@ -113,7 +207,9 @@ class CoreApi:
         except Exception:
             return None
 
-    def get_stories(self, filter_dict: dict) -> list:
+    def get_stories(self, filter_dict: dict, fields: list[str] | None = None) -> list:
+        if fields:
+            filter_dict = filter_dict | {"fields": ",".join(fields)}
         return self.api_get("/worker/stories", params=filter_dict)
 
     def get_tags(self) -> dict | None:
@@ -173,7 +269,7 @@ class CoreApi:
             url = f"{self.api_url}/worker/osint-sources/{osint_source_id}/icon"
             headers = self.headers.copy()
             headers.pop("Content-type", None)
-            return self.check_response(requests.put(url=url, files=icon, headers=headers, verify=self.verify, timeout=self.timeout), url)
+            return self.check_response(self.request("PUT", url, headers=headers, files=icon), url)
         except Exception:
             return None
 
@@ -185,48 +281,52 @@ class CoreApi:
 
     def news_items_grouping(self, data):
         try:
-            response = requests.put(
-                f"{self.api_url}/bots/stories/group",
-                json=data,
-                headers=self.headers,
-                timeout=self.timeout,
-            )
+            body, headers = self.encode_json(data)
+            response = self.request("PUT", f"{self.api_url}/bots/stories/group", headers=headers, data=body)
             return response.status_code
         except Exception:
             return None
 
     def news_items_grouping_multiple(self, data):
         try:
-            response = requests.put(
-                f"{self.api_url}/bots/stories/group-multiple",
-                json=data,
-                headers=self.headers,
-                timeout=self.timeout,
-            )
+            body, headers = self.encode_json(data)
+            response = self.request("PUT", f"{self.api_url}/bots/stories/group-multiple", headers=headers, data=body)
             return response.status_code
         except Exception:
             return None
 
     def add_news_items(self, news_items) -> bool:
         try:
-            response = requests.post(
-                f"{self.api_url}/worker/news-items", json=news_items, headers=self.headers, verify=self.verify, timeout=self.timeout
-            )
-
+            body, headers = self.encode_json(news_items)
+            response = self.request("POST", f"{self.api_url}/worker/news-items", headers=headers, data=body)
             return response.ok
         except Exception:
             logger.exception("Cannot add Newsitem")
             return False
 
+    def get_unknown_news_items(self, hashes: list[str] | None = None, links: list[str] | None = None) -> dict | None:
+        try:
+            return self.api_post("/worker/news-items/unknown", json_data={"hashes": hashes or [], "links": links or []})
+        except Exception:
+            logger.exception("Cannot check for known news items")
+            return None
+
     def cleanup_token_blacklist(self):
         try:
             url = f"{self.api_url}/worker/token-blacklist"
-            response = requests.post(url=url, headers=self.headers, verify=self.verify, timeout=self.timeout)
+            response = self.request("POST", url)
             return self.check_response(response, url)
         except Exception:
             logger.exception("Cannot cleanup token blacklist")
             return False
 
+    def refresh_dashboard_statistics(self) -> dict | None:
+        try:
+            return self.api_post("/worker/dashboard-statistics")
+        except Exception:
+            logger.exception("Cannot refresh dashboard statistics")
+            return None
+
     def store_task_result(self, data) -> dict | None:
         try:
             return self.api_post(url="/tasks/", json_data=data)
@@ -236,6 +336,6 @@ class CoreApi:
     def get_task(self, task_id) -> dict | None:
         try:
             url = f"{self.api_url}/tasks/{task_id}"
-            return requests.get(url=url, headers=self.headers, verify=self.verify, timeout=self.timeout)
+            return self.request("GET", url)
         except Exception:
             return None
@@ -11,6 +11,13 @@ def cleanup_token_blacklist():
     return "Token blacklist cleaned up"
 
 
+@shared_task(time_limit=60, name="refresh_dashboard_statistics", ignore_result=True, priority=1)
+def refresh_dashboard_statistics():
+    core_api = CoreApi()
+    core_api.refresh_dashboard_statistics()
+    return "Dashboard statistics refreshed"
+
+
 @shared_task(time_limit=120, name="gather_word_list", priority=1)
 def gather_word_list(word_list_id: int):
     return update_wordlist(word_list_id)
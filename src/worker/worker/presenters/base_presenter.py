@@ -1,6 +1,31 @@
 from worker.log import logger
+from worker.config import Config
 import jinja2
+import hashlib
 import datetime
+import threading
+from collections import OrderedDict
+
+environment = jinja2.Environment(autoescape=False)
+compiled_templates: OrderedDict[str, jinja2.Template] = OrderedDict()
+compiled_templates_lock = threading.Lock()
+
+
+def get_compiled_template(template: str) -> jinja2.Template:
+    """
+    Compile a template once, least recently used templates beyond TEMPLATE_CACHE_SIZE are dropped
+    """
+    key = hashlib.sha256(template.encode()).hexdigest()
+    with compiled_templates_lock:
+        if (compiled := compiled_templates.get(key)) is not None:
+            compiled_templates.move_to_end(key)
+            return compiled
+    compiled = environment.from_string(template)
+    with compiled_templates_lock:
+        compiled_templates[key] = compiled
+        while len(compiled_templates) > Config.TEMPLATE_CACHE_SIZE:
+            compiled_templates.popitem(last=False)
+    return compiled
 
 
 class BasePresenter:
@@ -13,8 +38,7 @@ class BasePresenter:
 
     def generate(self, product, template) -> dict[str, bytes | str]:
         try:
-            env = jinja2.Environment(autoescape=False)
-            tmpl = env.from_string(template)
+            tmpl = get_compiled_template(template)
             product["current_date"] = datetime.datetime.now().strftime("%Y-%m-%d")
 
             output_text = tmpl.render(data=product).encode("utf-8")
@@ -58,13 +58,17 @@ class PresenterTask(Task):
 
         return None, f"Presenter {presenter_type} not implemented"
 
-    def run(self, product_id: int):
+    def run(self, product_id: int, force: bool = False):
         err = None
 
         product, err = self.get_product(product_id)
         if err or not product:
             return err
 
+        if not force and product.get("render_fingerprint") and product["render_fingerprint"] == product.get("fingerprint"):
+            logger.info(f"Product {product_id} did not change since the last render")
+            return "Product render is up to date"
+
         presenter, err = self.get_presenter(product)
         if err or not presenter:
             return err
@@ -82,8 +86,5 @@ class PresenterTask(Task):
         if "error" in rendered_product:
             return rendered_product["error"]
 
-        self.core_api.upload_rendered_product(
-            product_id,
-            rendered_product,
-        )
+        self.core_api.upload_rendered_product(product_id, rendered_product, product.get("fingerprint"))
         return "Product rendered successfully"
@@ -1,4 +1,3 @@
-import base64
 import smtplib
 import ssl
 from email.message import EmailMessage
@@ -70,8 +69,7 @@ class EMAILPublisher(BasePublisher):
 
         maintype, subtype = rendered_product.mime_type.split("/")
         logger.debug("EMAIL Publisher: Creating attachment")
-        attachment_data = base64.b64decode(rendered_product.data)
-        self.msg.add_attachment(attachment_data, maintype=maintype, subtype=subtype, filename=f"{self.file_name}")
+        self.msg.add_attachment(rendered_product.data, maintype=maintype, subtype=subtype, filename=f"{self.file_name}")
 
     def setup_email(self, rendered_product: Product):
         if rendered_product.mime_type in ["text/plain", "text/html"]:
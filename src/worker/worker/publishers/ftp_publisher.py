@@ -1,7 +1,6 @@
 import ftplib
 from io import BytesIO
 from urllib.parse import urlsplit, ParseResult
-from base64 import b64decode
 
 from worker.log import logger
 from .base_publisher import BasePublisher
@@ -24,10 +23,7 @@ class FTPPublisher(BasePublisher):
         ftp_data = urlsplit(ftp_url)
 
         logger.debug(ftp_data)
-        if rendered_product.mime_type in ["text/plain", "text/html"]:
-            data_to_upload = BytesIO(rendered_product.data)
-        else:
-            data_to_upload = BytesIO(b64decode(rendered_product.data))
+        data_to_upload = BytesIO(rendered_product.data)
 
         self.input_validation(ftp_data)
         self.upload_to_ftp(ftp_data, data_to_upload)
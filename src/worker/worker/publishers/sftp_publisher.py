@@ -2,7 +2,6 @@ import contextlib
 from io import BytesIO
 import paramiko
 from urllib.parse import urlsplit, ParseResult
-from base64 import b64decode
 
 from worker.log import logger
 from .base_publisher import BasePublisher
@@ -26,10 +25,7 @@ class SFTPPublisher(BasePublisher):
         self.set_file_name(product)
         server_config = urlsplit(ftp_url)
 
-        if rendered_product.mime_type in ["text/plain", "text/html"]:
-            data_to_upload = BytesIO(rendered_product.data)
-        else:
-            data_to_upload = BytesIO(b64decode(rendered_product.data))
+        data_to_upload = BytesIO(rendered_product.data)
 
         self.input_validation(server_config, private_key)
         if private_key:
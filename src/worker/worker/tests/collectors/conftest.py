@@ -44,6 +44,13 @@ def news_item_upload_mock(requests_mock):
     requests_mock.post("http://taranis/api/worker/news-items", json={})
 
 
+@pytest.fixture
+def known_news_items_mock(requests_mock):
+    from worker.tests.testdata import rss_collector_targets
+
+    requests_mock.post("http://taranis/api/worker/news-items/unknown", json={"hashes": [], "links": rss_collector_targets[1:]})
+
+
 @pytest.fixture
 def web_collector_url_mock(requests_mock):
     from worker.tests.testdata import web_collector_url, head_request
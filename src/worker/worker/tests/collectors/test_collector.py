@@ -11,6 +11,17 @@ def test_rss_collector(rss_collector_mock, rss_collector):
     assert result is None
 
 
+def test_rss_collector_skips_known_items(rss_collector_mock, known_news_items_mock, rss_collector, requests_mock):
+    from worker.tests.testdata import rss_collector_source_data, rss_collector_targets
+
+    result = rss_collector.collect(rss_collector_source_data)
+
+    assert result is None
+    requested_urls = [request.url for request in requests_mock.request_history]
+    assert rss_collector_targets[0] not in requested_urls
+    assert all(target in requested_urls for target in rss_collector_targets[1:])
+
+
 def test_rss_collector_digest_splitting(rss_collector_mock, rss_collector):
     from worker.tests.testdata import rss_collector_source_data
 
@@ -1,6 +1,8 @@
 import os
 import sys
+import threading
 import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
 current_path = os.getcwd()
 
@@ -11,3 +13,50 @@ if not current_path.endswith("src/worker"):
 @pytest.fixture(scope="session")
 def celery_config():
     return {"broker_url": "memory://"}
+
+
+class CoreStub(BaseHTTPRequestHandler):
+    """
+    Answers with the queued status codes of a path, 200 once they are used up, and records every request
+    """
+
+    def handle_request(self):
+        self.server.requests.append((self.command, self.path))
+        if length := int(self.headers.get("Content-Length", 0)):
+            self.rfile.read(length)
+        statuses = self.server.statuses.get(self.path, [])
+        status = statuses.pop(0) if statuses else 200
+        body = b"{}"
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_PUT = do_DELETE = handle_request
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def core_stub(monkeypatch):
+    from worker.config import Config
+    from worker import core_api
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), CoreStub)
+    server.requests = []
+    server.statuses = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    monkeypatch.setattr(Config, "TARANIS_CORE_URL", f"http://127.0.0.1:{server.server_port}/api")
+    monkeypatch.setattr(Config, "CORE_RETRY_BACKOFF", 0)
+    monkeypatch.setattr(Config, "CORE_RETRIES", 2)
+    core_api.sessions.clear()
+
+    yield server
+
+    core_api.sessions.clear()
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,38 @@
+from worker import core_api
+from worker.core_api import CoreApi
+
+
+def test_get_retried_on_503(core_stub):
+    core_stub.statuses["/api/worker/products/1"] = [503, 503]
+
+    assert CoreApi().get_product(1) == {}
+    assert core_stub.requests == [("GET", "/api/worker/products/1")] * 3
+
+
+def test_get_gives_up_after_retries(core_stub):
+    core_stub.statuses["/api/worker/products/1"] = [503, 503, 503]
+
+    assert CoreApi().get_product(1) is None
+    assert len(core_stub.requests) == 3
+
+
+def test_post_and_put_not_retried(core_stub):
+    core_stub.statuses["/api/worker/news-items/unknown"] = [503]
+    core_stub.statuses["/api/bots/news-item/1"] = [503]
+
+    api = CoreApi()
+    assert api.get_unknown_news_items(hashes=["hash"]) is None
+    assert api.update_news_item("1", {"review": "review"}) is None
+    assert core_stub.requests == [("POST", "/api/worker/news-items/unknown"), ("PUT", "/api/bots/news-item/1")]
+
+
+def test_session_shared_and_recreated_after_fork(core_stub, monkeypatch):
+    session = core_api.get_session()
+    assert core_api.get_session() is session
+    CoreApi().get_product(1)
+    assert core_api.get_session() is session
+
+    monkeypatch.setattr(core_api.os, "getpid", lambda: -1)
+    forked_session = core_api.get_session()
+    assert forked_session is not session
+    assert list(core_api.sessions) == [-1]